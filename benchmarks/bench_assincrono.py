@@ -0,0 +1,99 @@
+"""
+Teste de carga da API assíncrona: mede o atraso do laço de eventos (quanto
+um temporizador de 5 ms acorda depois da hora) enquanto várias compilações
+correm ao mesmo tempo, comparando com o laço ocioso e com compilar() chamado
+direto no laço, que o bloqueia a cada compilação.
+
+Com processos e manter_ast=False, o atraso deve ficar perto do ocioso; com a
+AST, cada resultado grande é desserializado no processo do laço de uma vez.
+Com threads, o laço disputa o GIL com as compilações.
+
+Uso: python -m benchmarks.bench_assincrono [tamanho_em_kb] [pedidos] [trabalhadores]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.gerador_programas import gerar_programa
+from src.ast.compilador_moonlet import AnalisadorMoonlet
+from src.ast.compilacao_assincrona import CompiladorAssincrono
+
+INTERVALO = 0.005
+
+
+async def medir_atrasos(parar: asyncio.Event) -> list:
+    """Atraso de cada despertar de um temporizador periódico, até parar ser sinalizado"""
+    laco = asyncio.get_running_loop()
+    atrasos = []
+    while not parar.is_set():
+        esperado = laco.time() + INTERVALO
+        await asyncio.sleep(INTERVALO)
+        atrasos.append(laco.time() - esperado)
+    return atrasos
+
+
+async def cenario(carga) -> tuple:
+    """(atrasos, segundos) de uma carga executada com o temporizador rodando"""
+    parar = asyncio.Event()
+    medidor = asyncio.create_task(medir_atrasos(parar))
+    await asyncio.sleep(INTERVALO * 4)
+    inicio = time.perf_counter()
+    await carga()
+    segundos = time.perf_counter() - inicio
+    parar.set()
+    return await medidor, segundos
+
+
+async def principal(tamanho_kb: int, pedidos: int, trabalhadores: int):
+    programas = [gerar_programa(tamanho_kb, 'misto', semente) for semente in range(pedidos)]
+    print(f"{pedidos} compilações de {tamanho_kb} KB, {trabalhadores} trabalhador(es), "
+          f"{os.cpu_count()} núcleo(s), temporizador de {INTERVALO * 1000:.0f} ms\n")
+
+    async def ocioso():
+        await asyncio.sleep(0.5)
+
+    async def bloqueante():
+        compilador = AnalisadorMoonlet()
+        for programa in programas:
+            compilador.compilar(programa)
+            await asyncio.sleep(0)
+
+    cargas = [('ocioso', ocioso), ('bloqueante', bloqueante)]
+    compiladores = []
+    for rotulo, processos, manter_ast in (('threads', False, True), ('processos', True, True),
+                                         ('proc. s/AST', True, False)):
+        compilador = CompiladorAssincrono(processos=processos, trabalhadores=trabalhadores)
+        await asyncio.gather(*(compilador.compilar("local x = 1") for _ in range(trabalhadores)))
+        compiladores.append(compilador)
+
+        async def carga(compilador=compilador, manter_ast=manter_ast):
+            resultados = await asyncio.gather(*(compilador.compilar(p, manter_ast=manter_ast)
+                                                for p in programas))
+            assert all(resultado.sucesso for resultado in resultados)
+        cargas.append((rotulo, carga))
+
+    print(f"{'cenário':<11} | {'tempo':>7} | {'atraso p50':>10} | {'p99':>9} | {'máximo':>9}")
+    for rotulo, carga in cargas:
+        atrasos, segundos = await cenario(carga)
+        atrasos.sort()
+        p99 = atrasos[min(len(atrasos) - 1, int(len(atrasos) * 0.99))]
+        print(f"{rotulo:<11} | {segundos:>6.2f}s | {statistics.median(atrasos) * 1000:>7.2f} ms | "
+              f"{p99 * 1000:>6.2f} ms | {atrasos[-1] * 1000:>6.1f} ms")
+    for compilador in compiladores:
+        await compilador.fechar()
+
+
+def main():
+    tamanho_kb = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    pedidos = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    trabalhadores = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+    asyncio.run(principal(tamanho_kb, pedidos, trabalhadores))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark de memória da AST: mede o tamanho total da árvore e os bytes por nó
+para programas sintéticos de tamanho crescente.
+
+A análise léxica é feita antes da medição (TokenBuffer), de modo que só as
+alocações retidas pelo parser, isto é, a própria AST, entram na conta.
+
+Uso: python -m benchmarks.bench_ast_memoria [tamanho_maximo_em_kb]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.lexer.buffer_tokens import TokenBuffer, CursorTokens
+from src.lexer.lexico_moonlet import MOTOR_REGEX
+from src.ast.estatisticas_compilacao import contar_nos
+from src.parser.sintatico_moonlet import AnalisadorSintaticoMoonlet
+
+TRECHO = '''
+local contador_{n} = {n}
+local nome_{n} = "valor {n}"
+function soma_{n}(a, b)
+    local c = a * (b + {n})
+    return a + b * 2 - c / 3 % 4 ^ 5
+end
+while contador_{n} <= 10 and contador_{n} ~= 3 do
+    contador_{n} = contador_{n} + 1.5
+end
+for i = 1, contador_{n}, 2 do
+    if i > 5 then
+        nome_{n} = nome_{n} .. "x"
+    elseif not (i == 3) then
+        print(t[i], t.campo, -i)
+    else
+        break
+    end
+end
+'''
+
+
+def gerar_codigo(tamanho_kb: int) -> str:
+    """Gera código Moonlet sintaticamente válido com aproximadamente o tamanho pedido"""
+    partes = []
+    total = 0
+    n = 0
+    while total < tamanho_kb * 1024:
+        trecho = TRECHO.format(n=n)
+        partes.append(trecho)
+        total += len(trecho)
+        n += 1
+    return ''.join(partes)
+
+
+def medir(codigo: str) -> tuple:
+    """Retorna (nós, bytes retidos pela AST, segundos de análise sintática)"""
+    buffer = TokenBuffer.construir(codigo, motor=MOTOR_REGEX)
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    ast = AnalisadorSintaticoMoonlet(CursorTokens(buffer)).analisar()
+    tempo = time.perf_counter() - inicio
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return contar_nos(ast), memoria, tempo
+
+
+def main():
+    tamanho_maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    tamanhos = []
+    tamanho = 64
+    while tamanho <= tamanho_maximo:
+        tamanhos.append(tamanho)
+        tamanho *= 2
+    if not tamanhos:
+        tamanhos = [tamanho_maximo]
+
+    print(f"{'código':>10} | {'nós':>10} | {'AST (bytes)':>14} | {'bytes/nó':>9} | {'nós/s':>12}")
+    for tamanho_kb in tamanhos:
+        codigo = gerar_codigo(tamanho_kb)
+        nos, memoria, tempo = medir(codigo)
+        print(f"{len(codigo) // 1024:>7} KB | {nos:>10,} | {memoria:>14,} | "
+              f"{memoria / nos:>9.1f} | {nos / tempo:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
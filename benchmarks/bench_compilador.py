@@ -0,0 +1,158 @@
+"""
+Benchmark de vazão do compilador: mede separadamente análise léxica,
+sintática, semântica e geração de MEPA sobre programas sintéticos de cada
+forma do gerador, com tokens/s, nós/s e pico de memória por fase.
+
+Cada fase é cronometrada isoladamente (melhor de N repetições) sobre a saída
+da fase anterior; o pico de memória vem de uma execução à parte sob
+tracemalloc, que deixaria os tempos mais lentos.
+
+Com --salvar-base o resultado é gravado em JSON; com --comparar, é confrontado
+com uma base gravada e as fases que pioraram além da tolerância são listadas
+(código de saída 1).
+
+Uso: python -m benchmarks.bench_compilador [--tamanho KB] [--forma F] [--semente N]
+         [--repeticoes N] [--motor caractere|regex]
+         [--salvar-base base.json] [--comparar base.json] [--tolerancia 0.15]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.bench_ast_memoria import contar_nos
+from benchmarks.gerador_programas import FORMAS, gerar_programa
+from src.lexer.buffer_tokens import TokenBuffer, CursorTokens
+from src.lexer.lexico_moonlet import MOTOR_CARACTERE, MOTOR_REGEX
+from src.mepa.gerador_mepa import GeradorMEPA
+from src.parser.sintatico_moonlet import AnalisadorSintaticoMoonlet
+from src.semantic import AnalisadorSemantico
+
+VERSAO_BASE = 1
+FASES = ('lexico', 'sintatico', 'semantico', 'geracao')
+
+
+def _fases(codigo: str, motor: str) -> tuple:
+    """Retorna (estado, funções sem argumento de cada fase); cada uma consome a saída da anterior"""
+    estado = {}
+
+    def lexico():
+        estado['tokens'] = TokenBuffer.construir(codigo, motor=motor)
+
+    def sintatico():
+        parser = AnalisadorSintaticoMoonlet(CursorTokens(estado['tokens']))
+        estado['ast'] = parser.analisar()
+        estado['erros'] = parser.relatorio_erros.erros
+
+    def semantico():
+        AnalisadorSemantico().analisar(estado['ast'])
+
+    def geracao():
+        estado['mepa'] = GeradorMEPA().gerar(estado['ast'])
+
+    return estado, dict(zip(FASES, (lexico, sintatico, semantico, geracao)))
+
+
+def medir_programa(codigo: str, motor: str, repeticoes: int) -> dict:
+    """Tempo (melhor de N), pico de memória e contagens de cada fase"""
+    estado, fases = _fases(codigo, motor)
+    resultado = {}
+    for nome, fase in fases.items():
+        melhor = float('inf')
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            fase()
+            melhor = min(melhor, time.perf_counter() - inicio)
+        tracemalloc.start()
+        fase()
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        resultado[nome] = {'segundos': melhor, 'pico_bytes': pico}
+
+    if estado['erros']:
+        raise RuntimeError(f"Programa gerado com erros: {estado['erros'][0]}")
+    resultado['tokens'] = len(estado['tokens'])
+    resultado['nos'] = contar_nos(estado['ast'])
+    resultado['instrucoes'] = len(estado['mepa'])
+    return resultado
+
+
+def imprimir(forma: str, tamanho: int, r: dict):
+    print(f"\n[{forma}] {tamanho / 1024:.0f} KB, {r['tokens']:,} tokens, {r['nos']:,} nós, "
+          f"{r['instrucoes']:,} instruções MEPA")
+    print(f"  {'fase':<10} | {'tempo':>8} | {'vazão':>22} | {'pico de memória':>16}")
+    unidades = {'lexico': ('tokens', r['tokens']), 'sintatico': ('nós', r['nos']),
+                'semantico': ('nós', r['nos']), 'geracao': ('nós', r['nos'])}
+    for fase in FASES:
+        segundos = r[fase]['segundos']
+        unidade, quantidade = unidades[fase]
+        vazao = f"{quantidade / segundos:,.0f} {unidade}/s"
+        print(f"  {fase:<10} | {segundos:>7.3f}s | {vazao:>22} | {r[fase]['pico_bytes'] / 1024:>13,.0f} KB")
+
+
+def comparar(base: dict, atual: dict, tolerancia: float) -> list:
+    """Regressões de tempo ou de pico de memória acima da tolerância"""
+    regressoes = []
+    for forma, fases in atual['resultados'].items():
+        referencia = base['resultados'].get(forma)
+        if referencia is None:
+            continue
+        for fase in FASES:
+            for metrica in ('segundos', 'pico_bytes'):
+                antes = referencia[fase][metrica]
+                depois = fases[fase][metrica]
+                if antes > 0 and depois > antes * (1 + tolerancia):
+                    regressoes.append(f"{forma}/{fase}: {metrica} {antes:.6g} → {depois:.6g} "
+                                      f"(+{(depois / antes - 1) * 100:.0f}%)")
+    return regressoes
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description="Benchmark de vazão do compilador Moonlet")
+    argumentos.add_argument("--tamanho", type=int, default=256, help="tamanho de cada programa em KB")
+    argumentos.add_argument("--forma", choices=FORMAS + ('todas',), default='todas')
+    argumentos.add_argument("--semente", type=int, default=0)
+    argumentos.add_argument("--repeticoes", type=int, default=3)
+    argumentos.add_argument("--motor", choices=(MOTOR_CARACTERE, MOTOR_REGEX), default=MOTOR_CARACTERE)
+    argumentos.add_argument("--salvar-base", metavar="ARQUIVO", help="grava os resultados como base")
+    argumentos.add_argument("--comparar", metavar="ARQUIVO", help="compara com uma base gravada")
+    argumentos.add_argument("--tolerancia", type=float, default=0.15,
+                            help="piora relativa aceita antes de acusar regressão (padrão 0.15)")
+    opcoes = argumentos.parse_args()
+
+    parametros = {'tamanho_kb': opcoes.tamanho, 'semente': opcoes.semente, 'motor': opcoes.motor}
+    formas = FORMAS if opcoes.forma == 'todas' else (opcoes.forma,)
+    atual = {'versao': VERSAO_BASE, 'parametros': parametros, 'resultados': {}}
+    for forma in formas:
+        codigo = gerar_programa(opcoes.tamanho, forma, opcoes.semente)
+        resultado = medir_programa(codigo, opcoes.motor, opcoes.repeticoes)
+        atual['resultados'][forma] = resultado
+        imprimir(forma, len(codigo), resultado)
+
+    if opcoes.salvar_base:
+        with open(opcoes.salvar_base, 'w', encoding='utf-8') as arquivo:
+            json.dump(atual, arquivo, indent=2)
+        print(f"\n✓ Base gravada em '{opcoes.salvar_base}'")
+
+    if opcoes.comparar:
+        with open(opcoes.comparar, 'r', encoding='utf-8') as arquivo:
+            base = json.load(arquivo)
+        if base.get('versao') != VERSAO_BASE or base.get('parametros') != parametros:
+            print(f"\n✗ Base '{opcoes.comparar}' gravada com outros parâmetros: {base.get('parametros')}")
+            sys.exit(2)
+        regressoes = comparar(base, atual, opcoes.tolerancia)
+        if regressoes:
+            print(f"\n✗ {len(regressoes)} regressão(ões) acima de {opcoes.tolerancia:.0%}:")
+            for regressao in regressoes:
+                print(f"  {regressao}")
+            sys.exit(1)
+        print(f"\n✓ Nenhuma regressão acima de {opcoes.tolerancia:.0%} em relação a '{opcoes.comparar}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark do analisador léxico: compara o motor caractere a caractere com o
+motor baseado no padrão mestre e confere que ambos produzem os mesmos tokens.
+
+O ganho é modesto (na faixa de 1,1x a 1,3x em 512 KB): as duas versões pagam
+uma chamada de método e a criação de um Token por token, e isso pesa tanto
+quanto a varredura em si.
+
+Uso: python -m benchmarks.bench_lexico [tamanho_em_kb]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.lexer.lexico_moonlet import (
+    AnalisadorLexicoMoonlet, EOS, MOTOR_CARACTERE, MOTOR_REGEX
+)
+
+TRECHO = '''
+-- Trecho sintético para medir a varredura
+local contador_{n} = {n}
+local nome_{n} = "valor {n}"
+--[[ comentário
+     de bloco {n} ]]
+function soma_{n}(a, b)
+    return a + b * 2 - 1 / 3 % 4 ^ 5
+end
+while contador_{n} <= 10 and contador_{n} ~= 3 do
+    contador_{n} = contador_{n} + 1.5
+end
+if nome_{n} == 'x' .. "y" then print(t[1], t.campo, #t) end
+'''
+
+
+def gerar_codigo(tamanho_kb: int) -> str:
+    """Gera código Moonlet sintético com aproximadamente o tamanho pedido"""
+    partes = []
+    total = 0
+    n = 0
+    while total < tamanho_kb * 1024:
+        trecho = TRECHO.format(n=n)
+        partes.append(trecho)
+        total += len(trecho)
+        n += 1
+    return ''.join(partes)
+
+
+def coletar_tokens(codigo: str, motor: str) -> list:
+    lexer = AnalisadorLexicoMoonlet(codigo, motor=motor)
+    tokens = []
+    token = lexer.proximo_token()
+    while token is not None and token.tipo != EOS:
+        tokens.append(token)
+        token = lexer.proximo_token()
+    tokens.append(token)
+    return tokens
+
+
+def medir(codigo: str, motores: tuple, repeticoes: int = 7) -> dict:
+    """Retorna {motor: melhor tempo}; as rodadas alternam os motores para que
+    oscilações da máquina afetem os dois por igual"""
+    melhores = dict.fromkeys(motores, float('inf'))
+    for _ in range(repeticoes):
+        for motor in motores:
+            inicio = time.perf_counter()
+            coletar_tokens(codigo, motor)
+            melhores[motor] = min(melhores[motor], time.perf_counter() - inicio)
+    return melhores
+
+
+def main():
+    tamanho_kb = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    codigo = gerar_codigo(tamanho_kb)
+    print(f"Código sintético: {len(codigo) / 1024:.0f} KB")
+
+    if coletar_tokens(codigo, MOTOR_CARACTERE) != coletar_tokens(codigo, MOTOR_REGEX):
+        print("✗ Os motores produziram sequências de tokens diferentes!")
+        sys.exit(1)
+    print("✓ Sequências de tokens idênticas nos dois motores\n")
+
+    quantidade = len(coletar_tokens(codigo, MOTOR_REGEX))
+    tempos = medir(codigo, (MOTOR_CARACTERE, MOTOR_REGEX))
+    for motor, tempo in tempos.items():
+        print(f"{motor:<10} | {quantidade} tokens em {tempo:.3f}s | {quantidade / tempo:,.0f} tokens/s")
+
+    ganho = tempos[MOTOR_CARACTERE] / tempos[MOTOR_REGEX]
+    print(f"\nGanho do motor regex: {ganho:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
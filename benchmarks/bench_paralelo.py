@@ -0,0 +1,62 @@
+"""
+Benchmark da compilação paralela: compila o mesmo programa de muitas funções
+de nível superior com compilar() e com compilar_paralelo() e confere que o
+MEPA gerado é idêntico.
+
+O pool de processos é criado e aquecido antes da medição; o ganho depende do
+número de núcleos disponíveis (com um só, o paralelo só acrescenta o custo de
+enviar trechos e devolver tokens entre processos) e fica limitado à fração
+do tempo gasta na análise léxica, a única fase dividida.
+
+Uso: python -m benchmarks.bench_paralelo [tamanho_em_kb] [processos]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.gerador_programas import gerar_programa
+from src.ast.compilador_moonlet import AnalisadorMoonlet
+from src.ast.compilacao_paralela import dividir_trechos
+
+
+def medir(compilar, repeticoes: int = 3) -> tuple:
+    """Retorna (melhor tempo, resultado) de uma compilação"""
+    melhor = float('inf')
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = compilar()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def main():
+    tamanho_kb = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    processos = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    codigo = gerar_programa(tamanho_kb, 'funcoes')
+    trechos = dividir_trechos(codigo, processos)
+    print(f"Código sintético: {len(codigo) / 1024:.0f} KB, {len(trechos)} trechos, "
+          f"{processos} processo(s), {os.cpu_count()} núcleo(s)\n")
+
+    compilador = AnalisadorMoonlet()
+    tempo_serial, serial = medir(lambda: compilador.compilar(codigo))
+    with ProcessPoolExecutor(processos) as executor:
+        executor.submit(int).result()  # aquece o pool
+        tempo_paralelo, paralelo = medir(lambda: compilador.compilar_paralelo(codigo, executor=executor))
+
+    if serial.codigo_mepa != paralelo.codigo_mepa or serial.tabela_simbolos != paralelo.tabela_simbolos:
+        print("✗ Compilação paralela diferente da sequencial!")
+        sys.exit(1)
+    print(f"✓ MEPA idêntico ({len(serial.codigo_mepa):,} instruções)\n")
+
+    for rotulo, tempo in (('sequencial', tempo_serial), ('paralelo', tempo_paralelo)):
+        print(f"{rotulo:<10} | {tempo:.3f}s | {len(codigo) / 1024 / tempo:,.0f} KB/s")
+    print(f"\nGanho: {tempo_serial / tempo_paralelo:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark de memória do TokenBuffer: compara uma lista de Token com o buffer
+em colunas e mede o tamanho serializado de cada representação.
+
+Uso: python -m benchmarks.bench_token_buffer [tamanho_em_kb]
+"""
+
+import os
+import pickle
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.bench_lexico import gerar_codigo, coletar_tokens
+from src.lexer.buffer_tokens import TokenBuffer
+from src.lexer.lexico_moonlet import MOTOR_REGEX
+
+
+def medir_memoria(funcao, *args):
+    """Retorna (resultado, bytes alocados e retidos pela chamada)"""
+    tracemalloc.start()
+    resultado = funcao(*args)
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, atual
+
+
+def main():
+    tamanho_kb = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    codigo = gerar_codigo(tamanho_kb)
+    print(f"Código sintético: {len(codigo) / 1024:.0f} KB")
+
+    tokens, mem_lista = medir_memoria(coletar_tokens, codigo, MOTOR_REGEX)
+    buffer, mem_buffer = medir_memoria(TokenBuffer.construir, codigo, MOTOR_REGEX)
+
+    if list(buffer) != tokens:
+        print("✗ O buffer não reproduz a sequência de tokens!")
+        sys.exit(1)
+    print(f"✓ {len(buffer)} tokens reproduzidos pelo buffer\n")
+
+    pickle_lista = len(pickle.dumps(tokens, protocol=pickle.HIGHEST_PROTOCOL))
+    pickle_buffer = len(pickle.dumps(buffer, protocol=pickle.HIGHEST_PROTOCOL))
+
+    print(f"{'':<14} | {'memória':>12} | {'bytes/token':>11} | {'pickle':>12}")
+    print(f"{'list[Token]':<14} | {mem_lista:>12,} | {mem_lista / len(tokens):>11.1f} | {pickle_lista:>12,}")
+    print(f"{'TokenBuffer':<14} | {mem_buffer:>12,} | {mem_buffer / len(buffer):>11.1f} | {pickle_buffer:>12,}")
+    print(f"\nRedução de memória: {mem_lista / mem_buffer:.1f}x | "
+          f"redução do pickle: {pickle_lista / pickle_buffer:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Microbenchmark do despacho de visitantes: compara o accept original (montar
+o nome do método e chamar getattr a cada visita) com a tabela de despacho em
+cache de ASTNode.accept, percorrendo a mesma AST com o ImpressorAST.
+
+O accept original só conhecia nomes como 'visit_variabledeclaration'; para
+que as duas travessias visitem os mesmos nós, a medição antiga usa uma
+subclasse do ImpressorAST com esses nomes como apelidos.
+
+Uso: python -m benchmarks.bench_visitante [tamanho_em_kb]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.bench_ast_memoria import gerar_codigo, contar_nos
+from src.ast import ImpressorAST
+from src.lexer.buffer_tokens import TokenBuffer, CursorTokens
+from src.lexer.lexico_moonlet import MOTOR_REGEX
+from src.parser import sintatico_moonlet
+from src.parser.sintatico_moonlet import ASTNode, AnalisadorSintaticoMoonlet, nomes_metodo_visita
+
+
+def accept_por_nome(self, visitor):
+    """Método para padrão Visitor (accept anterior ao cache de despacho)"""
+    # Obter o nome da classe sem o sufixo 'Node' e em minúsculas
+    class_name = self.__class__.__name__.lower().replace('node', '')
+    method_name = f'visit_{class_name}'
+    method = getattr(visitor, method_name, None)
+    if method:
+        return method(self)
+    else:
+        return visitor.generic_visit(self) if hasattr(visitor, 'generic_visit') else None
+
+
+class ImpressorLegado(ImpressorAST):
+    """ImpressorAST com os nomes de método que o accept original procurava"""
+
+
+for _classe in vars(sintatico_moonlet).values():
+    if isinstance(_classe, type) and issubclass(_classe, ASTNode) and _classe is not ASTNode:
+        _atual, _legado = nomes_metodo_visita(_classe)
+        if _atual != _legado and hasattr(ImpressorAST, _atual):
+            setattr(ImpressorLegado, _legado, getattr(ImpressorAST, _atual))
+
+
+def percorrer(ast: ASTNode, visitante_classe: type = ImpressorAST) -> str:
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        ast.accept(visitante_classe())
+    return saida.getvalue()
+
+
+def medir(ast: ASTNode, visitante_classe: type = ImpressorAST, repeticoes: int = 5) -> tuple:
+    """Retorna (melhor tempo, texto impresso) de uma travessia completa"""
+    melhor = float('inf')
+    texto = ''
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        texto = percorrer(ast, visitante_classe)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, texto
+
+
+def main():
+    tamanho_kb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    codigo = gerar_codigo(tamanho_kb)
+    buffer = TokenBuffer.construir(codigo, motor=MOTOR_REGEX)
+    ast = AnalisadorSintaticoMoonlet(CursorTokens(buffer)).analisar()
+    nos = contar_nos(ast)
+    print(f"Código sintético: {len(codigo) / 1024:.0f} KB, {nos:,} nós\n")
+
+    accept_cache = ASTNode.accept
+    ASTNode.accept = accept_por_nome
+    try:
+        tempo_nome, texto_nome = medir(ast, ImpressorLegado)
+    finally:
+        ASTNode.accept = accept_cache
+    tempo_cache, texto_cache = medir(ast)
+
+    if texto_nome != texto_cache:
+        print("✗ Os dois despachos produziram saídas diferentes!")
+        sys.exit(1)
+    print("✓ Saídas idênticas nos dois despachos\n")
+
+    # O ImpressorAST visita cada nó exatamente uma vez
+    for rotulo, tempo in (('por nome', tempo_nome), ('em cache', tempo_cache)):
+        print(f"{rotulo:<9} | {tempo:.3f}s | {tempo / nos * 1e9:,.0f} ns/nó")
+    economia = (tempo_nome - tempo_cache) / nos * 1e9
+    print(f"\nEconomia: {economia:,.0f} ns por visita ({tempo_nome / tempo_cache:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Gerador de programas Moonlet sintéticos para benchmarks
+
+Os programas são reprodutíveis (mesma semente, mesmo texto) e compilam sem
+erros até o MEPA: só usam variáveis já declaradas e expressões numéricas,
+que são as que a máquina MEPA representa.
+
+Formas disponíveis:
+    misto       mistura das formas abaixo
+    aninhado    if/while/for aninhados em profundidade
+    locais      muitas declarações locais curtas
+    expressoes  expressões longas com muitos operandos
+    lacos       muitos laços while/for/repeat em sequência
+    funcoes     milhares de funções de nível superior independentes
+
+Uso: python -m benchmarks.gerador_programas [tamanho_em_kb] [forma] [semente]
+"""
+
+import random
+import sys
+
+FORMAS = ('misto', 'aninhado', 'locais', 'expressoes', 'lacos', 'funcoes')
+_FORMAS_MISTO = ('aninhado', 'locais', 'expressoes', 'lacos')
+
+_OPERADORES_ARITMETICOS = ('+', '-', '*', '/', '%')
+_OPERADORES_RELACIONAIS = ('<', '>', '<=', '>=', '==', '~=')
+
+
+class _Gerador:
+    """Estado de uma geração: gerador aleatório e nomes já declarados"""
+
+    def __init__(self, semente: int, profundidade_maxima: int):
+        self.aleatorio = random.Random(semente)
+        self.profundidade_maxima = profundidade_maxima
+        self._contador = 0
+        self._visiveis = [[]]  # nomes declarados por escopo, do global ao atual
+        self._aninhar = False  # forma 'aninhado': todo bloco abre outro até o limite
+
+    # ---------------- Nomes ----------------
+    def _novo_nome(self, prefixo: str) -> str:
+        self._contador += 1
+        return f"{prefixo}_{self._contador}"
+
+    def _declarar(self, prefixo: str) -> str:
+        nome = self._novo_nome(prefixo)
+        self._visiveis[-1].append(nome)
+        return nome
+
+    def _variavel(self) -> str:
+        escopo = self.aleatorio.choice([e for e in self._visiveis if e])
+        return self.aleatorio.choice(escopo)
+
+    def _tem_variaveis(self) -> bool:
+        return any(self._visiveis)
+
+    # ---------------- Expressões ----------------
+    def _operando(self) -> str:
+        sorteio = self.aleatorio.random()
+        if sorteio < 0.45 and self._tem_variaveis():
+            return self._variavel()
+        if sorteio < 0.55:
+            return f"{self.aleatorio.randint(0, 999)}.{self.aleatorio.randint(0, 9)}"
+        return str(self.aleatorio.randint(0, 999))
+
+    def expressao(self, operandos: int) -> str:
+        """Expressão aritmética com o número de operandos pedido"""
+        partes = [self._operando()]
+        for _ in range(operandos - 1):
+            partes.append(self.aleatorio.choice(_OPERADORES_ARITMETICOS))
+            operando = self._operando()
+            sorteio = self.aleatorio.random()
+            if sorteio < 0.1:
+                operando = f"-{operando}"
+            elif sorteio < 0.2:
+                operando = f"({operando} + {self._operando()})"
+            partes.append(operando)
+        return ' '.join(partes)
+
+    def condicao(self) -> str:
+        comparacao = (f"{self.expressao(2)} {self.aleatorio.choice(_OPERADORES_RELACIONAIS)} "
+                      f"{self.expressao(2)}")
+        if self.aleatorio.random() < 0.2:
+            return f"not ({comparacao})"
+        return comparacao
+
+    # ---------------- Comandos ----------------
+    def declaracao(self, recuo: str) -> str:
+        valor = self.expressao(self.aleatorio.randint(1, 4))
+        return f"{recuo}local {self._declarar('v')} = {valor}\n"
+
+    def atribuicao(self, recuo: str) -> str:
+        return f"{recuo}{self._variavel()} = {self.expressao(self.aleatorio.randint(1, 4))}\n"
+
+    def _bloco(self, recuo: str, comandos: int, profundidade: int) -> str:
+        self._visiveis.append([])
+        partes = [self.declaracao(recuo)]
+        for i in range(comandos - 1):
+            if self._aninhar:
+                aninhar = i == 0
+            else:
+                aninhar = self.aleatorio.random() < 0.3
+            if aninhar and profundidade < self.profundidade_maxima:
+                partes.append(self.estrutura(recuo, profundidade + 1))
+            elif self.aleatorio.random() < 0.5:
+                partes.append(self.declaracao(recuo))
+            else:
+                partes.append(self.atribuicao(recuo))
+        self._visiveis.pop()
+        return ''.join(partes)
+
+    def estrutura(self, recuo: str, profundidade: int) -> str:
+        """Um if, while, for ou repeat com bloco possivelmente aninhado"""
+        interno = recuo + '    '
+        comandos = self.aleatorio.randint(2, 4)
+        tipo = self.aleatorio.randrange(4)
+        if tipo == 0:
+            texto = f"{recuo}if {self.condicao()} then\n{self._bloco(interno, comandos, profundidade)}"
+            if self.aleatorio.random() < 0.5:
+                texto += f"{recuo}elseif {self.condicao()} then\n{self._bloco(interno, 2, profundidade)}"
+            if self.aleatorio.random() < 0.5:
+                texto += f"{recuo}else\n{self._bloco(interno, 2, profundidade)}"
+            return texto + f"{recuo}end\n"
+        if tipo == 1:
+            return (f"{recuo}while {self.condicao()} do\n"
+                    f"{self._bloco(interno, comandos, profundidade)}{recuo}end\n")
+        if tipo == 2:
+            contador = self._novo_nome('i')
+            self._visiveis.append([contador])
+            texto = (f"{recuo}for {contador} = {self.aleatorio.randint(0, 9)}, "
+                     f"{self.expressao(2)} do\n{self._bloco(interno, comandos, profundidade)}{recuo}end\n")
+            self._visiveis.pop()
+            return texto
+        return (f"{recuo}repeat\n{self._bloco(interno, comandos, profundidade)}"
+                f"{recuo}until {self.condicao()}\n")
+
+    def funcao(self) -> str:
+        """Definição de função de nível superior; o corpo vê os parâmetros e as globais"""
+        parametros = [self._novo_nome('p') for _ in range(self.aleatorio.randint(1, 3))]
+        nome = self._novo_nome('f')
+        self._visiveis.append(parametros)
+        corpo = self._bloco('    ', self.aleatorio.randint(3, 8), self.profundidade_maxima - 3)
+        self._visiveis.pop()
+        texto = f"function {nome}({', '.join(parametros)})\n{corpo}end\n"
+        if self.aleatorio.random() < 0.3:
+            texto = f"-- {nome}: função gerada\n" + texto
+        if self.aleatorio.random() < 0.2:
+            texto = self.declaracao('') + texto
+        return texto
+
+    # ---------------- Trechos por forma ----------------
+    def trecho(self, forma: str) -> str:
+        if forma == 'misto':
+            forma = self.aleatorio.choice(_FORMAS_MISTO)
+        self._aninhar = forma == 'aninhado'
+        if forma == 'locais':
+            return ''.join(self.declaracao('') for _ in range(20))
+        if forma == 'expressoes':
+            valor = self.expressao(self.aleatorio.randint(50, 200))
+            return f"local {self._declarar('e')} = {valor}\n"
+        if forma == 'lacos':
+            partes = [self.declaracao('')]
+            for _ in range(5):
+                partes.append(self.estrutura('', self.profundidade_maxima - 1))
+            return ''.join(partes)
+        if forma == 'aninhado':
+            return self.declaracao('') + self.estrutura('', 0)
+        if forma == 'funcoes':
+            return self.funcao()
+        raise ValueError(f"Forma de programa desconhecida: '{forma}'")
+
+
+def gerar_programa(tamanho_kb: int, forma: str = 'misto', semente: int = 0,
+                   profundidade_maxima: int = 12) -> str:
+    """Gera um programa Moonlet válido com aproximadamente o tamanho pedido"""
+    if forma not in FORMAS:
+        raise ValueError(f"Forma de programa desconhecida: '{forma}'")
+    gerador = _Gerador(semente, profundidade_maxima)
+    partes = []
+    total = 0
+    while total < tamanho_kb * 1024:
+        trecho = gerador.trecho(forma)
+        partes.append(trecho)
+        total += len(trecho)
+    return ''.join(partes)
+
+
+def main():
+    tamanho_kb = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    forma = sys.argv[2] if len(sys.argv) > 2 else 'misto'
+    semente = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    sys.stdout.write(gerar_programa(tamanho_kb, forma, semente))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,12 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.ast.compilador_moonlet import AnalisadorMoonlet
+from src.ast.cache_compilacao import CacheCompilacao
+from src.ast.compilacao_lote import coletar_arquivos, compilar_lote
 
 
-def testar_arquivo(nome_arquivo):
-    """Testa um arquivo específico"""
+def testar_arquivo(nome_arquivo, estatisticas=None, cache=None):
+    """Testa um arquivo específico (estatisticas: None, 'tabela' ou 'json')"""
     base_dir = os.path.dirname(os.path.abspath(__file__))
     caminho = os.path.join(base_dir, "examples", nome_arquivo)
     if os.path.exists(caminho):
@@ -15,23 +17,115 @@ def testar_arquivo(nome_arquivo):
         print(f"TESTANDO: {nome_arquivo}")
         print('='*60)
         
-        compilador = AnalisadorMoonlet()
+        compilador = AnalisadorMoonlet(coletar_estatisticas=estatisticas is not None, cache=cache)
         ast = compilador.analisar_arquivo(caminho)
         
         if ast:
             compilador.imprimir_ast(ast)
+        if estatisticas:
+            compilador.imprimir_estatisticas(formato_json=estatisticas == 'json')
         
         print(f"\n{'='*60}")
     else:
         print(f"Arquivo {caminho} não encontrado!")
 
 
+def verificar_arquivos(nomes_arquivos, semantica=True, estatisticas=None, cache=None):
+    """Valida arquivos sem gerar código MEPA (modo --check); devolve o nº de falhas"""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    compilador = AnalisadorMoonlet(coletar_estatisticas=estatisticas is not None, cache=cache)
+    falhas = 0
+    for nome_arquivo in nomes_arquivos:
+        caminho = nome_arquivo
+        if not os.path.exists(caminho):
+            caminho = os.path.join(base_dir, "examples", nome_arquivo)
+        if not os.path.exists(caminho):
+            print(f"✗ {nome_arquivo}: arquivo não encontrado")
+            falhas += 1
+            continue
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            resultado = compilador.verificar(arquivo.read(), nome_arquivo, semantica=semantica)
+        if resultado.sucesso and not resultado.relatorio_erros.tem_erros():
+            print(f"✓ {nome_arquivo}")
+        else:
+            falhas += 1
+            print(f"✗ {nome_arquivo}")
+            for erro in resultado.diagnosticos:
+                print(f"    {erro}")
+            if resultado.erro_fatal:
+                print(f"    {resultado.erro_fatal}")
+        if estatisticas:
+            compilador.imprimir_estatisticas(resultado, formato_json=estatisticas == 'json')
+    return falhas
+
+
+def _opcao_estatisticas(argumentos):
+    """--stats imprime uma tabela por fase; --stats=json, o mesmo em JSON"""
+    if "--stats=json" in argumentos:
+        return 'json'
+    if "--stats" in argumentos:
+        return 'tabela'
+    return None
+
+
+def _opcao_cache(argumentos):
+    """--cache=DIR guarda os resultados em DIR e os reaproveita nas próximas execuções"""
+    for argumento in argumentos:
+        if argumento.startswith("--cache="):
+            return CacheCompilacao(argumento[len("--cache="):])
+    return None
+
+
+def compilar_em_lote(argumentos, diretorio_cache=None):
+    """Modo --lote: compila diretórios ou padrões glob de arquivos num pool de processos
+    
+    Uso: python main.py --lote [--processos=N] [--saida=DIR] [--bytecode] [-O]
+             [--relatorio=ARQUIVO.json] [--cache=DIR] diretório|padrão [...]
+    Devolve o nº de arquivos com erros.
+    """
+    opcoes = {}
+    padroes = []
+    for argumento in argumentos:
+        if argumento.startswith("--") and "=" in argumento:
+            nome, valor = argumento[2:].split("=", 1)
+            opcoes[nome] = valor
+        elif argumento not in ("--lote", "--bytecode", "-O"):
+            padroes.append(argumento)
+    arquivos = coletar_arquivos(padroes)
+    if not arquivos:
+        print("Nenhum arquivo .moonlet encontrado.")
+        return 0
+    relatorio = compilar_lote(arquivos, processos=int(opcoes.get("processos", 0)) or None,
+                              diretorio_saida=opcoes.get("saida"), otimizar="-O" in argumentos,
+                              bytecode="--bytecode" in argumentos, diretorio_cache=diretorio_cache)
+    relatorio.imprimir()
+    if "relatorio" in opcoes:
+        with open(opcoes["relatorio"], 'w', encoding='utf-8') as arquivo:
+            arquivo.write(relatorio.como_json(indent=2))
+    return len(relatorio.falhas)
+
+
 def main():
     """Função principal"""
-    if len(sys.argv) > 1:
+    estatisticas = _opcao_estatisticas(sys.argv[1:])
+    cache = _opcao_cache(sys.argv[1:])
+    argumentos = [a for a in sys.argv[1:]
+                  if a not in ("--stats", "--stats=json") and not a.startswith("--cache=")]
+    if "--lote" in argumentos:
+        falhas = compilar_em_lote(argumentos, cache.diretorio if cache is not None else None)
+        sys.exit(1 if falhas else 0)
+    if "--check" in argumentos:
+        # Uso: python main.py --check [--sintaxe] [--stats] [--cache=DIR] arquivo.moonlet [...]
+        arquivos = [a for a in argumentos if a not in ("--check", "--sintaxe")]
+        falhas = verificar_arquivos(arquivos, semantica="--sintaxe" not in argumentos,
+                                    estatisticas=estatisticas, cache=cache)
+        if cache is not None:
+            print(f"Cache: {cache.acertos} acerto(s), {cache.falhas} falha(s)")
+        sys.exit(1 if falhas else 0)
+    if argumentos:
         # Se arquivo foi especificado, testar apenas ele
-        nome_arquivo = sys.argv[1]
-        testar_arquivo(nome_arquivo)
+        nome_arquivo = argumentos[0]
+        testar_arquivo(nome_arquivo, estatisticas, cache)
     else:
         # Testar todos os exemplos
         exemplos = [
@@ -45,13 +139,11 @@ def main():
         for exemplo in exemplos:
             try:
                 testar_arquivo(exemplo)
-                input("\nPressione Enter para continuar...")
             except KeyboardInterrupt:
                 print("\nTeste interrompido pelo usuário.")
                 break
             except Exception as e:
                 print(f"Erro ao testar {exemplo}: {e}")
-                input("\nPressione Enter para continuar...")
 
 
 if __name__ == "__main__":
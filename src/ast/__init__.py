@@ -1,17 +1,20 @@
 """AST e classes relacionadas"""
 from .compilador_moonlet import ImpressorAST, AnalisadorMoonlet
+from .resultado_compilacao import ResultadoCompilacao
+from .estatisticas_compilacao import EstatisticasCompilacao
+from .cache_compilacao import CacheCompilacao
+from .memo_compilacao import MemoCompilacao
+from .compilacao_assincrona import CompiladorAssincrono
 
 # Classes base para AST (definidas no parser por simplicidade)
-from ..parser.sintatico_moonlet import ASTNode, ProgramNode
+from ..parser.sintatico_moonlet import ASTNode, ProgramNode, nomes_metodo_visita, metodo_visita
 
 # Visitor pattern
 class ASTVisitor:
     """Classe base para visitantes da AST"""
     def visit(self, node):
         """Método genérico de visitação"""
-        method_name = f'visit_{node.__class__.__name__.lower().replace("node", "")}'
-        method = getattr(self, method_name, self.generic_visit)
-        return method(node)
+        return metodo_visita(self.__class__, node.__class__)(self, node)
     
     def generic_visit(self, node):
         """Visitação genérica para nós não tratados especificamente"""
@@ -0,0 +1,169 @@
+"""
+Cache em disco de resultados de compilação, endereçado pelo conteúdo: a chave
+é um hash do código fonte, das opções de compilação e da versão do compilador
+
+Cada entrada é um ResultadoCompilacao serializado com pickle (AST,
+diagnósticos, tabela de símbolos e MEPA) num arquivo próprio. Um arquivo sem
+alterações custa um hash e uma leitura em vez de uma compilação inteira.
+
+As gravações são atômicas (arquivo temporário no mesmo diretório +
+os.replace), então vários processos podem usar o mesmo diretório: um leitor
+vê a entrada inteira ou não a vê. O tamanho total é limitado, descartando as
+entradas usadas há mais tempo (a data de modificação marca o último uso).
+Como as entradas são lidas com pickle, o diretório deve ser confiável.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from functools import lru_cache
+from typing import Optional
+
+from .resultado_compilacao import ResultadoCompilacao
+
+# Muda quando o formato das entradas muda
+VERSAO_CACHE = 1
+
+_RAIZ_FONTES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+@lru_cache(maxsize=None)
+def versao_compilador() -> str:
+    """Hash dos fontes do compilador: qualquer alteração neles invalida o cache"""
+    resumo = hashlib.sha256(f"moonlet-cache-{VERSAO_CACHE}".encode())
+    for diretorio, subdiretorios, arquivos in os.walk(_RAIZ_FONTES):
+        subdiretorios[:] = sorted(d for d in subdiretorios if d != '__pycache__')
+        for nome in sorted(arquivos):
+            if nome.endswith('.py'):
+                caminho = os.path.join(diretorio, nome)
+                resumo.update(os.path.relpath(caminho, _RAIZ_FONTES).encode())
+                with open(caminho, 'rb') as arquivo:
+                    resumo.update(arquivo.read())
+    return resumo.hexdigest()
+
+
+class CacheCompilacao:
+    """Resultados de compilação guardados em disco, com descarte LRU por tamanho
+
+    acertos e falhas contam as consultas feitas por este objeto (não as de
+    outros processos que usem o mesmo diretório).
+    """
+
+    def __init__(self, diretorio: str, tamanho_maximo: int = 256 * 1024 * 1024):
+        self.diretorio = diretorio
+        self.tamanho_maximo = tamanho_maximo
+        self.acertos = 0
+        self.falhas = 0
+        self.gravacoes = 0
+        self.descartes = 0
+        self._tamanho: Optional[int] = None  # estimativa; recalculada a cada descarte
+        os.makedirs(diretorio, exist_ok=True)
+
+    def chave(self, codigo: str, opcoes: str = '') -> str:
+        resumo = hashlib.sha256(versao_compilador().encode())
+        resumo.update(opcoes.encode())
+        resumo.update(b'\0')
+        resumo.update(codigo.encode('utf-8', 'surrogatepass'))
+        return resumo.hexdigest()
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave[:2], chave)
+
+    def obter(self, chave: str, nome_arquivo: str) -> Optional[ResultadoCompilacao]:
+        """O resultado guardado sob a chave (com o nome de arquivo trocado), ou None"""
+        caminho = self._caminho(chave)
+        inicio = time.perf_counter()
+        try:
+            with open(caminho, 'rb') as arquivo:
+                resultado = pickle.load(arquivo)
+            os.utime(caminho)  # marca o uso para o descarte LRU
+        except FileNotFoundError:
+            self.falhas += 1
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Entrada corrompida ou de outra versão do formato: descartar
+            self._remover(caminho)
+            self.falhas += 1
+            return None
+        self.acertos += 1
+        resultado.nome_arquivo = nome_arquivo
+        duracao = time.perf_counter() - inicio
+        resultado.tempos = {'cache': duracao, 'total': duracao}
+        return resultado
+
+    def guardar(self, chave: str, resultado: ResultadoCompilacao):
+        """Grava o resultado de forma atômica e descarta entradas antigas se preciso"""
+        dados = pickle.dumps(resultado, pickle.HIGHEST_PROTOCOL)
+        if len(dados) > self.tamanho_maximo:
+            return
+        caminho = self._caminho(chave)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), prefix='.tmp-')
+        try:
+            with os.fdopen(descritor, 'wb') as arquivo:
+                arquivo.write(dados)
+            os.replace(temporario, caminho)
+        except OSError:
+            self._remover(temporario)
+            return
+        self.gravacoes += 1
+        if self._tamanho is None:
+            self._tamanho = self.tamanho_ocupado()
+        else:
+            self._tamanho += len(dados)
+        if self._tamanho > self.tamanho_maximo:
+            self._descartar()
+
+    def _entradas(self) -> list:
+        """(último uso, tamanho, caminho) de cada arquivo do diretório"""
+        entradas = []
+        for diretorio, _, arquivos in os.walk(self.diretorio):
+            for nome in arquivos:
+                caminho = os.path.join(diretorio, nome)
+                try:
+                    estado = os.stat(caminho)
+                except FileNotFoundError:
+                    continue  # removido por outro processo
+                entradas.append((estado.st_mtime, estado.st_size, caminho))
+        return entradas
+
+    def tamanho_ocupado(self) -> int:
+        return sum(tamanho for _, tamanho, _ in self._entradas())
+
+    def _descartar(self):
+        # Desce até 90% do limite, para não repetir a varredura a cada gravação
+        entradas = sorted(self._entradas())
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        limite = self.tamanho_maximo * 9 // 10
+        for _, tamanho, caminho in entradas:
+            if total <= limite:
+                break
+            if self._remover(caminho):
+                self.descartes += 1
+            total -= tamanho
+        self._tamanho = total
+
+    @staticmethod
+    def _remover(caminho: str) -> bool:
+        try:
+            os.remove(caminho)
+            return True
+        except OSError:
+            return False
+
+    def limpar(self):
+        """Remove todas as entradas"""
+        for _, _, caminho in self._entradas():
+            self._remover(caminho)
+        self._tamanho = 0
+
+    @property
+    def taxa_acertos(self) -> float:
+        consultas = self.acertos + self.falhas
+        return self.acertos / consultas if consultas else 0.0
+
+    def estatisticas(self) -> dict:
+        return {'acertos': self.acertos, 'falhas': self.falhas, 'taxa_acertos': self.taxa_acertos,
+                'gravacoes': self.gravacoes, 'descartes': self.descartes}
@@ -0,0 +1,132 @@
+"""
+API assíncrona do compilador, para serviços asyncio: a compilação corre num
+executor (threads ou processos) e o laço de eventos continua livre
+
+    async with CompiladorAssincrono(processos=True, tempo_limite=5) as compilador:
+        resultado = await compilador.compilar(codigo)
+
+Com threads, o laço divide o GIL com as compilações e sofre atrasos da ordem
+do intervalo de troca do interpretador (sys.getswitchinterval()), além das
+coletas de lixo provocadas pelas ASTs criadas; com processos, só a
+desserialização do resultado acontece no processo do laço, e ela também
+pode ser evitada com manter_ast=False.
+"""
+
+import asyncio
+import os
+import pickle
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from .compilador_moonlet import AnalisadorMoonlet
+from .resultado_compilacao import ResultadoCompilacao
+
+# Compiladores de cada processo do pool, por conjunto de opções serializado
+_compiladores: Dict[bytes, AnalisadorMoonlet] = {}
+
+
+def _compilar(compilador: AnalisadorMoonlet, codigo: str, nome_arquivo: str,
+              manter_ast: bool, argumentos: dict) -> ResultadoCompilacao:
+    resultado = compilador.compilar(codigo, nome_arquivo, **argumentos)
+    if not manter_ast:
+        resultado.ast = None
+    return resultado
+
+
+def _compilar_em_processo(chave: bytes, *argumentos) -> ResultadoCompilacao:
+    compilador = _compiladores.get(chave)
+    if compilador is None:
+        compilador = _compiladores[chave] = AnalisadorMoonlet(**pickle.loads(chave))
+    return _compilar(compilador, *argumentos)
+
+
+class CompiladorAssincrono:
+    """Compilações com await, limite de simultaneidade, tempo limite e cancelamento
+
+    Sem executor, cria um ThreadPoolExecutor (ou, com processos=True, um
+    ProcessPoolExecutor) de `trabalhadores` trabalhadores. No máximo
+    max_simultaneas compilações (padrão: uma por trabalhador) ficam no
+    executor; as demais esperam a vez sem ocupá-lo. opcoes vão para o
+    AnalisadorMoonlet (motor_lexico, otimizar, cache...); com processos,
+    precisam ser serializáveis com pickle.
+
+    Cancelar a espera (ou estourar o tempo limite) retira do executor uma
+    compilação que ainda não começou; uma que já começou vai até o fim, pois
+    threads e processos do pool não podem ser interrompidos, e o seu
+    resultado é descartado. A vaga só é liberada quando ela termina.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, processos: bool = False,
+                 trabalhadores: Optional[int] = None, max_simultaneas: Optional[int] = None,
+                 tempo_limite: Optional[float] = None, **opcoes):
+        self.trabalhadores = trabalhadores or os.cpu_count()
+        self._criou_executor = executor is None
+        if executor is None:
+            executor = (ProcessPoolExecutor if processos else ThreadPoolExecutor)(self.trabalhadores)
+        self.executor = executor
+        self.em_processos = isinstance(executor, ProcessPoolExecutor)
+        self.max_simultaneas = max_simultaneas or self.trabalhadores
+        self.tempo_limite = tempo_limite
+        if self.em_processos:
+            self._chave_opcoes = pickle.dumps(opcoes)
+        else:
+            self._compilador = AnalisadorMoonlet(**opcoes)
+        self._vagas = asyncio.Semaphore(self.max_simultaneas)
+
+    async def compilar(self, codigo: str, nome_arquivo: str = "<código>",
+                       tempo_limite: Optional[float] = None, manter_ast: bool = True,
+                       **argumentos) -> ResultadoCompilacao:
+        """AnalisadorMoonlet.compilar() fora do laço de eventos
+
+        tempo_limite (em segundos) substitui o padrão do objeto; estourado,
+        levanta asyncio.TimeoutError. argumentos são os de compilar()
+        (manter_tokens, verificar_semantica, gerar_codigo).
+
+        Com manter_ast=False, resultado.ast vem None (resultado.sucesso
+        continua valendo). Com processos, isso evita desserializar a árvore
+        no processo do laço, o único trabalho pesado que sobra para ele.
+        """
+        tempo_limite = self.tempo_limite if tempo_limite is None else tempo_limite
+        laco = asyncio.get_running_loop()
+        prazo = None if tempo_limite is None else laco.time() + tempo_limite
+        # O tempo limite conta desde a chamada, incluindo a espera por uma vaga
+        await asyncio.wait_for(self._vagas.acquire(), tempo_limite)
+        futuro = self._submeter(codigo, nome_arquivo, manter_ast, argumentos)
+        futuro.add_done_callback(lambda _: self._liberar(laco))
+        restante = None if prazo is None else max(prazo - laco.time(), 0)
+        # wrap_future repassa o cancelamento ao futuro do executor
+        return await asyncio.wait_for(asyncio.wrap_future(futuro), restante)
+
+    async def verificar(self, codigo: str, nome_arquivo: str = "<código>", semantica: bool = True,
+                        tempo_limite: Optional[float] = None,
+                        manter_ast: bool = True) -> ResultadoCompilacao:
+        """Como AnalisadorMoonlet.verificar(): valida sem gerar MEPA"""
+        return await self.compilar(codigo, nome_arquivo, tempo_limite, manter_ast,
+                                   verificar_semantica=semantica, gerar_codigo=False)
+
+    def _submeter(self, codigo: str, nome_arquivo: str, manter_ast: bool, argumentos: dict) -> Future:
+        if self.em_processos:
+            return self.executor.submit(_compilar_em_processo, self._chave_opcoes,
+                                        codigo, nome_arquivo, manter_ast, argumentos)
+        return self.executor.submit(_compilar, self._compilador, codigo, nome_arquivo,
+                                    manter_ast, argumentos)
+
+    def _liberar(self, laco: asyncio.AbstractEventLoop):
+        # Chamado na thread do executor (ou do gerenciador do pool de processos)
+        try:
+            laco.call_soon_threadsafe(self._vagas.release)
+        except RuntimeError:
+            pass  # laço já encerrado
+
+    async def fechar(self):
+        """Encerra o executor criado por este objeto, cancelando o que não começou"""
+        if self._criou_executor:
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda: self.executor.shutdown(cancel_futures=True))
+
+    async def __aenter__(self) -> 'CompiladorAssincrono':
+        return self
+
+    async def __aexit__(self, *excecao):
+        await self.fechar()
+        return False
@@ -0,0 +1,177 @@
+"""
+Compilação em lote: muitos arquivos .moonlet distribuídos entre processos
+
+Cada arquivo é compilado inteiro num processo do pool e gera o seu .mepa (ou
+.mepab, em bytecode); ao processo principal volta só um resumo (diagnósticos
+e contagens), nunca a AST. No fim, um relatório único reúne os diagnósticos
+de todos os arquivos e a vazão (arquivos/s e tokens/s).
+"""
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from ..mepa.bytecode_mepa import EXTENSAO_BYTECODE, salvar
+from ..mepa.instrucoes_mepa import decodificar
+from ..utils import CONFIG
+from .cache_compilacao import CacheCompilacao
+from .compilador_moonlet import AnalisadorMoonlet
+
+EXTENSAO_FONTE = '.moonlet'
+EXTENSAO_MEPA = '.mepa'
+
+
+def coletar_arquivos(padroes: Iterable[str]) -> List[str]:
+    """Expande diretórios (recursivamente) e padrões glob em arquivos .moonlet, sem repetições"""
+    arquivos: Dict[str, None] = {}
+    for padrao in padroes:
+        if os.path.isdir(padrao):
+            for diretorio, subdiretorios, nomes in os.walk(padrao):
+                subdiretorios.sort()
+                for nome in sorted(nomes):
+                    if nome.endswith(EXTENSAO_FONTE):
+                        arquivos[os.path.join(diretorio, nome)] = None
+        else:
+            for caminho in sorted(glob.glob(padrao, recursive=True)) or [padrao]:
+                arquivos[caminho] = None
+    return list(arquivos)
+
+
+@dataclass
+class ResumoArquivo:
+    """O que volta de cada processo: sem AST, só o necessário para o relatório"""
+    caminho: str
+    sucesso: bool
+    diagnosticos: List[str] = field(default_factory=list)
+    saida: Optional[str] = None
+    tokens: int = 0
+    instrucoes: int = 0
+    segundos: float = 0.0
+
+
+@dataclass
+class RelatorioLote:
+    """Resumos de todos os arquivos e a vazão da compilação em lote"""
+    arquivos: List[ResumoArquivo]
+    segundos: float
+    processos: int
+
+    @property
+    def falhas(self) -> List[ResumoArquivo]:
+        return [resumo for resumo in self.arquivos if not resumo.sucesso]
+
+    @property
+    def tokens(self) -> int:
+        return sum(resumo.tokens for resumo in self.arquivos)
+
+    @property
+    def arquivos_por_segundo(self) -> float:
+        return len(self.arquivos) / self.segundos if self.segundos else 0.0
+
+    @property
+    def tokens_por_segundo(self) -> float:
+        return self.tokens / self.segundos if self.segundos else 0.0
+
+    def como_dict(self) -> dict:
+        return {
+            'arquivos': [asdict(resumo) for resumo in self.arquivos],
+            'resumo': {
+                'arquivos': len(self.arquivos),
+                'falhas': len(self.falhas),
+                'tokens': self.tokens,
+                'segundos': self.segundos,
+                'processos': self.processos,
+                'arquivos_por_segundo': self.arquivos_por_segundo,
+                'tokens_por_segundo': self.tokens_por_segundo,
+            },
+        }
+
+    def como_json(self, **opcoes_json) -> str:
+        return json.dumps(self.como_dict(), ensure_ascii=False, **opcoes_json)
+
+    def imprimir(self):
+        for resumo in self.falhas:
+            print(f"✗ {resumo.caminho}")
+            for diagnostico in resumo.diagnosticos:
+                print(f"    {diagnostico}")
+        print(f"\n{len(self.arquivos)} arquivo(s), {len(self.falhas)} com erros, "
+              f"{self.tokens:,} tokens em {self.segundos:.3f}s com {self.processos} processo(s)")
+        print(f"Vazão: {self.arquivos_por_segundo:,.1f} arquivos/s, {self.tokens_por_segundo:,.0f} tokens/s")
+
+
+# Um compilador por combinação de opções em cada processo do pool
+_compiladores: Dict[tuple, AnalisadorMoonlet] = {}
+
+
+def _compilador(otimizar: bool, diretorio_cache: Optional[str]) -> AnalisadorMoonlet:
+    compilador = _compiladores.get((otimizar, diretorio_cache))
+    if compilador is None:
+        cache = CacheCompilacao(diretorio_cache) if diretorio_cache else None
+        compilador = _compiladores[otimizar, diretorio_cache] = AnalisadorMoonlet(otimizar=otimizar,
+                                                                                 cache=cache)
+    return compilador
+
+
+def caminho_saida(caminho: str, diretorio_saida: Optional[str], base: str, bytecode: bool) -> str:
+    """Onde gravar a saída de um arquivo: ao lado dele ou na mesma posição relativa em diretorio_saida"""
+    raiz, _ = os.path.splitext(caminho)
+    if diretorio_saida is not None:
+        raiz = os.path.join(diretorio_saida, os.path.relpath(raiz, base))
+    return raiz + (EXTENSAO_BYTECODE if bytecode else EXTENSAO_MEPA)
+
+
+def compilar_arquivo(caminho: str, diretorio_saida: Optional[str] = None, base: str = '.',
+                     otimizar: bool = False, bytecode: bool = False,
+                     diretorio_cache: Optional[str] = None) -> ResumoArquivo:
+    """Compila um arquivo e grava a saída se não houver erros (executada nos processos do pool)"""
+    inicio = time.perf_counter()
+    try:
+        with open(caminho, 'r', encoding=CONFIG['encoding']) as arquivo:
+            codigo = arquivo.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return ResumoArquivo(caminho, False, [f"Erro ao ler arquivo: {e}"])
+
+    resultado = _compilador(otimizar, diretorio_cache).compilar(codigo, caminho, manter_tokens=True)
+    diagnosticos = [str(erro) for erro in resultado.diagnosticos]
+    if resultado.erro_fatal is not None:
+        diagnosticos.append(str(resultado.erro_fatal))
+    resumo = ResumoArquivo(caminho, resultado.sucesso and not resultado.relatorio_erros.tem_erros(),
+                           diagnosticos, tokens=len(resultado.tokens) - 1,
+                           instrucoes=len(resultado.codigo_mepa))
+    if resumo.sucesso:
+        resumo.saida = caminho_saida(caminho, diretorio_saida, base, bytecode)
+        os.makedirs(os.path.dirname(resumo.saida) or '.', exist_ok=True)
+        if bytecode:
+            salvar(decodificar(resultado.codigo_mepa, resultado.tamanho_quadro), resumo.saida)
+        else:
+            with open(resumo.saida, 'w', encoding=CONFIG['encoding']) as arquivo:
+                arquivo.write('\n'.join(resultado.codigo_mepa) + '\n')
+    resumo.segundos = time.perf_counter() - inicio
+    return resumo
+
+
+def compilar_lote(arquivos: List[str], processos: Optional[int] = None,
+                  diretorio_saida: Optional[str] = None, otimizar: bool = False,
+                  bytecode: bool = False, diretorio_cache: Optional[str] = None) -> RelatorioLote:
+    """Compila os arquivos num ProcessPoolExecutor (com um só processo, aqui mesmo)
+
+    Com diretorio_saida, as saídas repetem ali a estrutura de diretórios dos
+    arquivos de entrada; sem ele, cada saída fica ao lado do seu arquivo.
+    """
+    processos = max(1, min(processos or os.cpu_count(), len(arquivos) or 1))
+    base = os.path.commonpath([os.path.dirname(os.path.abspath(c)) for c in arquivos]) if arquivos else '.'
+    argumentos = [(caminho, diretorio_saida, base, otimizar, bytecode, diretorio_cache)
+                  for caminho in arquivos]
+    inicio = time.perf_counter()
+    if processos == 1:
+        resumos = [compilar_arquivo(*args) for args in argumentos]
+    else:
+        with ProcessPoolExecutor(processos) as executor:
+            # Lotes de alguns arquivos por tarefa diluem o custo de comunicação
+            tamanho_lote = max(1, len(arquivos) // (processos * 4))
+            resumos = list(executor.map(compilar_arquivo, *zip(*argumentos), chunksize=tamanho_lote))
+    return RelatorioLote(resumos, time.perf_counter() - inicio, processos)
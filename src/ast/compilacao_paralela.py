@@ -0,0 +1,89 @@
+"""
+Análise léxica paralela de arquivos grandes: o código é dividido em trechos
+em inícios de linha fora de strings e comentários, cada trecho vira um
+TokenBuffer num processo à parte, e os buffers são unidos na ordem do arquivo
+
+A análise sintática, a semântica e a geração de MEPA continuam sequenciais,
+sobre a sequência de tokens unida. Devolver a AST de cada trecho ao processo
+principal custaria tanto quanto construí-la (a desserialização cria os mesmos
+objetos, nó a nó), enquanto um TokenBuffer são algumas colunas de array.
+Como os tokens são os mesmos da análise do arquivo inteiro, a AST, os
+diagnósticos e o MEPA são idênticos aos da compilação sequencial.
+"""
+
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, NamedTuple, Optional
+
+from ..lexer import TokenBuffer
+from ..lexer.lexico_moonlet import MOTOR_CARACTERE
+
+# Onde uma quebra de linha não separa tokens: comentários longos e strings
+# (que podem se estender por várias linhas). Comentários curtos terminam
+# antes da quebra, mas precisam ser reconhecidos para que aspas dentro deles
+# não abram strings.
+_RE_CONTEXTO = re.compile(
+    r'(?P<comentario>--\[\[.*?(?:\]\]|\Z)|--[^\n]*)'
+    r'|(?P<string>"[^"]*(?:"|\Z)|\'[^\']*(?:\'|\Z))',
+    re.DOTALL)
+
+
+class Trecho(NamedTuple):
+    """Fatia do código fonte, com a linha (como o lexer a conta) e a posição do início"""
+    codigo: str
+    linha: int
+    deslocamento: int
+
+
+def dividir_trechos(codigo: str, partes: int, tamanho_minimo: int = 64 * 1024) -> List[Trecho]:
+    """Divide o código em até `partes` trechos de tamanhos parecidos, com pelo
+    menos tamanho_minimo caracteres cada, cortando só em inícios de linha que
+    não estejam dentro de strings nem de comentários longos"""
+    partes = min(partes, len(codigo) // max(tamanho_minimo, 1))
+    if partes < 2 or '\0' in codigo:
+        # O lexer encerra a análise no primeiro '\0': nada depois dele conta
+        return [Trecho(codigo, 1, 0)]
+
+    trechos = []
+    inicio = 0
+    linha = 1
+    linhas_em_strings = 0  # o lexer não conta as quebras de linha dentro de strings
+    contextos = _RE_CONTEXTO.finditer(codigo)
+    contexto = next(contextos, None)
+    for parte in range(1, partes):
+        corte = codigo.find('\n', max(len(codigo) * parte // partes, inicio)) + 1
+        while corte:
+            # Avança pelos contextos que terminam antes do corte
+            while contexto is not None and contexto.end() <= corte:
+                if contexto.lastgroup == 'string':
+                    linhas_em_strings += contexto.group().count('\n')
+                contexto = next(contextos, None)
+            if contexto is None or contexto.start() >= corte:
+                break
+            # O corte caiu dentro de uma string ou comentário: tenta a linha seguinte ao fim dele
+            corte = codigo.find('\n', contexto.end()) + 1
+        if not corte:
+            break
+        trechos.append(Trecho(codigo[inicio:corte], linha, inicio))
+        linha += codigo.count('\n', inicio, corte) - linhas_em_strings
+        inicio = corte
+        linhas_em_strings = 0
+    trechos.append(Trecho(codigo[inicio:], linha, inicio))
+    return trechos
+
+
+def analisar_trecho(trecho: Trecho, motor: str = MOTOR_CARACTERE) -> TokenBuffer:
+    """Análise léxica de um trecho (executada nos processos auxiliares)"""
+    return TokenBuffer.construir(trecho.codigo, motor, trecho.linha, trecho.deslocamento)
+
+
+def analisar_em_paralelo(trechos: List[Trecho], motor: str = MOTOR_CARACTERE,
+                         processos: Optional[int] = None,
+                         executor: Optional[Executor] = None) -> TokenBuffer:
+    """Analisa os trechos em processos separados e une os tokens num só buffer"""
+    if executor is None:
+        with ProcessPoolExecutor(processos or os.cpu_count()) as executor:
+            return analisar_em_paralelo(trechos, motor, executor=executor)
+    return TokenBuffer.concatenar(list(executor.map(analisar_trecho, trechos,
+                                                    [motor] * len(trechos))))
@@ -5,16 +5,28 @@ Demonstra todas as funcionalidades: análise léxica, sintática e geração de
 
 import sys
 import os
-from typing import Optional
+import time
+from concurrent.futures import Executor
+from typing import Optional, Union
 
 # Adicionar path para imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 
 # Imports da estrutura organizada
-from ..lexer import AnalisadorLexicoMoonlet
+from ..lexer import AnalisadorLexicoMoonlet, TokenBuffer
+from ..lexer.lexico_moonlet import MOTOR_CARACTERE
 from ..parser import AnalisadorSintaticoMoonlet
 from ..parser.sintatico_moonlet import ProgramNode
-from ..errors import RelatorioErros
+from ..errors import RelatorioErros, Diagnostico, ErroGeracao
+from ..errors.erros_moonlet import AVISO_TOKEN_INVALIDO, AVISO_TOKEN_PULADO
+from ..semantic import AnalisadorSemantico
+from .resultado_compilacao import ResultadoCompilacao
+from .estatisticas_compilacao import EstatisticasCompilacao, MedidorMemoria, contar_nos
+from .compilacao_paralela import dividir_trechos, analisar_em_paralelo
+from .cache_compilacao import CacheCompilacao
+from .memo_compilacao import MemoCompilacao
+from ..mepa.gerador_mepa import GeradorMEPA
+from ..mepa.otimizador_mepa import OtimizadorPeephole
 from ..utils import TOKEN_MAP, EOS, ERRO, CONFIG, MENSAGENS
 from examples.exemplos_moonlet import obter_exemplo
 
@@ -207,8 +219,15 @@ class ImpressorAST(ASTVisitor):
     def visit_for_in_loop(self, node):
         self._imprimir(f"FOR-IN-LOOP: {', '.join(node.variaveis)}")
         self._entrar_escopo()
-        self._imprimir("ITERADOR:")
-        node.iterador.accept(self)
+        if node.inicio:
+            self._imprimir("INÍCIO:")
+            node.inicio.accept(self)
+        if node.iterador:
+            self._imprimir("ITERADOR:")
+            node.iterador.accept(self)
+        if node.passo:
+            self._imprimir("PASSO:")
+            node.passo.accept(self)
         self._imprimir("CORPO:")
         for cmd in node.corpo:
             cmd.accept(self)
@@ -225,8 +244,15 @@ class ImpressorAST(ASTVisitor):
 class AnalisadorMoonlet:
     """Classe principal do compilador Moonlet"""
     
-    def __init__(self):
+    def __init__(self, motor_lexico: str = MOTOR_CARACTERE, otimizar: bool = False,
+                 coletar_estatisticas: bool = False, medir_memoria: bool = True,
+                 cache: Union[CacheCompilacao, MemoCompilacao, None] = None):
         self.relatorio_erros = RelatorioErros()
+        self.motor_lexico = motor_lexico
+        self.otimizar = otimizar
+        self.coletar_estatisticas = coletar_estatisticas
+        self.medir_memoria = medir_memoria  # só vale com coletar_estatisticas
+        self.cache = cache
     
     def analisar_arquivo(self, caminho_arquivo: str) -> Optional[ProgramNode]:
         """Analisa um arquivo Moonlet"""
@@ -241,59 +267,233 @@ class AnalisadorMoonlet:
             print(f"Erro ao ler arquivo: {e}")
             return None
     
-    def analisar_codigo(self, codigo: str, nome_arquivo: str = "<código>") -> Optional[ProgramNode]:
-        """Analisa código Moonlet"""
-        print(f"=== ANALISANDO: {nome_arquivo} ===\n")
+    def compilar(self, codigo: str, nome_arquivo: str = "<código>",
+                 manter_tokens: bool = False, verificar_semantica: bool = True,
+                 gerar_codigo: bool = True, destino_mepa=None,
+                 tokens: Optional[TokenBuffer] = None) -> ResultadoCompilacao:
+        """Compila código Moonlet sem imprimir nada e devolve o resultado estruturado
+        
+        Fases: sintática (AST) → semântica (tabela de símbolos e endereços) →
+        geração de MEPA → otimização opcional. A semântica e a geração são
+        desligáveis para apenas validar o código. tokens, se dado, é o
+        resultado já pronto da análise léxica do código, que então é pulada.
+        
+        Com destino_mepa (ver GeradorMEPA), o código MEPA é entregue a ele à
+        medida que é gerado e resultado.codigo_mepa fica vazio; só vale o que
+        o destino recebeu se resultado.sucesso. O otimizador peephole precisa
+        do código inteiro e não pode ser combinado com um destino.
         
-        # Análise léxica
-        print("1. ANÁLISE LÉXICA")
+        Com coletar_estatisticas, resultado.estatisticas traz memória e
+        contagens por fase. A análise léxica passa então a ser feita antes da
+        sintática, para ter tempo e memória próprios. Medir memória liga o
+        tracemalloc, que deixa todas as fases mais lentas; com
+        medir_memoria=False ficam só tempos e contagens, quase sem custo.
+        Desligada, a coleta não custa nada.
+        
+        Com um cache (CacheCompilacao, em disco, ou MemoCompilacao, em
+        memória), um código já compilado com as mesmas opções é recuperado
+        em vez de compilado. O cache não é usado com destino_mepa, tokens ou
+        coletar_estatisticas.
+        """
+        if destino_mepa is not None and self.otimizar:
+            raise ValueError("O otimizador peephole precisa do código MEPA inteiro: "
+                             "não é possível usá-lo com um destino_mepa")
+        if not self.coletar_estatisticas:
+            if self.cache is None or destino_mepa is not None or tokens is not None:
+                return self._compilar(codigo, nome_arquivo, manter_tokens, verificar_semantica,
+                                      gerar_codigo, destino_mepa, tokens, None)
+            opcoes = (f"{self.motor_lexico}:{self.otimizar:d}:{manter_tokens:d}"
+                      f":{verificar_semantica:d}:{gerar_codigo:d}")
+            chave = self.cache.chave(codigo, opcoes)
+            resultado = self.cache.obter(chave, nome_arquivo)
+            if resultado is None:
+                resultado = self._compilar(codigo, nome_arquivo, manter_tokens, verificar_semantica,
+                                           gerar_codigo, None, None, None)
+                self.cache.guardar(chave, resultado)
+            return resultado
+        with MedidorMemoria(self.medir_memoria) as medidor:
+            resultado = self._compilar(codigo, nome_arquivo, manter_tokens, verificar_semantica,
+                                       gerar_codigo, destino_mepa, tokens,
+                                       EstatisticasCompilacao(), medidor)
+        resultado.estatisticas.memoria = medidor.memoria
+        return resultado
+    
+    def compilar_paralelo(self, codigo: str, nome_arquivo: str = "<código>",
+                          processos: Optional[int] = None, executor: Optional[Executor] = None,
+                          tamanho_minimo_trecho: int = 64 * 1024,
+                          **opcoes) -> ResultadoCompilacao:
+        """Como compilar(), mas com a análise léxica dividida entre processos
+        
+        O código é cortado em trechos (ver compilacao_paralela), e os tokens
+        de cada um são produzidos num processo do executor (um
+        ProcessPoolExecutor novo com `processos` processos, se nenhum for
+        dado). O resto da compilação corre aqui sobre os tokens unidos, e o
+        resultado é o mesmo de compilar(). Código pequeno demais para dividir
+        é compilado sem o executor. opcoes são as mesmas de compilar().
+        """
+        processos = processos or getattr(executor, '_max_workers', None) or os.cpu_count()
+        trechos = dividir_trechos(codigo, processos, tamanho_minimo_trecho)
+        if len(trechos) < 2:
+            return self.compilar(codigo, nome_arquivo, **opcoes)
+        inicio = time.perf_counter()
+        tokens = analisar_em_paralelo(trechos, self.motor_lexico, processos, executor)
+        tempo_lexico = time.perf_counter() - inicio
+        resultado = self.compilar(codigo, nome_arquivo, tokens=tokens, **opcoes)
+        resultado.tempos['lexico'] = tempo_lexico
+        resultado.tempos['total'] += tempo_lexico
+        return resultado
+    
+    def _compilar(self, codigo: str, nome_arquivo: str, manter_tokens: bool,
+                  verificar_semantica: bool, gerar_codigo: bool, destino_mepa,
+                  tokens: Optional[TokenBuffer],
+                  estatisticas: Optional[EstatisticasCompilacao],
+                  medidor: Optional[MedidorMemoria] = None) -> ResultadoCompilacao:
+        resultado = ResultadoCompilacao(nome_arquivo, estatisticas=estatisticas)
+        inicio_total = time.perf_counter()
+        
+        if tokens is not None or manter_tokens or estatisticas is not None:
+            if tokens is None:
+                inicio = time.perf_counter()
+                tokens = TokenBuffer.construir(codigo, motor=self.motor_lexico)
+                resultado.tempos['lexico'] = time.perf_counter() - inicio
+            fonte_tokens = tokens.cursor()
+            if manter_tokens:
+                resultado.tokens = tokens
+            if estatisticas is not None:
+                medidor.fase('lexico')
+                estatisticas.tokens = len(tokens) - 1  # sem o EOS
+        else:
+            # Sem gravação: o lexer alimenta o parser diretamente
+            fonte_tokens = AnalisadorLexicoMoonlet(codigo, motor=self.motor_lexico)
+        
+        inicio = time.perf_counter()
+        parser = None
+        try:
+            parser = AnalisadorSintaticoMoonlet(fonte_tokens)
+            resultado.ast = parser.analisar()
+        except Exception as e:
+            resultado.erro_fatal = e
+        resultado.tempos['sintatico'] = time.perf_counter() - inicio
+        if parser is not None:
+            resultado.relatorio_erros = parser.relatorio_erros
+        if estatisticas is not None:
+            medidor.fase('sintatico')
+            if resultado.ast is not None:
+                estatisticas.nos_ast = contar_nos(resultado.ast)
+                medidor.reiniciar()
+        
+        if verificar_semantica and resultado.sucesso:
+            inicio = time.perf_counter()
+            semantico = AnalisadorSemantico()
+            try:
+                semantico.analisar(resultado.ast)
+            except Exception as e:
+                # Erro semântico interrompe a compilação, como um erro fatal de sintaxe
+                resultado.erro_fatal = e
+                resultado.ast = None
+            resultado.tabela_simbolos = semantico.tabela_simbolos
+            resultado.proximo_endereco = semantico.proximo_endereco
+            resultado.tempos['semantico'] = time.perf_counter() - inicio
+            if estatisticas is not None:
+                medidor.fase('semantico')
+                estatisticas.simbolos = semantico.simbolos_declarados
+                estatisticas.temporarios = semantico.temporarios_alocados
+            
+            if gerar_codigo and resultado.sucesso:
+                inicio = time.perf_counter()
+                try:
+                    if destino_mepa is None:
+                        resultado.codigo_mepa = GeradorMEPA().gerar(resultado.ast)
+                    else:
+                        GeradorMEPA(destino_mepa).gerar(resultado.ast)
+                except ErroGeracao as e:
+                    resultado.erro_fatal = e
+                    resultado.ast = None
+                resultado.tempos['geracao'] = time.perf_counter() - inicio
+                if estatisticas is not None:
+                    medidor.fase('geracao')
+        
+        if self.otimizar and resultado.codigo_mepa:
+            inicio = time.perf_counter()
+            otimizador = OtimizadorPeephole()
+            resultado.codigo_mepa = otimizador.otimizar(resultado.codigo_mepa)
+            resultado.otimizacoes = otimizador.contadores
+            resultado.tempos['otimizacao'] = time.perf_counter() - inicio
+            if estatisticas is not None:
+                medidor.fase('otimizacao')
+        resultado.tempos['total'] = time.perf_counter() - inicio_total
+        if estatisticas is not None:
+            estatisticas.tempos = resultado.tempos
+            if 'geracao' in resultado.tempos and resultado.sucesso and destino_mepa is None:
+                estatisticas.instrucoes_mepa = len(resultado.codigo_mepa)
+        return resultado
+    
+    def verificar(self, codigo: str, nome_arquivo: str = "<código>",
+                  semantica: bool = True) -> ResultadoCompilacao:
+        """Apenas valida o código: constrói a AST (e, opcionalmente, faz a
+        análise semântica) sem gerar MEPA"""
+        return self.compilar(codigo, nome_arquivo, verificar_semantica=semantica, gerar_codigo=False)
+    
+    def analisar_codigo(self, codigo: str, nome_arquivo: str = "<código>",
+                        listar_tokens: bool = True) -> Optional[ProgramNode]:
+        """Analisa código Moonlet e imprime o andamento de cada fase"""
+        resultado = self.compilar(codigo, nome_arquivo, manter_tokens=listar_tokens)
+        # Guardar referência para recuperar MEPA depois
+        self._ultimo_resultado = resultado
+        self.imprimir_resultado(resultado)
+        return resultado.ast
+    
+    def imprimir_resultado(self, resultado: ResultadoCompilacao):
+        """Renderiza no console as fases de análise de um resultado"""
+        print(f"=== ANALISANDO: {resultado.nome_arquivo} ===\n")
+        
+        if resultado.tokens is not None:
+            print("1. ANÁLISE LÉXICA")
+            print(CONFIG['separador_linha'])
+            self._listar_tokens(resultado.tokens)
+        
+        # Análise sintática
+        print("\n2. ANÁLISE SINTÁTICA")
         print(CONFIG['separador_linha'])
-        lexer = AnalisadorLexicoMoonlet(codigo)
+        for aviso in resultado.relatorio_erros.avisos:
+            print(f"           {self._formatar_aviso(aviso)}")
         
-        # Mostrar tokens
-        token = lexer.proximo_token()
+        if resultado.sucesso:
+            print(f"✓ {MENSAGENS['sucesso_analise_sintatica']}")
+            
+            # Mostrar relatório de erros se houver
+            if resultado.relatorio_erros.tem_erros():
+                print("\n⚠️  Erros encontrados durante a análise:")
+                resultado.relatorio_erros.imprimir_relatorio()
+        else:
+            print(f"✗ {MENSAGENS['erro_analise_sintatica']}: {resultado.erro_fatal}")
+    
+    @staticmethod
+    def _formatar_aviso(aviso: Diagnostico) -> str:
+        if aviso.tipo == AVISO_TOKEN_PULADO:
+            return f"🔄 Pulando token: '{aviso.lexema}'"
+        if aviso.tipo == AVISO_TOKEN_INVALIDO:
+            return f"⚠️  ERRO SINTÁTICO: Token inválido '{aviso.lexema}' na linha {aviso.linha}"
+        return f"⚠️  ERRO SINTÁTICO: {aviso.mensagem}"
+    
+    def _listar_tokens(self, buffer: TokenBuffer):
+        """Imprime a tabela de tokens gravados"""
         contador_tokens = 0
         erros_lexicos = 0
         
-        while token.tipo != EOS:
+        for token in buffer:
             print(f"Linha {token.linha:02d} | {TOKEN_MAP[token.tipo]:<18} | '{token.lexema}'")
+            if token.tipo == EOS:
+                break
             if token.tipo == ERRO:
                 erros_lexicos += 1
                 print(f"           ⚠️  ERRO LÉXICO: Caractere inválido '{token.lexema}' na linha {token.linha}")
-            token = lexer.proximo_token()
             contador_tokens += 1
         
-        # Mostrar token EOS
-        print(f"Linha {token.linha:02d} | {TOKEN_MAP[token.tipo]:<18} | '{token.lexema}'")
-        
         if erros_lexicos > 0:
             print(f"\n⚠️  {erros_lexicos} erro(s) léxico(s) encontrado(s)!")
         
         print(f"\nTotal de tokens: {contador_tokens}")
-        
-        # Análise sintática
-        print("\n2. ANÁLISE SINTÁTICA")
-        print(CONFIG['separador_linha'])
-        
-        lexer = AnalisadorLexicoMoonlet(codigo)  # Reinicializar lexer
-        parser = AnalisadorSintaticoMoonlet(lexer)
-        # Guardar referência para recuperar MEPA depois
-        self._ultimo_parser = parser
-        
-        try:
-            ast = parser.analisar()
-            print(f"✓ {MENSAGENS['sucesso_analise_sintatica']}")
-            
-            # Mostrar relatório de erros se houver
-            if parser.relatorio_erros.tem_erros():
-                print("\n⚠️  Erros encontrados durante a análise:")
-                parser.relatorio_erros.imprimir_relatorio()
-            
-            return ast
-            
-        except Exception as e:
-            print(f"✗ {MENSAGENS['erro_analise_sintatica']}: {e}")
-            return None
     
     def imprimir_ast(self, ast: ProgramNode):
         """Imprime a AST de forma legível"""
@@ -305,15 +505,43 @@ class AnalisadorMoonlet:
         print("\n4. CÓDIGO INTERMEDIÁRIO (MEPA)")
         print(CONFIG['separador_linha'])
         try:
-            codigo_mepa = getattr(self, '_ultimo_parser', None).codigo_mepa  # type: ignore[attr-defined]
+            resultado = getattr(self, '_ultimo_resultado', None)
+            codigo_mepa = resultado.codigo_mepa  # type: ignore[attr-defined]
             if codigo_mepa:
                 for instr in codigo_mepa:
                     print(instr)
+                print(f"\nQuadro de dados: {resultado.tamanho_quadro} posição(ões)")
             else:
                 print("(sem instruções MEPA geradas)")
         except Exception:
             print("(MEPA indisponível nesta execução)")
     
+    def imprimir_estatisticas(self, resultado: Optional[ResultadoCompilacao] = None,
+                              formato_json: bool = False):
+        """Imprime as estatísticas por fase (da última análise, se nenhum resultado for dado)"""
+        if resultado is None:
+            resultado = getattr(self, '_ultimo_resultado', None)
+        if resultado is None or resultado.estatisticas is None:
+            print("(estatísticas não coletadas: use coletar_estatisticas=True)")
+            return
+        estatisticas = resultado.estatisticas
+        if formato_json:
+            print(estatisticas.como_json(indent=2))
+            return
+        print(f"\nESTATÍSTICAS DA COMPILAÇÃO: {resultado.nome_arquivo}")
+        print(CONFIG['separador_linha'])
+        print(f"{'fase':<11} | {'tempo':>10} | {'alocada':>11} | {'pico':>11}")
+        for fase, dados in estatisticas.como_dict()['fases'].items():
+            print(f"{fase:<11} | {dados['segundos'] * 1000:>7.3f} ms | "
+                  f"{dados.get('alocada', 0) / 1024:>8.1f} KB | {dados.get('pico', 0) / 1024:>8.1f} KB")
+        print(f"{'total':<11} | {estatisticas.tempos['total'] * 1000:>7.3f} ms")
+        contagens = (('Tokens', estatisticas.tokens), ('Nós da AST', estatisticas.nos_ast),
+                     ('Símbolos', estatisticas.simbolos), ('Temporários', estatisticas.temporarios),
+                     ('Instruções MEPA', estatisticas.instrucoes_mepa))
+        print()
+        for rotulo, valor in contagens:
+            print(f"{rotulo + ':':<17}{'-' if valor is None else valor}")
+    
     def executar_teste_exemplo(self):
         """Executa um exemplo de teste"""
         codigo_exemplo = obter_exemplo('completo')
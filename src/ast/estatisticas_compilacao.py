@@ -0,0 +1,119 @@
+"""
+Estatísticas de uma compilação: tempo e memória por fase e contagens de
+tokens, nós da AST, símbolos, temporários e instruções MEPA
+"""
+
+import json
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from ..parser.sintatico_moonlet import ASTNode
+
+
+def _campos(classe: type):
+    for base in classe.__mro__:
+        yield from base.__dict__.get('__slots__', ())
+
+
+def contar_nos(raiz: ASTNode) -> int:
+    """Conta os nós da árvore percorrendo os campos declarados em __slots__"""
+    total = 0
+    pendentes = [raiz]
+    while pendentes:
+        no = pendentes.pop()
+        total += 1
+        for campo in _campos(type(no)):
+            valor = getattr(no, campo, None)
+            if isinstance(valor, ASTNode):
+                pendentes.append(valor)
+            elif isinstance(valor, list):
+                for item in valor:
+                    if isinstance(item, ASTNode):
+                        pendentes.append(item)
+                    elif isinstance(item, list):  # blocos de IfStatementNode
+                        pendentes.extend(i for i in item if isinstance(i, ASTNode))
+    return total
+
+
+@dataclass
+class EstatisticasCompilacao:
+    """Medições de uma compilação, por fase e no total
+
+    memoria[fase] traz 'alocada' (saldo de bytes ao fim da fase, isto é, o
+    que ela deixou para as seguintes; negativo se liberou mais do que
+    alocou) e 'pico' (maior volume alocado durante a fase, acima do que
+    havia no início); fica vazio se a memória não foi medida. simbolos conta todas as declarações, de todos os
+    escopos e com os temporários. As contagens que dependem de uma fase não
+    executada ficam em None.
+    """
+    tempos: Dict[str, float] = field(default_factory=dict)  # fase -> segundos
+    memoria: Dict[str, Dict[str, int]] = field(default_factory=dict)  # fase -> {alocada, pico}
+    tokens: Optional[int] = None
+    nos_ast: Optional[int] = None
+    simbolos: Optional[int] = None
+    temporarios: Optional[int] = None
+    instrucoes_mepa: Optional[int] = None
+
+    def como_dict(self) -> dict:
+        fases = {fase: {'segundos': segundos, **self.memoria.get(fase, {})}
+                 for fase, segundos in self.tempos.items() if fase != 'total'}
+        return {
+            'fases': fases,
+            'total_segundos': self.tempos.get('total'),
+            'contagens': {
+                'tokens': self.tokens,
+                'nos_ast': self.nos_ast,
+                'simbolos': self.simbolos,
+                'temporarios': self.temporarios,
+                'instrucoes_mepa': self.instrucoes_mepa,
+            },
+        }
+
+    def como_json(self, **opcoes_json) -> str:
+        return json.dumps(self.como_dict(), ensure_ascii=False, **opcoes_json)
+
+
+class MedidorMemoria:
+    """Mede com tracemalloc a memória alocada em cada fase
+
+    Usado como gerenciador de contexto em volta da compilação; cada chamada a
+    fase() fecha a medição da fase corrente e abre a da próxima. Se o
+    tracemalloc já estava ligado (num benchmark, p.ex.), ele não é desligado
+    ao final. Inativo, não mede nada e deixa memoria vazia: o tracemalloc
+    deixa a compilação várias vezes mais lenta.
+    """
+
+    def __init__(self, ativo: bool = True):
+        self.memoria: Dict[str, Dict[str, int]] = {}
+        self.ativo = ativo
+        self._ligou = False
+        self._base = 0
+
+    def __enter__(self) -> 'MedidorMemoria':
+        if not self.ativo:
+            return self
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._ligou = True
+        self.reiniciar()
+        return self
+
+    def __exit__(self, *excecao):
+        if self._ligou:
+            tracemalloc.stop()
+        return False
+
+    def reiniciar(self):
+        """Descarta o que foi alocado desde a última marcação (trabalho fora das fases)"""
+        if not self.ativo:
+            return
+        self._base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def fase(self, nome: str):
+        if not self.ativo:
+            return
+        atual, pico = tracemalloc.get_traced_memory()
+        self.memoria[nome] = {'alocada': atual - self._base, 'pico': pico - self._base}
+        self.reiniciar()
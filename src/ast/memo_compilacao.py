@@ -0,0 +1,97 @@
+"""
+Memória de resultados de compilação dentro do processo, para serviços que
+compilam os mesmos trechos de código repetidamente
+
+Mesma interface do CacheCompilacao (chave/obter/guardar), então é ligada do
+mesmo jeito: AnalisadorMoonlet(cache=MemoCompilacao()). Os resultados são
+guardados serializados e cada acerto devolve uma cópia nova: quem recebe pode
+alterar a AST ou o MEPA sem afetar a memória nem os outros chamadores. O
+tamanho serializado é também o que conta para o orçamento de bytes.
+"""
+
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from .resultado_compilacao import ResultadoCompilacao
+
+
+class MemoCompilacao:
+    """Resultados de compilação em memória com descarte LRU, seguro entre threads
+
+    O limite vale tanto para o número de entradas quanto para o total de
+    bytes serializados; o que for atingido primeiro provoca o descarte das
+    entradas usadas há mais tempo.
+    """
+
+    def __init__(self, max_entradas: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.acertos = 0
+        self.falhas = 0
+        self.gravacoes = 0
+        self.descartes = 0
+        self.bytes_ocupados = 0
+        self._entradas: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._trava = threading.Lock()
+
+    def chave(self, codigo: str, opcoes: str = '') -> str:
+        resumo = hashlib.sha256(opcoes.encode())
+        resumo.update(b'\0')
+        resumo.update(codigo.encode('utf-8', 'surrogatepass'))
+        return resumo.hexdigest()
+
+    def obter(self, chave: str, nome_arquivo: str) -> Optional[ResultadoCompilacao]:
+        """Uma cópia do resultado guardado sob a chave (com o nome de arquivo trocado), ou None"""
+        inicio = time.perf_counter()
+        with self._trava:
+            dados = self._entradas.get(chave)
+            if dados is None:
+                self.falhas += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+        resultado = pickle.loads(dados)
+        resultado.nome_arquivo = nome_arquivo
+        duracao = time.perf_counter() - inicio
+        resultado.tempos = {'cache': duracao, 'total': duracao}
+        return resultado
+
+    def guardar(self, chave: str, resultado: ResultadoCompilacao):
+        dados = pickle.dumps(resultado, pickle.HIGHEST_PROTOCOL)
+        if len(dados) > self.max_bytes:
+            return
+        with self._trava:
+            anterior = self._entradas.pop(chave, None)
+            if anterior is not None:
+                # Outra thread compilou o mesmo código ao mesmo tempo
+                self.bytes_ocupados -= len(anterior)
+            self._entradas[chave] = dados
+            self.bytes_ocupados += len(dados)
+            self.gravacoes += 1
+            while len(self._entradas) > self.max_entradas or self.bytes_ocupados > self.max_bytes:
+                _, descartado = self._entradas.popitem(last=False)
+                self.bytes_ocupados -= len(descartado)
+                self.descartes += 1
+
+    def limpar(self):
+        with self._trava:
+            self._entradas.clear()
+            self.bytes_ocupados = 0
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    @property
+    def taxa_acertos(self) -> float:
+        consultas = self.acertos + self.falhas
+        return self.acertos / consultas if consultas else 0.0
+
+    def estatisticas(self) -> dict:
+        with self._trava:
+            return {'acertos': self.acertos, 'falhas': self.falhas, 'taxa_acertos': self.taxa_acertos,
+                    'gravacoes': self.gravacoes, 'descartes': self.descartes,
+                    'entradas': len(self._entradas), 'bytes': self.bytes_ocupados}
@@ -0,0 +1,42 @@
+"""
+Resultado estruturado de uma compilação Moonlet (sem nenhuma saída em console)
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from ..errors.erros_moonlet import ErroCompilacao, RelatorioErros
+from ..lexer.buffer_tokens import TokenBuffer
+from ..parser.sintatico_moonlet import ProgramNode
+from .estatisticas_compilacao import EstatisticasCompilacao
+
+
+@dataclass
+class ResultadoCompilacao:
+    """Tudo o que uma compilação produz: tokens, AST, MEPA, diagnósticos e tempos"""
+    nome_arquivo: str
+    ast: Optional[ProgramNode] = None
+    codigo_mepa: List[str] = field(default_factory=list)
+    tokens: Optional[TokenBuffer] = None
+    relatorio_erros: RelatorioErros = field(default_factory=RelatorioErros)
+    erro_fatal: Optional[Exception] = None
+    tabela_simbolos: Dict[str, dict] = field(default_factory=dict)
+    proximo_endereco: int = 0  # pico de posições em uso (posições recicladas contam uma vez)
+    tempos: Dict[str, float] = field(default_factory=dict)  # fase -> segundos
+    otimizacoes: Dict[str, int] = field(default_factory=dict)  # regra peephole -> aplicações
+    estatisticas: Optional[EstatisticasCompilacao] = None  # só com coletar_estatisticas
+
+    @property
+    def sucesso(self) -> bool:
+        # Todo erro que impede a AST fica em erro_fatal; a AST pode ter sido
+        # descartada depois (ver CompiladorAssincrono.compilar(manter_ast=False))
+        return self.erro_fatal is None
+
+    @property
+    def tamanho_quadro(self) -> int:
+        """Número de posições do quadro de dados que a execução precisa reservar"""
+        return self.proximo_endereco
+
+    @property
+    def diagnosticos(self) -> List[ErroCompilacao]:
+        return self.relatorio_erros.erros
@@ -0,0 +1,306 @@
+"""
+Servidor de compilação: um processo de vida longa que recebe pedidos em
+linhas JSON por um socket Unix (ou pela entrada e saída padrão) e responde
+com diagnósticos, um resumo da AST ou o código MEPA
+
+Evita pagar, a cada script, a partida do Python e a importação do
+compilador. Os pedidos são compilados num pool de processos; cada processo
+mantém o seu compilador e a sua MemoCompilacao entre pedidos (ou usa o
+CacheCompilacao em disco, compartilhado, se houver um diretório de cache).
+
+Protocolo: cada linha é um objeto JSON, e cada resposta também.
+
+    {"id": 1, "op": "compilar", "codigo": "local x = 1", "retornar": ["mepa", "ast"]}
+    {"id": 2, "op": "verificar", "arquivo": "examples/mepa_if.moonlet"}
+    {"id": 3, "op": "estatisticas"}
+
+op é "compilar", "verificar" (sem gerar MEPA; "semantica": false pula também
+a análise semântica), "estatisticas" ou "ping". O código vem em "codigo" ou é
+lido de "arquivo"; "nome" dá o nome usado nos diagnósticos e "otimizar" liga
+o otimizador peephole. "retornar" escolhe o que vem além dos diagnósticos:
+"ast" (resumo) e/ou "mepa" (padrão de "compilar"). As respostas trazem o
+mesmo "id" e podem sair fora de ordem; "ok" é false só quando o pedido em si
+é inválido ("erro" explica), e "sucesso" diz se o código compilou sem erros.
+
+Contrapressão: no máximo max_pendentes pedidos ficam em andamento (somando
+todos os clientes); com todas as vagas ocupadas o servidor para de ler, e os
+clientes ficam bloqueados na escrita até que alguma compilação termine.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Optional
+
+from ..utils import CONFIG
+from .cache_compilacao import CacheCompilacao
+from .compilador_moonlet import AnalisadorMoonlet
+from .estatisticas_compilacao import contar_nos
+from .memo_compilacao import MemoCompilacao
+from .resultado_compilacao import ResultadoCompilacao
+
+OPERACOES = ('compilar', 'verificar', 'estatisticas', 'ping')
+TAMANHO_MAXIMO_LINHA = 64 * 1024 * 1024
+
+
+class PedidoInvalido(Exception):
+    """Pedido mal formado: vira uma resposta com ok=false"""
+
+
+# Compiladores de cada processo do pool, mantidos entre pedidos
+_compiladores: Dict[tuple, AnalisadorMoonlet] = {}
+
+
+def _compilador(otimizar: bool, diretorio_cache: Optional[str]) -> AnalisadorMoonlet:
+    compilador = _compiladores.get((otimizar, diretorio_cache))
+    if compilador is None:
+        cache = CacheCompilacao(diretorio_cache) if diretorio_cache else MemoCompilacao()
+        compilador = _compiladores[otimizar, diretorio_cache] = AnalisadorMoonlet(otimizar=otimizar,
+                                                                                 cache=cache)
+    return compilador
+
+
+def resumir_ast(resultado: ResultadoCompilacao) -> dict:
+    """Contagens da AST e os símbolos declarados (sem os temporários)"""
+    declaracoes = resultado.ast.declaracoes
+    return {
+        'nos': contar_nos(resultado.ast),
+        'declaracoes': len(declaracoes),
+        'tipos_declaracoes': dict(Counter(type(declaracao).__name__ for declaracao in declaracoes)),
+        'simbolos': [nome for nome in resultado.tabela_simbolos if not nome.startswith('__tmp')],
+        'tamanho_quadro': resultado.tamanho_quadro,
+    }
+
+
+def _diagnostico(erro: Exception) -> dict:
+    posicao = getattr(erro, 'posicao', None)
+    return {'tipo': type(erro).__name__, 'mensagem': str(erro),
+            'linha': posicao.linha if posicao is not None else None}
+
+
+def processar_pedido(pedido: dict, diretorio_cache: Optional[str] = None) -> dict:
+    """Compila ou verifica o código de um pedido (executada nos processos do pool)"""
+    if 'codigo' in pedido:
+        codigo = pedido['codigo']
+        nome = pedido.get('nome', '<código>')
+    elif 'arquivo' in pedido:
+        nome = pedido.get('nome', pedido['arquivo'])
+        try:
+            with open(pedido['arquivo'], 'r', encoding=CONFIG['encoding']) as arquivo:
+                codigo = arquivo.read()
+        except (OSError, UnicodeDecodeError) as e:
+            raise PedidoInvalido(f"Erro ao ler arquivo: {e}")
+    else:
+        raise PedidoInvalido("Pedido sem 'codigo' nem 'arquivo'")
+    if not isinstance(codigo, str):
+        raise PedidoInvalido("'codigo' deve ser uma string")
+
+    compilador = _compilador(bool(pedido.get('otimizar', False)), diretorio_cache)
+    gerar = pedido['op'] == 'compilar'
+    retornar = pedido.get('retornar', ['mepa'] if gerar else [])
+    resultado = compilador.compilar(codigo, nome, verificar_semantica=pedido.get('semantica', True),
+                                    gerar_codigo=gerar)
+    diagnosticos = [_diagnostico(erro) for erro in resultado.diagnosticos]
+    if resultado.erro_fatal is not None:
+        diagnosticos.append(_diagnostico(resultado.erro_fatal))
+    resposta = {'sucesso': resultado.sucesso and not resultado.relatorio_erros.tem_erros(),
+                'diagnosticos': diagnosticos, 'tempos': resultado.tempos}
+    if 'ast' in retornar and resultado.sucesso:
+        resposta['ast'] = resumir_ast(resultado)
+    if 'mepa' in retornar and gerar and resultado.sucesso:
+        resposta['mepa'] = resultado.codigo_mepa
+    return resposta
+
+
+def _aquecer() -> bool:
+    """Importa e exercita o compilador num processo do pool antes do primeiro pedido"""
+    AnalisadorMoonlet().compilar("local x = 1")
+    return True
+
+
+class ServidorCompilacao:
+    """Atende pedidos JSON por linha, com um pool de processos limitado e contrapressão
+
+    Sem executor, cria um ProcessPoolExecutor com `processos` processos (um
+    por núcleo, por padrão). Um ThreadPoolExecutor também serve, para
+    embutir o servidor sem processos extras, mas sem paralelismo real.
+    """
+
+    def __init__(self, processos: Optional[int] = None, executor: Optional[Executor] = None,
+                 max_pendentes: Optional[int] = None, diretorio_cache: Optional[str] = None):
+        self.processos = processos or os.cpu_count()
+        self.executor = executor
+        self._criou_executor = executor is None
+        self.max_pendentes = max_pendentes or 2 * self.processos
+        self.diretorio_cache = diretorio_cache
+        self.pedidos = 0
+        self.pedidos_invalidos = 0
+        self.em_andamento = 0
+        self.segundos_compilando = 0.0
+        self._vagas: Optional[asyncio.Semaphore] = None
+
+    async def iniciar(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.processos)
+        self._vagas = asyncio.Semaphore(self.max_pendentes)
+        laco = asyncio.get_running_loop()
+        await asyncio.gather(*(laco.run_in_executor(self.executor, _aquecer)
+                               for _ in range(self.processos)))
+
+    def encerrar(self):
+        if self._criou_executor and self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def estatisticas(self) -> dict:
+        return {'pedidos': self.pedidos, 'pedidos_invalidos': self.pedidos_invalidos,
+                'em_andamento': self.em_andamento, 'max_pendentes': self.max_pendentes,
+                'processos': self.processos, 'segundos_compilando': self.segundos_compilando}
+
+    async def responder(self, linha: bytes) -> dict:
+        """Resposta a uma linha do protocolo; a vaga do pedido já foi reservada"""
+        identificador = None
+        try:
+            try:
+                pedido = json.loads(linha)
+            except ValueError as e:
+                raise PedidoInvalido(f"JSON inválido: {e}")
+            if not isinstance(pedido, dict):
+                raise PedidoInvalido("O pedido deve ser um objeto JSON")
+            identificador = pedido.get('id')
+            operacao = pedido.get('op')
+            if operacao not in OPERACOES:
+                raise PedidoInvalido(f"Operação desconhecida: {operacao!r} (use {', '.join(OPERACOES)})")
+            if operacao == 'ping':
+                return {'id': identificador, 'ok': True}
+            if operacao == 'estatisticas':
+                return {'id': identificador, 'ok': True, 'estatisticas': self.estatisticas()}
+            inicio = time.perf_counter()
+            resposta = await asyncio.get_running_loop().run_in_executor(
+                self.executor, processar_pedido, pedido, self.diretorio_cache)
+            self.segundos_compilando += time.perf_counter() - inicio
+            self.pedidos += 1
+            return {'id': identificador, 'ok': True, **resposta}
+        except PedidoInvalido as e:
+            self.pedidos_invalidos += 1
+            return {'id': identificador, 'ok': False, 'erro': str(e)}
+        except Exception as e:
+            # Falha do próprio compilador ou do pool: o cliente recebe a resposta mesmo assim
+            return {'id': identificador, 'ok': False, 'erro': f"Erro interno: {type(e).__name__}: {e}"}
+
+    async def atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """Lê os pedidos de um cliente até o fim da conexão"""
+        tarefas = set()
+
+        async def executar(linha: bytes):
+            try:
+                resposta = await self.responder(linha)
+            finally:
+                self.em_andamento -= 1
+                self._vagas.release()
+            escritor.write(json.dumps(resposta, ensure_ascii=False).encode() + b'\n')
+            await escritor.drain()
+
+        try:
+            while True:
+                # Sem vaga, a próxima linha só é lida quando um pedido terminar
+                await self._vagas.acquire()
+                try:
+                    linha = await leitor.readline()
+                except ValueError:
+                    self._vagas.release()
+                    escritor.write(json.dumps({'id': None, 'ok': False,
+                                               'erro': "Linha maior que o limite"}).encode() + b'\n')
+                    break
+                if not linha.strip():
+                    self._vagas.release()
+                    if not linha:
+                        break
+                    continue
+                self.em_andamento += 1
+                tarefa = asyncio.create_task(executar(linha))
+                tarefas.add(tarefa)
+                tarefa.add_done_callback(tarefas.discard)
+            if tarefas:
+                await asyncio.gather(*tarefas, return_exceptions=True)
+        finally:
+            escritor.close()
+
+    async def servir_unix(self, caminho: str):
+        await self.iniciar()
+        if os.path.exists(caminho):
+            os.remove(caminho)  # socket deixado por uma execução anterior
+        servidor = await asyncio.start_unix_server(self.atender, caminho, limit=TAMANHO_MAXIMO_LINHA)
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            self.encerrar()
+            if os.path.exists(caminho):
+                os.remove(caminho)
+
+    async def servir_stdio(self):
+        """Atende um único cliente pela entrada e saída padrão (como um subprocesso)"""
+        await self.iniciar()
+        try:
+            await self.atender(_EntradaPadrao(), _SaidaPadrao())
+        finally:
+            self.encerrar()
+
+
+class _EntradaPadrao:
+    """stdin com a interface de leitura de StreamReader usada por atender()
+
+    A leitura bloqueante vai para uma thread: assim funciona com stdin
+    redirecionado de um arquivo, que o transporte de pipe do asyncio recusa.
+    """
+
+    async def readline(self) -> bytes:
+        return await asyncio.get_running_loop().run_in_executor(None, sys.stdin.buffer.readline)
+
+
+class _SaidaPadrao:
+    """stdout com a interface de escrita de StreamWriter usada por atender()"""
+
+    def write(self, dados: bytes):
+        sys.stdout.buffer.write(dados)
+
+    async def drain(self):
+        sys.stdout.buffer.flush()
+
+    def close(self):
+        sys.stdout.buffer.flush()
+
+
+def main():
+    """python -m src.ast.servidor_compilacao [--socket CAMINHO] [--processos N] ..."""
+    import argparse
+
+    argumentos = argparse.ArgumentParser(
+        prog="python -m src.ast.servidor_compilacao",
+        description="Servidor de compilação Moonlet (pedidos em linhas JSON)")
+    argumentos.add_argument("--socket", help="caminho do socket Unix; sem ele, usa stdin/stdout")
+    argumentos.add_argument("--processos", type=int, help="processos de compilação (padrão: núcleos)")
+    argumentos.add_argument("--max-pendentes", type=int,
+                            help="pedidos em andamento antes de parar de ler (padrão: 2 por processo)")
+    argumentos.add_argument("--cache", metavar="DIR", help="cache de compilação em disco")
+    opcoes = argumentos.parse_args()
+
+    servidor = ServidorCompilacao(opcoes.processos, max_pendentes=opcoes.max_pendentes,
+                                  diretorio_cache=opcoes.cache)
+    try:
+        if opcoes.socket:
+            print(f"Servidor de compilação em '{opcoes.socket}'", file=sys.stderr)
+            asyncio.run(servidor.servir_unix(opcoes.socket))
+        else:
+            asyncio.run(servidor.servir_stdio())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
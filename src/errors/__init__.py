@@ -1 +1 @@
-from .erros_moonlet import RelatorioErros, ErroSintatico, ErroLexico
+from .erros_moonlet import RelatorioErros, Diagnostico, ErroSintatico, ErroLexico, ErroGeracao, ErroExecucao
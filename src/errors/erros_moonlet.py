@@ -32,6 +32,17 @@ class ErroCompilacao(Exception):
         if self.posicao:
             return f"Erro em {self.posicao}: {self.mensagem}"
         return self.mensagem
+    
+    def __reduce__(self):
+        # Recria o erro sem passar pelo __init__, que prefixaria a mensagem de novo
+        return (_restaurar_erro, (self.__class__, self.args, self.__dict__))
+
+
+def _restaurar_erro(classe: type, args: tuple, atributos: dict) -> ErroCompilacao:
+    erro = classe.__new__(classe)
+    erro.args = args
+    erro.__dict__.update(atributos)
+    return erro
 
 
 class ErroLexico(ErroCompilacao):
@@ -64,16 +75,55 @@ class ErroSemantico(ErroCompilacao):
         super().__init__(f"Erro semântico: {mensagem}", posicao)
 
 
+class ErroGeracao(ErroCompilacao):
+    """Construção que a geração de código MEPA não sabe traduzir"""
+    
+    def __init__(self, mensagem: str, posicao: Optional[PosicaoErro] = None):
+        super().__init__(f"Erro de geração de código: {mensagem}", posicao)
+
+
+class ErroExecucao(ErroCompilacao):
+    """Erro ao decodificar ou executar código MEPA"""
+    
+    def __init__(self, mensagem: str, posicao: Optional[PosicaoErro] = None):
+        super().__init__(f"Erro de execução: {mensagem}", posicao)
+
+
+# Tipos de Diagnostico registrados pelo parser
+AVISO_ERRO_SINTATICO = 'erro_sintatico'  # erro recuperado; mensagem = texto do erro
+AVISO_TOKEN_INVALIDO = 'token_invalido'  # token ERRO do léxico, ignorado
+AVISO_TOKEN_PULADO = 'token_pulado'      # token descartado na recuperação de erro
+
+
+@dataclass(frozen=True)
+class Diagnostico:
+    """Ocorrência registrada durante a análise, sem formatação de console"""
+    tipo: str
+    lexema: Optional[str] = None
+    linha: int = 0
+    mensagem: str = ''
+
+
 class RelatorioErros:
     """Classe para coletar e reportar múltiplos erros"""
     
     def __init__(self):
         self.erros: List[ErroCompilacao] = []
-        self.avisos: List[str] = []
+        self.avisos: List[Diagnostico] = []
     
     def adicionar_erro(self, erro: ErroCompilacao):
         self.erros.append(erro)
     
+    def adicionar_aviso(self, tipo: str, lexema: Optional[str] = None, linha: int = 0,
+                        mensagem: str = ''):
+        self.avisos.append(Diagnostico(tipo, lexema, linha, mensagem))
+    
+    def registrar_erro_sintatico(self, erro: ErroSintatico):
+        """Erro do qual o parser se recuperou: entra nos erros e na sequência de avisos"""
+        self.adicionar_erro(erro)
+        self.adicionar_aviso(AVISO_ERRO_SINTATICO, erro.token_encontrado,
+                             erro.posicao.linha if erro.posicao else 0, str(erro))
+    
     def tem_erros(self) -> bool:
         return len(self.erros) > 0
     
@@ -1 +1,2 @@
 from .lexico_moonlet import AnalisadorLexicoMoonlet, Token
+from .buffer_tokens import TokenBuffer, CursorTokens
@@ -0,0 +1,158 @@
+"""
+Buffer de tokens em colunas (struct-of-arrays) para o compilador Moonlet
+Guarda tipo, espécie, lexema, deslocamentos e linha em colunas do módulo array
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+from .lexico_moonlet import (
+    AnalisadorLexicoMoonlet, Token, MOTOR_CARACTERE,
+    ERRO, IDENTIFICADOR, PALAVRA_CHAVE, NUMERO, STRING, EOS
+)
+
+
+class TokenBuffer:
+    """Sequência de tokens em colunas paralelas, com tabela de lexemas internados"""
+
+    def __init__(self):
+        self.tipos = array('B')
+        self.especies = array('B')
+        self.lexemas_id = array('I')
+        self.inicios = array('I')
+        self.fins = array('I')
+        self.linhas = array('I')
+        # Tabela de internação: cada lexema distinto é guardado uma única vez
+        self.lexemas: List[str] = []
+        self._indice_lexemas: Dict[str, int] = {}
+        # O EOS final não veio do lexer, que encerrou antes (string não terminada)
+        self.eos_sintetico = False
+
+    @classmethod
+    def construir(cls, codigo: str, motor: str = MOTOR_CARACTERE,
+                  linha: int = 1, deslocamento: int = 0) -> 'TokenBuffer':
+        """Executa a análise léxica completa e grava todos os tokens
+
+        linha e deslocamento situam o código num arquivo maior, quando ele é
+        um trecho desse arquivo: são a linha e a posição do seu início.
+        """
+        buffer = cls()
+        lexer = AnalisadorLexicoMoonlet(codigo, motor=motor)
+        lexer.linha = linha
+        token = lexer.proximo_token()
+        while token is not None and token.tipo != EOS:
+            buffer.adicionar(token)
+            token = lexer.proximo_token()
+        if token is None:
+            # O lexer passou da sentinela (string não terminada): fechar com EOS
+            token = Token(EOS, '', None, lexer.linha, len(codigo), len(codigo))
+            buffer.eos_sintetico = True
+        buffer.adicionar(token)
+        if deslocamento:
+            buffer.inicios = array('I', map(deslocamento.__add__, buffer.inicios))
+            buffer.fins = array('I', map(deslocamento.__add__, buffer.fins))
+        return buffer
+
+    @classmethod
+    def concatenar(cls, buffers: List['TokenBuffer']) -> 'TokenBuffer':
+        """Une os buffers de trechos consecutivos de um código num só
+
+        O EOS de cada trecho é descartado, exceto o do último; os lexemas são
+        reinternados na tabela do buffer resultante.
+        """
+        resultado = cls()
+        ultimo = len(buffers) - 1
+        for i, buffer in enumerate(buffers):
+            fim = len(buffer) if i == ultimo else len(buffer) - 1
+            ids = []
+            for lexema in buffer.lexemas:
+                lexema_id = resultado._indice_lexemas.get(lexema)
+                if lexema_id is None:
+                    lexema_id = len(resultado.lexemas)
+                    resultado.lexemas.append(lexema)
+                    resultado._indice_lexemas[lexema] = lexema_id
+                ids.append(lexema_id)
+            resultado.lexemas_id.extend(map(ids.__getitem__, buffer.lexemas_id[:fim]))
+            for coluna in ('tipos', 'especies', 'inicios', 'fins', 'linhas'):
+                getattr(resultado, coluna).extend(getattr(buffer, coluna)[:fim])
+        resultado.eos_sintetico = bool(buffers) and buffers[-1].eos_sintetico
+        return resultado
+
+    def adicionar(self, token: Token):
+        lexema_id = self._indice_lexemas.get(token.lexema)
+        if lexema_id is None:
+            lexema_id = len(self.lexemas)
+            self.lexemas.append(token.lexema)
+            self._indice_lexemas[token.lexema] = lexema_id
+        self.tipos.append(token.tipo)
+        self.especies.append(token.especie)
+        self.lexemas_id.append(lexema_id)
+        self.inicios.append(token.inicio)
+        self.fins.append(token.fim)
+        self.linhas.append(token.linha)
+
+    def __len__(self) -> int:
+        return len(self.tipos)
+
+    def token(self, indice: int) -> Token:
+        """Materializa o token na posição informada"""
+        tipo = self.tipos[indice]
+        lexema = self.lexemas[self.lexemas_id[indice]]
+        return Token(tipo, lexema, _valor_token(tipo, lexema), self.linhas[indice],
+                     self.inicios[indice], self.fins[indice], self.especies[indice])
+
+    def __iter__(self) -> Iterator[Token]:
+        for indice in range(len(self.tipos)):
+            yield self.token(indice)
+
+    def cursor(self) -> 'CursorTokens':
+        """Fonte de tokens consumível pelo AnalisadorSintaticoMoonlet"""
+        return CursorTokens(self)
+
+    def bytes_ocupados(self) -> int:
+        """Tamanho aproximado das colunas e da tabela de lexemas"""
+        colunas = (self.tipos, self.especies, self.lexemas_id, self.inicios, self.fins, self.linhas)
+        total = sum(len(coluna) * coluna.itemsize for coluna in colunas)
+        return total + sum(len(lexema.encode('utf-8')) for lexema in self.lexemas)
+
+    def __getstate__(self):
+        # O índice reverso é reconstruído na carga; não precisa ser serializado
+        estado = self.__dict__.copy()
+        del estado['_indice_lexemas']
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._indice_lexemas = {lexema: i for i, lexema in enumerate(self.lexemas)}
+
+
+class CursorTokens:
+    """Percorre um TokenBuffer por índice com a interface de um lexer"""
+
+    def __init__(self, buffer: TokenBuffer):
+        self.buffer = buffer
+        self.indice = 0
+
+    def proximo_token(self) -> Optional[Token]:
+        if self.buffer.eos_sintetico and self.indice >= len(self.buffer) - 1:
+            # Como o lexer, que depois de uma string não terminada não devolve mais tokens
+            return None
+        if self.indice >= len(self.buffer):
+            # Após o fim, repete o último token (EOS)
+            return self.buffer.token(len(self.buffer) - 1) if len(self.buffer) else None
+        token = self.buffer.token(self.indice)
+        self.indice += 1
+        return token
+
+
+def _valor_token(tipo: int, lexema: str):
+    """Reconstrói o valor do token a partir do tipo e do lexema"""
+    if tipo == IDENTIFICADOR or tipo == PALAVRA_CHAVE:
+        return lexema
+    if tipo == NUMERO:
+        return float(lexema) if '.' in lexema else int(lexema)
+    if tipo == STRING:
+        return lexema[1:-1]
+    if tipo == ERRO and lexema[:1] in ('"', "'"):
+        return "String não terminada"
+    return None
@@ -1,3 +1,4 @@
+import re
 from typing import NamedTuple, Union
 
 # --- Constantes e estruturas ---
@@ -24,21 +25,99 @@ PALAVRAS_CHAVE = {
 }
 
 OPERADORES_DUPLOS = {'==', '~=', '<=', '>=', '..'}
+OPERADORES_SIMPLES = ['+', '-', '*', '/', '%', '^', '<', '>', '=', '~']
 SIMBOLOS_ESPECIAIS = '()[]{}#;:,.\\'
 CARACTERES_ESPACO = [' ', '\t', '\r']
 
+# --- Espécies de token ---
+# Cada palavra-chave, operador e símbolo tem um código inteiro próprio, para
+# que o parser compare e despache por inteiro em vez de comparar lexemas.
+# Identificadores, números, strings, comentários e EOS têm espécie 0.
+SEM_ESPECIE = 0
+(PC_AND, PC_BREAK, PC_DO, PC_ELSE, PC_ELSEIF, PC_END, PC_FALSE, PC_FOR,
+ PC_FUNCTION, PC_GOTO, PC_IF, PC_IN, PC_LOCAL, PC_NIL, PC_NOT, PC_OR,
+ PC_REPEAT, PC_RETURN, PC_THEN, PC_TRUE, PC_UNTIL, PC_WHILE) = range(1, 23)
+(OP_IGUAL, OP_DIFERENTE, OP_MENOR_IGUAL, OP_MAIOR_IGUAL, OP_CONCATENACAO,
+ OP_MAIS, OP_MENOS, OP_VEZES, OP_DIVISAO, OP_MODULO, OP_POTENCIA,
+ OP_MENOR, OP_MAIOR, OP_ATRIBUICAO, OP_TIL) = range(23, 38)
+(SB_ABRE_PARENTESE, SB_FECHA_PARENTESE, SB_ABRE_COLCHETE, SB_FECHA_COLCHETE,
+ SB_ABRE_CHAVE, SB_FECHA_CHAVE, SB_CERQUILHA, SB_PONTO_E_VIRGULA, SB_DOIS_PONTOS,
+ SB_VIRGULA, SB_PONTO, SB_BARRA_INVERTIDA, SB_ROTULO) = range(38, 51)
+
+ESPECIES = {
+    'and': PC_AND, 'break': PC_BREAK, 'do': PC_DO, 'else': PC_ELSE,
+    'elseif': PC_ELSEIF, 'end': PC_END, 'false': PC_FALSE, 'for': PC_FOR,
+    'function': PC_FUNCTION, 'goto': PC_GOTO, 'if': PC_IF, 'in': PC_IN,
+    'local': PC_LOCAL, 'nil': PC_NIL, 'not': PC_NOT, 'or': PC_OR,
+    'repeat': PC_REPEAT, 'return': PC_RETURN, 'then': PC_THEN, 'true': PC_TRUE,
+    'until': PC_UNTIL, 'while': PC_WHILE,
+    '==': OP_IGUAL, '~=': OP_DIFERENTE, '<=': OP_MENOR_IGUAL, '>=': OP_MAIOR_IGUAL,
+    '..': OP_CONCATENACAO, '+': OP_MAIS, '-': OP_MENOS, '*': OP_VEZES,
+    '/': OP_DIVISAO, '%': OP_MODULO, '^': OP_POTENCIA, '<': OP_MENOR,
+    '>': OP_MAIOR, '=': OP_ATRIBUICAO, '~': OP_TIL,
+    '(': SB_ABRE_PARENTESE, ')': SB_FECHA_PARENTESE, '[': SB_ABRE_COLCHETE,
+    ']': SB_FECHA_COLCHETE, '{': SB_ABRE_CHAVE, '}': SB_FECHA_CHAVE,
+    '#': SB_CERQUILHA, ';': SB_PONTO_E_VIRGULA, ':': SB_DOIS_PONTOS,
+    ',': SB_VIRGULA, '.': SB_PONTO, '\\': SB_BARRA_INVERTIDA, '::': SB_ROTULO,
+}
+LEXEMA_POR_ESPECIE = {especie: lexema for lexema, especie in ESPECIES.items()}
+
+# Motores de varredura disponíveis
+MOTOR_CARACTERE = 'caractere'  # laço caractere a caractere (original)
+MOTOR_REGEX = 'regex'          # padrão mestre pré-compilado
+
+# --- Padrão mestre (motor regex) ---
+# Espaços iniciais são absorvidos no mesmo match; a ordem das alternativas
+# reproduz a ordem dos testes do motor por caractere.
+_RE_MESTRE = re.compile(r'(?P<espaco>[ \t\r\n]+)?(?:' + '|'.join([
+    r'(?P<eos>\0)',
+    r'(?P<comentario_longo>--\[\[(?:.*?\]\]|.*(?=\0\Z)))',
+    r'(?P<comentario>--[^\n\0]*)',
+    r'(?P<nome>[A-Za-z_]\w*)',
+    r'(?P<numero>\d+(?:\.\d*)?)',
+    r'(?P<string>"[^"\0]*"|\'[^\'\0]*\')',
+    r'(?P<string_aberta>"[^"\0]*|\'[^\'\0]*)',
+    r'(?P<simbolo_duplo>::)',
+    r'(?P<operador>' + '|'.join(re.escape(op) for op in sorted(OPERADORES_DUPLOS) + OPERADORES_SIMPLES) + ')',
+    r'(?P<simbolo>[' + re.escape(SIMBOLOS_ESPECIAIS) + '])',
+    r'(?P<outro>.)',
+]) + ')', re.DOTALL)
+
+# Grupos do padrão mestre cujo token tem tipo fixo e valor None
+_TIPO_POR_GRUPO = {
+    'operador': OPERADOR, 'simbolo': SIMBOLO_ESPECIAL,
+    'simbolo_duplo': SIMBOLO_ESPECIAL, 'comentario': COMENTARIO,
+}
+
+# --- Varreduras em bloco (motor por caractere) ---
+_RE_PALAVRA = re.compile(r'\w+')
+_RE_NUMERO = re.compile(r'\d+(?:\.\d*)?')
+_RE_RESTO_LINHA = re.compile(r'[^\n\0]*')
+_RE_CORPO_STRING = {'"': re.compile(r'[^"\0]*'), "'": re.compile(r"[^'\0]*")}
+
 class Token(NamedTuple):
     tipo: int
     lexema: str
     valor: Union[int, float, str, None]
     linha: int
+    inicio: int = 0  # deslocamento do primeiro caractere no código fonte
+    fim: int = 0     # deslocamento após o último caractere (lexema == codigo[inicio:fim])
+    especie: int = SEM_ESPECIE  # código da palavra-chave, operador ou símbolo
+
+# Monta o Token a partir da tupla completa, sem o __new__ gerado (com padrões)
+_novo_token = tuple.__new__
 
 # --- Lexer ---
 class AnalisadorLexicoMoonlet:
-    def __init__(self, codigo_fonte: str):
+    def __init__(self, codigo_fonte: str, motor: str = MOTOR_CARACTERE):
         self.codigo = codigo_fonte + '\0'
         self.linha = 1
         self.i = 0
+        if motor == MOTOR_REGEX:
+            self.proximo_token = self._proximo_token_regex
+        elif motor != MOTOR_CARACTERE:
+            raise ValueError(f"Motor léxico desconhecido: '{motor}'")
+        self.motor = motor
 
     def proximo_char(self) -> str:
         c = self.codigo[self.i]
@@ -59,115 +138,147 @@ class AnalisadorLexicoMoonlet:
                 continue
 
             if c == '\0':
-                return Token(EOS, '', None, self.linha)
+                return Token(EOS, '', None, self.linha, self.i - 1, self.i - 1)
 
             if c == '-':
                 if self.codigo[self.i] == '-':
                     return self.tratar_comentario()
                 else:
-                    return Token(OPERADOR, '-', None, self.linha)
+                    return Token(OPERADOR, '-', None, self.linha, self.i - 1, self.i, OP_MENOS)
 
             if c.isalpha() or c == '_':
                 self.retrair()
                 return self.tratar_identificador_ou_palavra_chave()
 
-            if c.isdigit():
+            if c.isdecimal():
                 self.retrair()
                 return self.tratar_numero()
 
             if c == '"' or c == "'":
                 return self.tratar_string(delimitador=c)
 
-            if (c in SIMBOLOS_ESPECIAIS) or (c in ['+', '*', '/', '%', '^', '<', '>', '=', '~', '.']):
+            if (c in SIMBOLOS_ESPECIAIS) or (c in OPERADORES_SIMPLES):
                 self.retrair()
                 return self.tratar_operador_ou_simbolo()
             
-            return Token(ERRO, c, None, self.linha)
+            return Token(ERRO, c, None, self.linha, self.i - 1, self.i)
 
     def tratar_comentario(self) -> Token:
-        lexema = '--'
+        inicio = self.i - 1
         self.proximo_char()
         
         if self.codigo[self.i] == '[' and self.codigo[self.i+1] == '[':
-            lexema += '[['
-            self.i += 2
-            while not (self.codigo[self.i] == ']' and self.codigo[self.i+1] == ']'):
-                char_comentario = self.proximo_char()
-                if char_comentario == '\n': self.linha += 1
-                lexema += char_comentario
-            lexema += ']]'
-            self.i += 2
-            return Token(COMENTARIO, lexema, None, self.linha)
+            # Salto direto até o fechamento; sem ']]' o comentário vai até o fim
+            fechamento = self.codigo.find(']]', self.i + 2)
+            if fechamento == -1:
+                fim = len(self.codigo) - 1
+            else:
+                fim = fechamento + 2
+            self.linha += self.codigo.count('\n', inicio, fim)
         else:
-            while self.codigo[self.i] not in ['\n', '\0']:
-                lexema += self.proximo_char()
-            return Token(COMENTARIO, lexema, None, self.linha)
+            fim = _RE_RESTO_LINHA.match(self.codigo, self.i).end()
+        self.i = fim
+        return Token(COMENTARIO, self.codigo[inicio:fim], None, self.linha, inicio, fim)
 
     def tratar_identificador_ou_palavra_chave(self) -> Token:
-        lexema = ''
-        c = self.proximo_char()
-        while c.isalnum() or c == '_':
-            lexema += c
-            c = self.proximo_char()
-        
-        self.retrair()
+        inicio = self.i
+        self.i = fim = _RE_PALAVRA.match(self.codigo, inicio).end()
+        lexema = self.codigo[inicio:fim]
 
         if lexema in PALAVRAS_CHAVE:
-            return Token(PALAVRA_CHAVE, lexema, lexema, self.linha)
+            return Token(PALAVRA_CHAVE, lexema, lexema, self.linha, inicio, fim, ESPECIES[lexema])
         else:
-            return Token(IDENTIFICADOR, lexema, lexema, self.linha)
+            return Token(IDENTIFICADOR, lexema, lexema, self.linha, inicio, fim)
 
     def tratar_numero(self) -> Token:
-        lexema = ''
-        tem_ponto = False
-        c = self.proximo_char()
+        inicio = self.i
+        self.i = fim = _RE_NUMERO.match(self.codigo, inicio).end()
+        lexema = self.codigo[inicio:fim]
 
-        while c.isdigit() or (c == '.' and not tem_ponto):
-            if c == '.': tem_ponto = True
-            lexema += c
-            c = self.proximo_char()
-        
-        self.retrair()
-
-        if tem_ponto:
-            return Token(NUMERO, lexema, float(lexema), self.linha)
+        if '.' in lexema:
+            return Token(NUMERO, lexema, float(lexema), self.linha, inicio, fim)
         else:
-            return Token(NUMERO, lexema, int(lexema), self.linha)
+            return Token(NUMERO, lexema, int(lexema), self.linha, inicio, fim)
 
     def tratar_string(self, delimitador: str) -> Token:
-        lexema = delimitador
-        c = self.proximo_char()
-        while c != delimitador and c != '\0':
-            lexema += c
-            c = self.proximo_char()
+        inicio = self.i - 1
+        fim = _RE_CORPO_STRING[delimitador].match(self.codigo, self.i).end()
+        self.i = fim + 1
         
-        if c == '\0':
-            return Token(ERRO, lexema, "String não terminada", self.linha)
+        if self.codigo[fim] == '\0':
+            return Token(ERRO, self.codigo[inicio:fim], "String não terminada", self.linha, inicio, fim)
         
-        lexema += delimitador
-        valor_string = lexema[1:-1]
-        return Token(STRING, lexema, valor_string, self.linha)
+        return Token(STRING, self.codigo[inicio:fim + 1], self.codigo[inicio + 1:fim], self.linha, inicio, fim + 1)
 
     def tratar_operador_ou_simbolo(self) -> Token:
+        inicio = self.i
         c1 = self.proximo_char()
         c2 = self.codigo[self.i]
 
         if c1 == ':' and c2 == ':':
             self.proximo_char()
-            return Token(SIMBOLO_ESPECIAL, '::', None, self.linha)
+            return Token(SIMBOLO_ESPECIAL, '::', None, self.linha, inicio, self.i, SB_ROTULO)
 
         lexema = c1 + c2
         if lexema in OPERADORES_DUPLOS:
             self.proximo_char()
-            return Token(OPERADOR, lexema, None, self.linha)
+            return Token(OPERADOR, lexema, None, self.linha, inicio, self.i, ESPECIES[lexema])
 
         if c1 == '.':
-            return Token(SIMBOLO_ESPECIAL, c1, None, self.linha)
+            return Token(SIMBOLO_ESPECIAL, c1, None, self.linha, inicio, self.i, SB_PONTO)
 
-        if c1 in ['+', '-', '*', '/', '%', '^', '<', '>', '=', '~']:
-            return Token(OPERADOR, c1, None, self.linha)
+        if c1 in OPERADORES_SIMPLES:
+            return Token(OPERADOR, c1, None, self.linha, inicio, self.i, ESPECIES[c1])
 
         if c1 in SIMBOLOS_ESPECIAIS:
-            return Token(SIMBOLO_ESPECIAL, c1, None, self.linha)
+            return Token(SIMBOLO_ESPECIAL, c1, None, self.linha, inicio, self.i, ESPECIES[c1])
         
-        return Token(ERRO, c1, None, self.linha)
+        return Token(ERRO, c1, None, self.linha, inicio, self.i)
+
+    def _proximo_token_regex(self) -> Token:
+        """Motor alternativo: um único match do padrão mestre por token"""
+        codigo = self.codigo
+        if self.i >= len(codigo):
+            return None
+
+        m = _RE_MESTRE.match(codigo, self.i)
+        grupo = m.lastgroup
+        i = m.start(grupo)
+        if i != self.i:
+            self.linha += codigo.count('\n', self.i, i)
+        self.i = fim = m.end()
+        lexema = codigo[i:fim]
+
+        # Caminho rápido: nomes e grupos de tipo fixo, sem o construtor nomeado
+        if grupo == 'nome':
+            especie = ESPECIES.get(lexema, SEM_ESPECIE)
+            tipo = PALAVRA_CHAVE if especie else IDENTIFICADOR
+            return _novo_token(Token, (tipo, lexema, lexema, self.linha, i, fim, especie))
+        tipo = _TIPO_POR_GRUPO.get(grupo)
+        if tipo is not None:
+            return _novo_token(Token, (tipo, lexema, None, self.linha, i, fim,
+                                       ESPECIES.get(lexema, SEM_ESPECIE)))
+        if grupo == 'numero':
+            if '.' in lexema:
+                return Token(NUMERO, lexema, float(lexema), self.linha, i, fim)
+            return Token(NUMERO, lexema, int(lexema), self.linha, i, fim)
+        if grupo == 'string':
+            return Token(STRING, lexema, codigo[i + 1:fim - 1], self.linha, i, fim)
+        if grupo == 'comentario_longo':
+            self.linha += codigo.count('\n', i, fim)
+            return Token(COMENTARIO, lexema, None, self.linha, i, fim)
+        if grupo == 'eos':
+            return Token(EOS, '', None, self.linha, i, i)
+        if grupo == 'string_aberta':
+            # Consome também a sentinela, como o motor por caractere
+            self.i += 1
+            return Token(ERRO, lexema, "String não terminada", self.linha, i, fim)
+
+        # Letras e dígitos fora do ASCII seguem as regras de str.isalpha/isdecimal
+        if lexema.isalpha():
+            self.i = i
+            return self.tratar_identificador_ou_palavra_chave()
+        if lexema.isdecimal():
+            self.i = i
+            return self.tratar_numero()
+        return Token(ERRO, lexema, None, self.linha, i, fim)
@@ -0,0 +1,4 @@
+from .instrucoes_mepa import ProgramaMEPA, MontadorIncremental, decodificar
+from .maquina_mepa import MaquinaMEPA
+from .bytecode_mepa import montar, carregar, salvar
+from .destinos_mepa import DestinoArquivo, DestinoConsumidor
@@ -0,0 +1,4 @@
+"""Ponto de entrada: python -m src.mepa arquivo.moonlet"""
+from .maquina_mepa import main
+
+main()
@@ -0,0 +1,104 @@
+"""
+Formato binário para programas MEPA (bytecode) e carregador via mmap
+
+Layout da imagem (little-endian):
+    cabeçalho   '<4sHHIIII': assinatura, versão, reservado, nº de instruções,
+                nº de constantes, tamanho da memória, deslocamento das constantes
+    código      nº de instruções × int32 (opcodes) seguidos de
+                nº de instruções × int32 (operandos, desvios já resolvidos)
+    constantes  nº de constantes × (tag de 1 byte + 8 bytes: 'i' int64 ou 'f' float64)
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Union
+
+from ..errors.erros_moonlet import ErroExecucao
+from .instrucoes_mepa import ProgramaMEPA
+
+ASSINATURA = b'MEPB'
+VERSAO_BYTECODE = 1
+EXTENSAO_BYTECODE = '.mepab'
+
+_CABECALHO = struct.Struct('<4sHHIIII')
+_CONSTANTE_INT = struct.Struct('<cq')
+_CONSTANTE_REAL = struct.Struct('<cd')
+_LIMITE_INT64 = 2 ** 63
+
+
+def montar(programa: ProgramaMEPA) -> bytes:
+    """Serializa um ProgramaMEPA decodificado em uma imagem de bytecode"""
+    n = len(programa.opcodes)
+    codigo = array('i', programa.opcodes)
+    codigo.extend(programa.operandos)
+    if sys.byteorder != 'little':
+        codigo.byteswap()
+
+    constantes = bytearray()
+    for valor in programa.constantes:
+        if isinstance(valor, int):
+            if not -_LIMITE_INT64 <= valor < _LIMITE_INT64:
+                raise ErroExecucao(f"Constante fora do intervalo de 64 bits: {valor}")
+            constantes += _CONSTANTE_INT.pack(b'i', valor)
+        else:
+            constantes += _CONSTANTE_REAL.pack(b'f', valor)
+
+    deslocamento_constantes = _CABECALHO.size + codigo.itemsize * len(codigo)
+    cabecalho = _CABECALHO.pack(ASSINATURA, VERSAO_BYTECODE, 0, n, len(programa.constantes),
+                                programa.tamanho_memoria, deslocamento_constantes)
+    return cabecalho + codigo.tobytes() + bytes(constantes)
+
+
+def salvar(programa: ProgramaMEPA, caminho: str):
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(montar(programa))
+
+
+def ler(dados: Union[bytes, memoryview, mmap.mmap]) -> ProgramaMEPA:
+    """Interpreta uma imagem de bytecode; o código é exposto sem cópia quando possível"""
+    visao = memoryview(dados)
+    if len(visao) < _CABECALHO.size:
+        raise ErroExecucao("Imagem de bytecode MEPA truncada")
+    (assinatura, versao, _, n, n_constantes,
+     tamanho_memoria, deslocamento_constantes) = _CABECALHO.unpack_from(visao, 0)
+    if assinatura != ASSINATURA:
+        raise ErroExecucao("Arquivo não é uma imagem de bytecode MEPA")
+    if versao != VERSAO_BYTECODE:
+        raise ErroExecucao(f"Versão de bytecode MEPA não suportada: {versao}")
+
+    inicio = _CABECALHO.size
+    tamanho_bloco = 4 * n
+    if (deslocamento_constantes < inicio + 2 * tamanho_bloco or
+            len(visao) < deslocamento_constantes + n_constantes * _CONSTANTE_INT.size):
+        raise ErroExecucao("Imagem de bytecode MEPA truncada")
+    if sys.byteorder == 'little':
+        opcodes = visao[inicio:inicio + tamanho_bloco].cast('i')
+        operandos = visao[inicio + tamanho_bloco:inicio + 2 * tamanho_bloco].cast('i')
+    else:
+        opcodes = array('i', visao[inicio:inicio + tamanho_bloco])
+        operandos = array('i', visao[inicio + tamanho_bloco:inicio + 2 * tamanho_bloco])
+        opcodes.byteswap()
+        operandos.byteswap()
+
+    constantes = []
+    posicao = deslocamento_constantes
+    for _ in range(n_constantes):
+        tag = visao[posicao:posicao + 1].tobytes()
+        formato = _CONSTANTE_INT if tag == b'i' else _CONSTANTE_REAL
+        constantes.append(formato.unpack_from(visao, posicao)[1])
+        posicao += formato.size
+    return ProgramaMEPA(opcodes, operandos, constantes, tamanho_memoria)
+
+
+def carregar(caminho: str) -> ProgramaMEPA:
+    """Mapeia o arquivo em memória e devolve o programa sem reler o texto MEPA"""
+    with open(caminho, 'rb') as arquivo:
+        # mmap recusa arquivos vazios (ValueError): trate-os como imagem truncada
+        if os.fstat(arquivo.fileno()).st_size < _CABECALHO.size:
+            raise ErroExecucao("Imagem de bytecode MEPA truncada")
+        mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+    # As visões de memória mantêm o mapeamento vivo enquanto o programa existir
+    return ler(mapa)
@@ -0,0 +1,60 @@
+"""
+Destinos para o código MEPA gerado: em vez de acumular tudo numa lista, o
+GeradorMEPA pode escrever cada instrução num arquivo ou entregá-la a um
+consumidor assim que é emitida
+
+Um destino é qualquer objeto com append(instrucao): uma lista, um destes
+adaptadores ou o MontadorIncremental (instrucoes_mepa), que decodifica o
+código sem guardar as strings.
+"""
+
+from typing import Generator, List, TextIO
+
+
+class DestinoArquivo:
+    """Escreve as instruções num arquivo texto, uma por linha, em lotes"""
+
+    def __init__(self, arquivo: TextIO, tamanho_lote: int = 1024):
+        self.arquivo = arquivo
+        self.tamanho_lote = tamanho_lote
+        self._lote: List[str] = []
+
+    def append(self, instrucao: str):
+        self._lote.append(instrucao)
+        if len(self._lote) >= self.tamanho_lote:
+            self.descarregar()
+
+    def descarregar(self):
+        if self._lote:
+            self.arquivo.write('\n'.join(self._lote) + '\n')
+            self._lote = []
+
+    def __enter__(self) -> 'DestinoArquivo':
+        return self
+
+    def __exit__(self, *excecao):
+        self.descarregar()
+        return False
+
+
+class DestinoConsumidor:
+    """Entrega cada instrução a um gerador consumidor via send()
+
+    O consumidor recebe as instruções com `instrucao = yield`; fechar()
+    encerra o gerador (GeneratorExit), que pode então finalizar o trabalho.
+    """
+
+    def __init__(self, consumidor: Generator):
+        self.consumidor = consumidor
+        next(consumidor)  # avança até o primeiro yield
+        self.append = consumidor.send
+
+    def fechar(self):
+        self.consumidor.close()
+
+    def __enter__(self) -> 'DestinoConsumidor':
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+        return False
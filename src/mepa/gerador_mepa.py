@@ -0,0 +1,248 @@
+"""
+Geração de código MEPA: passada sobre a AST já anotada pela análise semântica
+"""
+
+from typing import List
+
+from ..errors.erros_moonlet import ErroGeracao, PosicaoErro
+from ..parser.sintatico_moonlet import (
+    ASTNode, LiteralNode, IdentifierNode, BinaryOpNode, UnaryOpNode,
+    FunctionCallNode, TableAccessNode, AnonymousFunctionNode
+)
+from ..parser.dobramento_constantes import TIPOS_EMPILHADOS
+
+# Operadores binários para os quais é emitida instrução MEPA
+INSTRUCOES_BINARIAS = {
+    '+': 'SOMA', '-': 'SUBT', '*': 'MULT', '/': 'DIVI', '%': 'MODI', '^': 'POTI',
+    '<': 'CMME', '>': 'CMMA', '<=': 'CMEG', '>=': 'CMAG', '==': 'CMIG', '~=': 'CMDG',
+}
+# Operadores unários para os quais é emitida instrução MEPA
+OPERADORES_UNARIOS_MEPA = {'-', 'not'}
+
+# Nós de expressão que podem aparecer como comando (chamadas, p.ex.)
+_EXPRESSOES = (LiteralNode, IdentifierNode, BinaryOpNode, UnaryOpNode,
+               FunctionCallNode, TableAccessNode, AnonymousFunctionNode)
+
+
+class GeradorMEPA:
+    """Visitante que traduz a AST anotada em instruções MEPA
+
+    Só expressões numéricas (números, booleanos, variáveis e os operadores
+    com instrução MEPA) viram código. Os demais valores (strings, tabelas,
+    chamadas, and/or, ..) não têm representação na máquina: em declarações
+    e atribuições nada é gerado, e onde um valor é obrigatório (condições e
+    limites de laço) é levantado ErroGeracao. Assim, todo código gerado
+    deixa a pilha como a encontrou.
+
+    As instruções vão para o destino, que por padrão é uma lista nova. Pode
+    ser qualquer objeto com append (ver destinos_mepa): o código é então
+    escrito à medida que é gerado, e a memória usada não cresce com ele. Se
+    a geração falhar no meio, o destino já terá recebido parte do código.
+    """
+
+    def __init__(self, destino=None):
+        # lista de strings de instruções MEPA, ou destino que as recebe uma a uma
+        self.codigo_mepa = [] if destino is None else destino
+        self._emitir = self.codigo_mepa.append
+        self._contador_rotulos = 0
+
+    def gerar(self, programa: ASTNode):
+        """Gera o código do programa e devolve o destino (a lista, por padrão)"""
+        programa.accept(self)
+        return self.codigo_mepa
+
+    # ---------------- Suporte a MEPA ----------------
+    def _novo_rotulo(self, base: str = 'L') -> str:
+        rot = f"{base}{self._contador_rotulos}"
+        self._contador_rotulos += 1
+        return rot
+
+    def _empilha_valor(self, no: ASTNode) -> bool:
+        """Indica se o MEPA gerado para a expressão deixa exatamente um valor na pilha"""
+        pendentes = [no]  # pilha explícita: cadeias longas não esgotam a recursão
+        while pendentes:
+            no = pendentes.pop()
+            if isinstance(no, BinaryOpNode):
+                if no.operador not in INSTRUCOES_BINARIAS:
+                    return False
+                pendentes.append(no.direita)
+                pendentes.append(no.esquerda)
+            elif isinstance(no, UnaryOpNode):
+                if no.operador not in OPERADORES_UNARIOS_MEPA:
+                    return False
+                pendentes.append(no.operando)
+            elif isinstance(no, LiteralNode):
+                if no.tipo not in TIPOS_EMPILHADOS:
+                    return False
+            elif not isinstance(no, IdentifierNode):
+                return False
+        return True
+
+    def _gerar_valor(self, no: ASTNode) -> bool:
+        """Empilha o valor da expressão, se ela tiver tradução; indica se empilhou"""
+        if self._empilha_valor(no):
+            no.accept(self)
+            return True
+        self._gerar_efeitos(no)
+        return False
+
+    def _gerar_valor_obrigatorio(self, no: ASTNode, contexto: str):
+        if not self._gerar_valor(no):
+            raise ErroGeracao(f"{contexto} sem tradução para MEPA (apenas expressões numéricas)",
+                              PosicaoErro(no.linha, 0))
+
+    def _gerar_efeitos(self, no: ASTNode):
+        """Código de um valor que não é empilhado: só o corpo de função anônima, gerado no local"""
+        if isinstance(no, AnonymousFunctionNode):
+            self._gerar_bloco(no.corpo)
+
+    # ---------------- Comandos ----------------
+    def _gerar_bloco(self, comandos: List[ASTNode]):
+        for comando in comandos:
+            if isinstance(comando, _EXPRESSOES):
+                # Expressão usada como comando (chamada, p.ex.): o valor é descartado
+                self._gerar_efeitos(comando)
+            else:
+                comando.accept(self)
+
+    def generic_visit(self, node):
+        pass
+
+    def visit_program(self, node):
+        self._gerar_bloco(node.declaracoes)
+
+    def visit_block(self, node):
+        self._gerar_bloco(node.declaracoes)
+
+    def visit_variable_declaration(self, node):
+        # Armazena o valor inicial quando a expressão deixou um valor na pilha
+        if node.valor is not None and self._gerar_valor(node.valor):
+            self._emitir(f"ARMZ {node.endereco}")
+        elif node.reciclado:
+            # A posição foi de um temporário já liberado: começa zerada
+            self._emitir("CRCT 0")
+            self._emitir(f"ARMZ {node.endereco}")
+        # A alocação é simbólica: apenas registramos o endereço da variável
+        self._emitir(f"; decl local {node.nome} @ {node.endereco}")
+
+    def visit_assignment(self, node):
+        # Atribuição simples: variável à esquerda deve ser identificador
+        if isinstance(node.variavel, IdentifierNode):
+            if self._gerar_valor(node.valor):
+                self._emitir(f"ARMZ {node.variavel.endereco}")
+        else:
+            self._gerar_efeitos(node.valor)  # campos de tabela não existem na máquina
+
+    def visit_if_statement(self, node):
+        rotulo_fim = self._novo_rotulo('I')
+        for condicao, bloco in zip(node.condicoes, node.blocos):
+            self._gerar_valor_obrigatorio(condicao, "condição do if")
+            rotulo_proximo = self._novo_rotulo('I')
+            # Se condição for falsa, pula para o próximo ramo
+            self._emitir("DSVF " + rotulo_proximo)
+            self._gerar_bloco(bloco)
+            # Após executar o bloco, salta para o fim do IF
+            self._emitir("DSVS " + rotulo_fim)
+            self._emitir(f"{rotulo_proximo}:")
+        if node.bloco_else:
+            self._gerar_bloco(node.bloco_else)
+        self._emitir(f"{rotulo_fim}:")
+
+    def visit_while_loop(self, node):
+        rot_inicio = self._novo_rotulo('W')
+        rot_fim = self._novo_rotulo('W')
+        self._emitir(f"{rot_inicio}:")
+        self._gerar_valor_obrigatorio(node.condicao, "condição do while")
+        self._emitir("DSVF " + rot_fim)
+        self._gerar_bloco(node.corpo)
+        self._emitir("DSVS " + rot_inicio)
+        self._emitir(f"{rot_fim}:")
+
+    def visit_repeat_loop(self, node):
+        rot_inicio = self._novo_rotulo('R')
+        self._emitir(f"{rot_inicio}:")
+        self._gerar_bloco(node.corpo)
+        self._gerar_valor_obrigatorio(node.condicao, "condição do until")
+        # Repete enquanto condição for falsa
+        self._emitir("DSVF " + rot_inicio)
+
+    def _gerar_laco_numerico(self, node, inicio, fim, passo, base_rotulo: str):
+        self._gerar_valor_obrigatorio(inicio, "início do for")
+        self._emitir(f"ARMZ {node.endereco_var}")
+        self._gerar_valor_obrigatorio(fim, "fim do for")
+        self._emitir(f"ARMZ {node.endereco_fim}")
+        if passo is not None:
+            self._gerar_valor_obrigatorio(passo, "passo do for")
+        else:
+            self._emitir("CRCT 1")  # passo padrão = 1
+        self._emitir(f"ARMZ {node.endereco_passo}")
+        rot_inicio = self._novo_rotulo(base_rotulo)
+        rot_fim = self._novo_rotulo(base_rotulo)
+        self._emitir(f"{rot_inicio}:")
+        # condição: var <= fim (assumimos passo positivo)
+        self._emitir(f"CRVL {node.endereco_var}")
+        self._emitir(f"CRVL {node.endereco_fim}")
+        self._emitir("CMEG")
+        self._emitir(f"DSVF {rot_fim}")
+        self._gerar_bloco(node.corpo)
+        # incremento: var = var + passo
+        self._emitir(f"CRVL {node.endereco_var}")
+        self._emitir(f"CRVL {node.endereco_passo}")
+        self._emitir("SOMA")
+        self._emitir(f"ARMZ {node.endereco_var}")
+        self._emitir(f"DSVS {rot_inicio}")
+        self._emitir(f"{rot_fim}:")
+
+    def visit_for_loop(self, node):
+        self._gerar_laco_numerico(node, node.inicio, node.fim, node.passo, 'F')
+
+    def visit_for_in_loop(self, node):
+        self._gerar_laco_numerico(node, node.inicio, node.iterador, node.passo, 'G')
+
+    def visit_function_definition(self, node):
+        # Sem registros de ativação: o corpo é gerado no próprio local
+        self._gerar_bloco(node.corpo)
+
+    def visit_return(self, node):
+        # Sem registros de ativação não há para onde devolver os valores
+        for valor in node.valores:
+            self._gerar_efeitos(valor)
+
+    # ---------------- Expressões ----------------
+    # Só alcançadas por _gerar_valor, depois de _empilha_valor confirmar a tradução
+    def _gerar_expressao(self, raiz: ASTNode):
+        """Emite a expressão em pós-ordem com uma pilha explícita em vez de recursão"""
+        pendentes = [(raiz, False)]
+        while pendentes:
+            node, operandos_gerados = pendentes.pop()
+            if isinstance(node, BinaryOpNode):
+                if operandos_gerados:
+                    self._emitir(INSTRUCOES_BINARIAS[node.operador])
+                else:
+                    pendentes.append((node, True))
+                    pendentes.append((node.direita, False))
+                    pendentes.append((node.esquerda, False))
+            elif isinstance(node, UnaryOpNode):
+                if operandos_gerados:
+                    self._emitir('INVR' if node.operador == '-' else 'NEGA')
+                else:
+                    pendentes.append((node, True))
+                    pendentes.append((node.operando, False))
+            else:
+                node.accept(self)
+
+    def visit_binary_op(self, node):
+        self._gerar_expressao(node)
+
+    def visit_unary_op(self, node):
+        self._gerar_expressao(node)
+
+    def visit_literal(self, node):
+        # Números e booleanos (1/0) são empilhados; os demais literais não geram MEPA
+        if node.tipo == 'number':
+            self._emitir(f"CRCT {node.valor}")
+        elif node.tipo == 'boolean':
+            self._emitir("CRCT 1" if node.valor else "CRCT 0")
+
+    def visit_identifier(self, node):
+        self._emitir(f"CRVL {node.endereco}")
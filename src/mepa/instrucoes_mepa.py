@@ -0,0 +1,151 @@
+"""
+Conjunto de instruções MEPA: códigos numéricos, semântica das operações
+e decodificação do código textual gerado pelo parser
+"""
+
+from typing import Iterable, List, NamedTuple, Sequence, Union
+
+from ..errors.erros_moonlet import ErroExecucao
+
+# --- Códigos das instruções ---
+(CRCT, CRVL, ARMZ,
+ SOMA, SUBT, MULT, DIVI, MODI, POTI, INVR,
+ CONJ, DISJ, NEGA,
+ CMME, CMMA, CMIG, CMDG, CMEG, CMAG,
+ DSVS, DSVF, NADA,
+ IMPR, LEIT, INPP, AMEM, DMEM, PARA) = range(28)
+# Extensões produzidas pelo otimizador peephole (não fazem parte da MEPA clássica)
+DUPL, INCR, DECR = range(28, 31)
+
+MNEMONICOS = {
+    'CRCT': CRCT, 'CRVL': CRVL, 'ARMZ': ARMZ,
+    'SOMA': SOMA, 'SUBT': SUBT, 'MULT': MULT, 'DIVI': DIVI, 'MODI': MODI,
+    'POTI': POTI, 'INVR': INVR,
+    'CONJ': CONJ, 'DISJ': DISJ, 'NEGA': NEGA,
+    'CMME': CMME, 'CMMA': CMMA, 'CMIG': CMIG, 'CMDG': CMDG, 'CMEG': CMEG, 'CMAG': CMAG,
+    'DSVS': DSVS, 'DSVF': DSVF, 'NADA': NADA,
+    'IMPR': IMPR, 'LEIT': LEIT, 'INPP': INPP, 'AMEM': AMEM, 'DMEM': DMEM, 'PARA': PARA,
+    'DUPL': DUPL, 'INCR': INCR, 'DECR': DECR,
+}
+NOMES = {codigo: nome for nome, codigo in MNEMONICOS.items()}
+
+# Instruções que recebem operando
+COM_OPERANDO = {CRCT, CRVL, ARMZ, DSVS, DSVF, AMEM, DMEM}
+DESVIOS = {DSVS, DSVF}
+
+Numero = Union[int, float]
+
+
+class ProgramaMEPA(NamedTuple):
+    """Programa MEPA decodificado: opcodes e operandos em sequências paralelas"""
+    opcodes: Sequence[int]
+    operandos: Sequence[int]      # CRCT: índice em constantes; desvios: índice de instrução
+    constantes: List[Numero]
+    tamanho_memoria: int = 0
+
+
+# --- Semântica das operações aritméticas ---
+def dividir(a: Numero, b: Numero) -> Numero:
+    """DIVI: divisão inteira (truncada) entre inteiros, real caso contrário"""
+    if b == 0:
+        raise ErroExecucao("Divisão por zero")
+    if isinstance(a, int) and isinstance(b, int):
+        quociente = abs(a) // abs(b)
+        return quociente if (a >= 0) == (b >= 0) else -quociente
+    return a / b
+
+
+def modulo(a: Numero, b: Numero) -> Numero:
+    """MODI: resto coerente com a divisão truncada de DIVI"""
+    if b == 0:
+        raise ErroExecucao("Divisão por zero")
+    if isinstance(a, int) and isinstance(b, int):
+        return a - b * dividir(a, b)
+    return a - b * int(a / b)
+
+
+# --- Decodificação ---
+def eh_rotulo(linha: str) -> bool:
+    return linha.endswith(':')
+
+
+def eh_comentario(linha: str) -> bool:
+    return linha.startswith(';')
+
+
+def ler_numero(texto: str) -> Numero:
+    try:
+        return int(texto)
+    except ValueError:
+        return float(texto)
+
+
+class MontadorIncremental:
+    """Decodifica o código MEPA linha a linha, à medida que é gerado
+
+    Serve de destino para o GeradorMEPA (tem append), de modo que o código vai
+    direto para opcodes e operandos sem passar por uma lista de strings. Os
+    desvios são resolvidos em concluir(), quando todos os rótulos já são
+    conhecidos; um rótulo definido duas vezes vale pela última definição.
+    """
+
+    def __init__(self):
+        self.opcodes: List[int] = []
+        self.operandos: List[int] = []
+        self.constantes: List[Numero] = []
+        self._indice_constantes = {}
+        self._rotulos = {}  # rótulo -> índice da instrução seguinte
+        self._desvios: List[tuple] = []  # (índice da instrução, rótulo de destino)
+
+    def append(self, linha: str):
+        linha = linha.strip()
+        if not linha or eh_comentario(linha):
+            return
+        if eh_rotulo(linha):
+            self._rotulos[linha[:-1]] = len(self.opcodes)
+            return
+        partes = linha.split()
+        codigo = MNEMONICOS.get(partes[0])
+        if codigo is None:
+            raise ErroExecucao(f"Instrução MEPA desconhecida: '{partes[0]}'")
+        operando = 0
+        if codigo in COM_OPERANDO:
+            if len(partes) < 2:
+                raise ErroExecucao(f"Instrução '{partes[0]}' requer operando")
+            if codigo in DESVIOS:
+                self._desvios.append((len(self.opcodes), partes[1]))
+            elif codigo == CRCT:
+                valor = ler_numero(partes[1])
+                chave = (type(valor), valor)
+                operando = self._indice_constantes.get(chave)
+                if operando is None:
+                    operando = self._indice_constantes[chave] = len(self.constantes)
+                    self.constantes.append(valor)
+            else:
+                operando = int(partes[1])
+        self.opcodes.append(codigo)
+        self.operandos.append(operando)
+
+    def concluir(self, tamanho_memoria: int = 0) -> ProgramaMEPA:
+        """Resolve os desvios e devolve o programa decodificado"""
+        rotulos = self._rotulos
+        for indice, rotulo in self._desvios:
+            if rotulo not in rotulos:
+                raise ErroExecucao(f"Rótulo MEPA não definido: '{rotulo}'")
+            self.operandos[indice] = rotulos[rotulo]
+        self._desvios = []
+        return ProgramaMEPA(self.opcodes, self.operandos, self.constantes, tamanho_memoria)
+
+
+def decodificar(codigo_mepa: Iterable[str], tamanho_memoria: int = 0) -> ProgramaMEPA:
+    """Resolve os rótulos e converte o código textual em um ProgramaMEPA"""
+    montador = MontadorIncremental()
+    for linha in codigo_mepa:
+        montador.append(linha)
+    return montador.concluir(tamanho_memoria)
+
+
+def contar_instrucoes(codigo_mepa: List[str]) -> int:
+    """Número de instruções executáveis (sem rótulos nem comentários)"""
+    return sum(1 for linha in codigo_mepa
+               if linha.strip() and not eh_rotulo(linha.strip()) and not eh_comentario(linha.strip()))
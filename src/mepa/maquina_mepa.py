@@ -0,0 +1,214 @@
+"""
+Máquina virtual MEPA: executa o código gerado pelo compilador Moonlet
+
+Uso: python -m src.mepa arquivo.moonlet [-O] [-o arquivo.mepab]
+     python -m src.mepa arquivo.mepab
+"""
+
+import os
+import sys
+from typing import Callable, List, Optional, Union
+
+from ..errors.erros_moonlet import ErroExecucao
+from .instrucoes_mepa import (
+    CRCT, CRVL, ARMZ, SOMA, SUBT, MULT, DIVI, MODI, POTI, INVR,
+    CONJ, DISJ, NEGA, CMME, CMMA, CMIG, CMDG, CMEG, CMAG,
+    DSVS, DSVF, IMPR, LEIT, AMEM, DMEM, PARA, DUPL, INCR, DECR,
+    ProgramaMEPA, MontadorIncremental, decodificar, dividir, modulo, ler_numero
+)
+from .bytecode_mepa import carregar, salvar, EXTENSAO_BYTECODE
+
+
+class MaquinaMEPA:
+    """Interpretador de pilha para código MEPA"""
+
+    def __init__(self, programa: Union[List[str], ProgramaMEPA], tamanho_memoria: int = 0,
+                 saida: Callable = print, entrada: Callable = input):
+        # Rótulos resolvidos uma única vez: o laço de execução só vê inteiros.
+        # Um ProgramaMEPA (p.ex. carregado de bytecode) é usado sem decodificação.
+        if not isinstance(programa, ProgramaMEPA):
+            programa = decodificar(programa, tamanho_memoria)
+        self.programa = programa
+        self.tamanho_memoria = programa.tamanho_memoria
+        self.saida = saida
+        self.entrada = entrada
+        self.memoria: List = []
+        self.pilha: List = []
+
+    def executar(self, limite_desvios: Optional[int] = None) -> List:
+        """Executa o programa e devolve a memória de dados final"""
+        ops = self.programa.opcodes
+        args = self.programa.operandos
+        constantes = self.programa.constantes
+        m = self.memoria = [0] * self.tamanho_memoria
+        pilha = self.pilha = []
+        empilhar = pilha.append
+        desempilhar = pilha.pop
+        desvios_restantes = limite_desvios if limite_desvios is not None else -1
+        n = len(ops)
+        pc = 0
+
+        try:
+            while pc < n:
+                op = ops[pc]
+                arg = args[pc]
+                pc += 1
+                # Despacho ordenado pela frequência típica das instruções
+                if op == CRVL:
+                    empilhar(m[arg])
+                elif op == CRCT:
+                    empilhar(constantes[arg])
+                elif op == ARMZ:
+                    m[arg] = desempilhar()
+                elif op == DSVF:
+                    if not desempilhar():
+                        pc = arg
+                        if desvios_restantes > 0:
+                            desvios_restantes -= 1
+                        elif desvios_restantes == 0:
+                            raise ErroExecucao("Limite de desvios excedido")
+                elif op == DSVS:
+                    pc = arg
+                    if desvios_restantes > 0:
+                        desvios_restantes -= 1
+                    elif desvios_restantes == 0:
+                        raise ErroExecucao("Limite de desvios excedido")
+                elif op == SOMA:
+                    b = desempilhar()
+                    pilha[-1] = pilha[-1] + b
+                elif op == INCR:
+                    pilha[-1] = pilha[-1] + 1
+                elif op == DUPL:
+                    empilhar(pilha[-1])
+                elif op == SUBT:
+                    b = desempilhar()
+                    pilha[-1] = pilha[-1] - b
+                elif op == CMEG:
+                    b = desempilhar()
+                    pilha[-1] = 1 if pilha[-1] <= b else 0
+                elif op == CMME:
+                    b = desempilhar()
+                    pilha[-1] = 1 if pilha[-1] < b else 0
+                elif op == CMAG:
+                    b = desempilhar()
+                    pilha[-1] = 1 if pilha[-1] >= b else 0
+                elif op == CMMA:
+                    b = desempilhar()
+                    pilha[-1] = 1 if pilha[-1] > b else 0
+                elif op == CMIG:
+                    b = desempilhar()
+                    pilha[-1] = 1 if pilha[-1] == b else 0
+                elif op == CMDG:
+                    b = desempilhar()
+                    pilha[-1] = 1 if pilha[-1] != b else 0
+                elif op == MULT:
+                    b = desempilhar()
+                    pilha[-1] = pilha[-1] * b
+                elif op == DIVI:
+                    b = desempilhar()
+                    pilha[-1] = dividir(pilha[-1], b)
+                elif op == MODI:
+                    b = desempilhar()
+                    pilha[-1] = modulo(pilha[-1], b)
+                elif op == POTI:
+                    b = desempilhar()
+                    pilha[-1] = pilha[-1] ** b
+                elif op == INVR:
+                    pilha[-1] = -pilha[-1]
+                elif op == DECR:
+                    pilha[-1] = pilha[-1] - 1
+                elif op == CONJ:
+                    b = desempilhar()
+                    pilha[-1] = 1 if pilha[-1] and b else 0
+                elif op == DISJ:
+                    b = desempilhar()
+                    pilha[-1] = 1 if pilha[-1] or b else 0
+                elif op == NEGA:
+                    pilha[-1] = 0 if pilha[-1] else 1
+                elif op == IMPR:
+                    self.saida(desempilhar())
+                elif op == LEIT:
+                    empilhar(ler_numero(self.entrada().strip()))
+                elif op == AMEM:
+                    m.extend([0] * arg)
+                elif op == DMEM:
+                    del m[len(m) - arg:]
+                elif op == PARA:
+                    break
+                # NADA e INPP não alteram o estado
+        except IndexError:
+            raise ErroExecucao(f"Pilha vazia ou endereço inválido na instrução {pc - 1}")
+        return m
+
+
+def main():
+    """Compila um arquivo .moonlet (ou carrega bytecode .mepab) e executa o código MEPA"""
+    import argparse
+    from ..ast.compilador_moonlet import AnalisadorMoonlet
+    from ..utils import CONFIG
+
+    argumentos = argparse.ArgumentParser(
+        prog="python -m src.mepa",
+        description="Executa programas Moonlet na máquina MEPA")
+    argumentos.add_argument("arquivo", help="arquivo .moonlet ou imagem de bytecode .mepab")
+    argumentos.add_argument("-o", "--saida", help="grava o bytecode montado neste arquivo em vez de executar")
+    argumentos.add_argument("-O", "--otimizar", action="store_true",
+                            help="aplica o otimizador peephole ao código MEPA gerado")
+    opcoes = argumentos.parse_args()
+
+    caminho = opcoes.arquivo
+    if not os.path.exists(caminho):
+        print(f"Arquivo '{caminho}' não encontrado.")
+        sys.exit(2)
+
+    tabela_simbolos = None
+    if caminho.endswith(EXTENSAO_BYTECODE):
+        try:
+            programa = carregar(caminho)
+        except ErroExecucao as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+    else:
+        with open(caminho, 'r', encoding=CONFIG['encoding']) as arquivo:
+            codigo = arquivo.read()
+        # Sem otimização, o código vai direto do gerador para o montador
+        montador = None if opcoes.otimizar else MontadorIncremental()
+        resultado = AnalisadorMoonlet(otimizar=opcoes.otimizar).compilar(
+            codigo, caminho, destino_mepa=montador)
+        if not resultado.sucesso or resultado.relatorio_erros.tem_erros():
+            print(f"✗ Compilação de '{caminho}' falhou:")
+            if resultado.erro_fatal:
+                print(f"  {resultado.erro_fatal}")
+            for erro in resultado.diagnosticos:
+                print(f"  {erro}")
+            sys.exit(1)
+        if montador is None:
+            programa = decodificar(resultado.codigo_mepa, resultado.tamanho_quadro)
+        else:
+            programa = montador.concluir(resultado.tamanho_quadro)
+        tabela_simbolos = resultado.tabela_simbolos
+
+    if opcoes.saida:
+        salvar(programa, opcoes.saida)
+        print(f"✓ Bytecode gravado em '{opcoes.saida}' ({len(programa.opcodes)} instruções)")
+        return
+
+    maquina = MaquinaMEPA(programa)
+    try:
+        memoria = maquina.executar()
+    except ErroExecucao as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    print("=== MEMÓRIA FINAL ===")
+    if tabela_simbolos is None:
+        for endereco, valor in enumerate(memoria):
+            print(f"[{endereco}] = {valor}")
+        return
+    for nome, simbolo in tabela_simbolos.items():
+        if not nome.startswith('__tmp'):
+            print(f"{nome} = {memoria[simbolo['endereco']]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Otimizador peephole para o código MEPA gerado pelo compilador Moonlet
+
+Uso: python -m src.mepa.otimizador_mepa [diretório]
+     (relata a redução de instruções nos arquivos .moonlet do diretório,
+     por padrão examples/)
+"""
+
+import os
+import sys
+from typing import Dict, Iterable, List, Optional
+
+from .instrucoes_mepa import eh_rotulo, eh_comentario, ler_numero, contar_instrucoes
+
+# Regras disponíveis, na ordem em que são aplicadas
+REGRAS_PADRAO = (
+    'armazena_carrega',     # ARMZ n; CRVL n          -> DUPL; ARMZ n
+    'incremento',           # CRCT 1; SOMA | SUBT     -> INCR | DECR
+    'elemento_neutro',      # CRCT 0; SOMA | SUBT e CRCT 1; MULT | DIVI -> (nada)
+    'dupla_inversao',       # INVR; INVR              -> (nada)
+    'desvio_constante',     # CRCT k; DSVF L          -> (nada) se k ≠ 0, DSVS L se k = 0
+    'desvio_encadeado',     # desvio para L, com L: DSVS M -> desvio direto para M
+    'desvio_proximo',       # DSVS L seguido de L:    -> L:
+    'codigo_inalcancavel',  # instruções entre DSVS e o próximo rótulo
+    'rotulo_morto',         # rótulos que nenhum desvio referencia
+)
+
+_REGRAS_DE_PAR = {'armazena_carrega', 'incremento', 'elemento_neutro',
+                  'dupla_inversao', 'desvio_constante'}
+
+
+def _partes(instrucao: str):
+    partes = instrucao.split()
+    return partes[0], (partes[1] if len(partes) > 1 else None)
+
+
+def _constante_inteira(operando: Optional[str], valor: int) -> bool:
+    """Verdadeiro se o operando de CRCT é exatamente o inteiro informado"""
+    try:
+        return int(operando) == valor and str(int(operando)) == operando.lstrip('+')
+    except (TypeError, ValueError):
+        return False
+
+
+class OtimizadorPeephole:
+    """Aplica regras locais sobre a lista de instruções MEPA até não haver mudança"""
+
+    def __init__(self, regras: Optional[Iterable[str]] = None, max_passadas: int = 10):
+        self.regras = tuple(REGRAS_PADRAO if regras is None else regras)
+        desconhecidas = set(self.regras) - set(REGRAS_PADRAO)
+        if desconhecidas:
+            raise ValueError(f"Regras de otimização desconhecidas: {', '.join(sorted(desconhecidas))}")
+        self.max_passadas = max_passadas
+        self.contadores: Dict[str, int] = {nome: 0 for nome in self.regras}
+
+    def otimizar(self, codigo_mepa: List[str]) -> List[str]:
+        codigo = list(codigo_mepa)
+        usa_pares = any(regra in _REGRAS_DE_PAR for regra in self.regras)
+        for _ in range(self.max_passadas):
+            antes = sum(self.contadores.values())
+            if usa_pares:
+                codigo = self._aplicar_pares(codigo)
+            if 'desvio_encadeado' in self.regras:
+                codigo = self._encadear_desvios(codigo)
+            if 'desvio_proximo' in self.regras:
+                codigo = self._remover_desvio_proximo(codigo)
+            if 'codigo_inalcancavel' in self.regras:
+                codigo = self._remover_inalcancavel(codigo)
+            if 'rotulo_morto' in self.regras:
+                codigo = self._remover_rotulos_mortos(codigo)
+            if sum(self.contadores.values()) == antes:
+                break
+        return codigo
+
+    # ---------------- Regras sobre pares adjacentes ----------------
+    def _substituir_par(self, a: str, b: str) -> Optional[List[str]]:
+        op_a, arg_a = _partes(a)
+        op_b, arg_b = _partes(b)
+        regras = self.regras
+
+        if op_a == 'ARMZ' and op_b == 'CRVL' and arg_a == arg_b and 'armazena_carrega' in regras:
+            self.contadores['armazena_carrega'] += 1
+            return ['DUPL', a]
+        if op_a == 'CRCT':
+            if op_b in ('SOMA', 'SUBT'):
+                if _constante_inteira(arg_a, 1) and 'incremento' in regras:
+                    self.contadores['incremento'] += 1
+                    return ['INCR' if op_b == 'SOMA' else 'DECR']
+                if _constante_inteira(arg_a, 0) and 'elemento_neutro' in regras:
+                    self.contadores['elemento_neutro'] += 1
+                    return []
+            if op_b in ('MULT', 'DIVI') and _constante_inteira(arg_a, 1) and 'elemento_neutro' in regras:
+                self.contadores['elemento_neutro'] += 1
+                return []
+            if op_b == 'DSVF' and 'desvio_constante' in regras:
+                self.contadores['desvio_constante'] += 1
+                return [] if ler_numero(arg_a) != 0 else [f"DSVS {arg_b}"]
+        if op_a == 'INVR' and op_b == 'INVR' and 'dupla_inversao' in regras:
+            self.contadores['dupla_inversao'] += 1
+            return []
+        return None
+
+    def _aplicar_pares(self, codigo: List[str]) -> List[str]:
+        saida: List[str] = []
+        ultima = -1  # posição em saida da última instrução ainda adjacente
+        for linha in codigo:
+            texto = linha.strip()
+            if eh_comentario(texto):
+                saida.append(linha)
+                continue
+            if eh_rotulo(texto):
+                # Um rótulo é destino de desvio: separa as instruções vizinhas
+                saida.append(linha)
+                ultima = -1
+                continue
+            if ultima >= 0:
+                substituto = self._substituir_par(saida[ultima].strip(), texto)
+                if substituto is not None:
+                    comentarios = saida[ultima + 1:]
+                    del saida[ultima:]
+                    saida.extend(comentarios)
+                    ultima = -1
+                    for instrucao in substituto:
+                        saida.append(instrucao)
+                        ultima = len(saida) - 1
+                    continue
+            saida.append(linha)
+            ultima = len(saida) - 1
+        return saida
+
+    # ---------------- Regras sobre desvios ----------------
+    def _encadear_desvios(self, codigo: List[str]) -> List[str]:
+        # Para cada rótulo, a primeira instrução executada a partir dele
+        destino_direto = {}
+        rotulos_pendentes = []
+        for linha in codigo:
+            texto = linha.strip()
+            if eh_comentario(texto):
+                continue
+            if eh_rotulo(texto):
+                rotulos_pendentes.append(texto[:-1])
+                continue
+            op, arg = _partes(texto)
+            if op == 'DSVS':
+                for rotulo in rotulos_pendentes:
+                    destino_direto[rotulo] = arg
+            rotulos_pendentes = []
+
+        def destino_final(rotulo: str) -> str:
+            visitados = {rotulo}
+            while rotulo in destino_direto and destino_direto[rotulo] not in visitados:
+                rotulo = destino_direto[rotulo]
+                visitados.add(rotulo)
+            return rotulo
+
+        saida = []
+        for linha in codigo:
+            texto = linha.strip()
+            if not eh_comentario(texto) and not eh_rotulo(texto):
+                op, arg = _partes(texto)
+                if op in ('DSVS', 'DSVF') and arg in destino_direto:
+                    alvo = destino_final(arg)
+                    if alvo != arg:
+                        self.contadores['desvio_encadeado'] += 1
+                        linha = f"{op} {alvo}"
+            saida.append(linha)
+        return saida
+
+    def _remover_desvio_proximo(self, codigo: List[str]) -> List[str]:
+        saida = []
+        for i, linha in enumerate(codigo):
+            texto = linha.strip()
+            if texto.startswith('DSVS '):
+                alvo = _partes(texto)[1] + ':'
+                j = i + 1
+                while j < len(codigo) and (eh_rotulo(codigo[j].strip()) or eh_comentario(codigo[j].strip())):
+                    if codigo[j].strip() == alvo:
+                        break
+                    j += 1
+                if j < len(codigo) and codigo[j].strip() == alvo:
+                    self.contadores['desvio_proximo'] += 1
+                    continue
+            saida.append(linha)
+        return saida
+
+    def _remover_inalcancavel(self, codigo: List[str]) -> List[str]:
+        saida = []
+        inalcancavel = False
+        for linha in codigo:
+            texto = linha.strip()
+            if eh_rotulo(texto):
+                inalcancavel = False
+            elif inalcancavel and not eh_comentario(texto):
+                self.contadores['codigo_inalcancavel'] += 1
+                continue
+            elif texto.startswith('DSVS ') or texto == 'PARA':
+                inalcancavel = True
+            saida.append(linha)
+        return saida
+
+    def _remover_rotulos_mortos(self, codigo: List[str]) -> List[str]:
+        referenciados = set()
+        for linha in codigo:
+            op, arg = _partes(linha.strip()) if linha.strip() else ('', None)
+            if op in ('DSVS', 'DSVF'):
+                referenciados.add(arg)
+        saida = []
+        for linha in codigo:
+            texto = linha.strip()
+            if eh_rotulo(texto) and texto[:-1] not in referenciados:
+                self.contadores['rotulo_morto'] += 1
+                continue
+            saida.append(linha)
+        return saida
+
+
+def main():
+    """Relata a redução de instruções obtida nos exemplos"""
+    from ..ast.compilador_moonlet import AnalisadorMoonlet
+    from ..utils import CONFIG
+
+    diretorio = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '..', '..', 'examples')
+    arquivos = sorted(nome for nome in os.listdir(diretorio) if nome.endswith('.moonlet'))
+
+    totais = {nome: 0 for nome in REGRAS_PADRAO}
+    soma_antes = soma_depois = 0
+    print(f"{'arquivo':<32} | {'antes':>5} | {'depois':>6} | {'redução':>7}")
+    print(CONFIG['separador_linha'] + '-' * 10)
+    for nome in arquivos:
+        with open(os.path.join(diretorio, nome), 'r', encoding=CONFIG['encoding']) as arquivo:
+            resultado = AnalisadorMoonlet().compilar(arquivo.read(), nome)
+        if not resultado.sucesso:
+            print(f"{nome:<32} | (não compilou: {resultado.erro_fatal})")
+            continue
+        otimizador = OtimizadorPeephole()
+        otimizado = otimizador.otimizar(resultado.codigo_mepa)
+        antes = contar_instrucoes(resultado.codigo_mepa)
+        depois = contar_instrucoes(otimizado)
+        soma_antes += antes
+        soma_depois += depois
+        for regra, quantidade in otimizador.contadores.items():
+            totais[regra] += quantidade
+        reducao = 100 * (antes - depois) / antes if antes else 0.0
+        print(f"{nome:<32} | {antes:>5} | {depois:>6} | {reducao:>6.1f}%")
+
+    if soma_antes:
+        print(f"\nTotal: {soma_antes} -> {soma_depois} instruções "
+              f"({100 * (soma_antes - soma_depois) / soma_antes:.1f}% de redução)")
+    print("\nAplicações por regra:")
+    for regra, quantidade in totais.items():
+        print(f"  {regra:<22} {quantidade}")
+
+
+if __name__ == "__main__":
+    main()
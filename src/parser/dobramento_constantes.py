@@ -0,0 +1,98 @@
+"""
+Dobramento de constantes: avalia em tempo de compilação operações cujos
+operandos são todos literais empilháveis (números e booleanos), dando o
+mesmo valor que a máquina MEPA calcularia. O que a máquina não avalia
+(and/or, comparações com strings, nil ou tabelas) fica como está.
+"""
+
+import math
+from typing import Any, Optional, Tuple
+
+from ..mepa.instrucoes_mepa import dividir, modulo
+
+# (valor, tipo) no formato de LiteralNode
+Constante = Tuple[Any, str]
+
+# Tipos de literal que o parser carrega na pilha com um único CRCT
+TIPOS_EMPILHADOS = ('number', 'boolean')
+
+_LIMITE_INT64 = 2 ** 63
+_BITS_MAXIMOS_POTENCIA = 64
+
+_ARITMETICOS = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    '/': dividir,
+    '%': modulo,
+}
+
+_RELACIONAIS = {
+    '<': lambda a, b: a < b,
+    '>': lambda a, b: a > b,
+    '<=': lambda a, b: a <= b,
+    '>=': lambda a, b: a >= b,
+}
+
+
+def _numero_representavel(valor) -> bool:
+    if isinstance(valor, int):
+        return -_LIMITE_INT64 <= valor < _LIMITE_INT64
+    return math.isfinite(valor)
+
+
+def _potencia(a, b):
+    # Evita construir inteiros gigantes em tempo de compilação
+    if isinstance(a, int) and isinstance(b, int) and b > 0 and abs(a) > 1:
+        if b * a.bit_length() > _BITS_MAXIMOS_POTENCIA:
+            return None
+    return a ** b
+
+
+def dobrar_binaria(operador: str, esquerda: Constante, direita: Constante) -> Optional[Constante]:
+    """Resultado de 'esquerda operador direita' ou None se não puder ser dobrado"""
+    (a, tipo_a), (b, tipo_b) = esquerda, direita
+
+    if operador == '..':
+        if tipo_a == 'string' and tipo_b == 'string':
+            return a + b, 'string'
+        return None
+    if tipo_a not in TIPOS_EMPILHADOS or tipo_b not in TIPOS_EMPILHADOS:
+        return None
+
+    # Na máquina, true/false são 1/0: 1 == true é verdadeiro (CMIG)
+    if operador == '==':
+        return a == b, 'boolean'
+    if operador == '~=':
+        return a != b, 'boolean'
+    if operador in _RELACIONAIS:
+        return _RELACIONAIS[operador](a, b), 'boolean'
+
+    if tipo_a != 'number' or tipo_b != 'number':
+        return None
+    try:
+        if operador == '^':
+            resultado = _potencia(a, b)
+        elif operador in _ARITMETICOS:
+            if operador in ('/', '%') and b == 0:
+                return None  # a divisão por zero continua sendo erro de execução
+            resultado = _ARITMETICOS[operador](a, b)
+        else:
+            return None
+    except (OverflowError, ZeroDivisionError):
+        return None
+    if resultado is None or isinstance(resultado, complex) or not _numero_representavel(resultado):
+        return None
+    return resultado, 'number'
+
+
+def dobrar_unaria(operador: str, operando: Constante) -> Optional[Constante]:
+    """Resultado de 'operador operando' ou None se não puder ser dobrado"""
+    valor, tipo = operando
+    if operador == 'not':
+        # NEGA: 1 para o valor 0 (ou false), 0 para os demais
+        return ((not valor), 'boolean') if tipo in TIPOS_EMPILHADOS else None
+    if operador == '-' and tipo == 'number':
+        resultado = -valor
+        return (resultado, 'number') if _numero_representavel(resultado) else None
+    return None
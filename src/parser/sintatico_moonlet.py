@@ -1,177 +1,308 @@
-from typing import List, Optional, Union
+import re
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from ..errors.erros_moonlet import (
-    ErroSintatico, PosicaoErro, RelatorioErros,
-    criar_erro_token_esperado, criar_erro_fim_arquivo_inesperado,
-    ErroSemantico
+    ErroSintatico, PosicaoErro, RelatorioErros, AVISO_TOKEN_INVALIDO, AVISO_TOKEN_PULADO,
+    criar_erro_token_esperado, criar_erro_fim_arquivo_inesperado
 )
 from ..lexer.lexico_moonlet import (
-    ERRO, IDENTIFICADOR, PALAVRA_CHAVE, NUMERO, STRING,
-    OPERADOR, SIMBOLO_ESPECIAL, COMENTARIO, EOS,
-    TOKEN_MAP, PALAVRAS_CHAVE, OPERADORES_DUPLOS, SIMBOLOS_ESPECIAIS,
-    Token, AnalisadorLexicoMoonlet
+    ERRO, IDENTIFICADOR, PALAVRA_CHAVE, NUMERO, STRING, COMENTARIO, EOS,
+    TOKEN_MAP, Token, AnalisadorLexicoMoonlet, ESPECIES, LEXEMA_POR_ESPECIE,
+    PC_BREAK, PC_DO, PC_ELSE, PC_ELSEIF, PC_END, PC_FALSE, PC_FOR, PC_FUNCTION,
+    PC_GOTO, PC_IF, PC_IN, PC_LOCAL, PC_NIL, PC_NOT, PC_REPEAT, PC_RETURN,
+    PC_THEN, PC_TRUE, PC_UNTIL, PC_WHILE, OP_ATRIBUICAO, OP_MENOS,
+    SB_ABRE_CHAVE, SB_ABRE_COLCHETE, SB_ABRE_PARENTESE, SB_CERQUILHA, SB_FECHA_CHAVE,
+    SB_FECHA_COLCHETE, SB_FECHA_PARENTESE, SB_PONTO, SB_PONTO_E_VIRGULA, SB_ROTULO,
+    SB_VIRGULA
 )
+from ..lexer.buffer_tokens import CursorTokens
+from .dobramento_constantes import dobrar_binaria, dobrar_unaria
+
+def nomes_metodo_visita(classe: type) -> tuple:
+    """Nomes procurados no visitante: 'visit_for_in_loop' e o legado 'visit_forinloop'"""
+    nome = classe.__name__
+    if nome.endswith('Node'):
+        nome = nome[:-len('Node')]
+    snake = re.sub(r'(?<!^)(?=[A-Z])', '_', nome).lower()
+    return f'visit_{snake}', f"visit_{classe.__name__.lower().replace('node', '')}"
+
+
+def _visita_vazia(visitante, no):
+    return None
+
+
+# (classe do visitante, classe do nó) -> função chamada como f(visitante, nó)
+_DESPACHO: Dict[Tuple[type, type], Callable] = {}
+
+
+def metodo_visita(classe_visitante: type, classe_no: type) -> Callable:
+    """Método de visita para o par de classes, resolvido uma vez e guardado em cache
+
+    Procura os nomes de nomes_metodo_visita e, na falta deles, generic_visit.
+    Como a busca é feita na classe, os métodos de visita devem ser métodos de
+    instância comuns (não atributos atribuídos à instância).
+    """
+    chave = (classe_visitante, classe_no)
+    metodo = _DESPACHO.get(chave)
+    if metodo is None:
+        for nome in nomes_metodo_visita(classe_no):
+            metodo = getattr(classe_visitante, nome, None)
+            if metodo:
+                break
+        else:
+            metodo = getattr(classe_visitante, 'generic_visit', None) or _visita_vazia
+        _DESPACHO[chave] = metodo
+    return metodo
+
 
 # --- Definições de nós de AST simples ---
-class ASTNode: 
+# Os nós usam __slots__: sem __dict__ por instância, cada nó ocupa só os
+# campos declarados. Todo nó guarda a linha do código-fonte onde começa
+# (0 quando desconhecida); os campos de anotação (endereco, reciclado, ...)
+# são preenchidos pela análise semântica.
+class ASTNode:
+    __slots__ = ('linha',)
+
     def accept(self, visitor):
         """Método para padrão Visitor"""
-        # Obter o nome da classe sem o sufixo 'Node' e em minúsculas
-        class_name = self.__class__.__name__.lower().replace('node', '')
-        method_name = f'visit_{class_name}'
-        method = getattr(visitor, method_name, None)
-        if method:
-            return method(self)
-        else:
-            return visitor.generic_visit(self) if hasattr(visitor, 'generic_visit') else None
+        metodo = _DESPACHO.get((visitor.__class__, self.__class__))
+        if metodo is None:
+            metodo = metodo_visita(visitor.__class__, self.__class__)
+        return metodo(visitor, self)
 
 class LiteralNode(ASTNode):
-    def __init__(self, valor, tipo):
+    __slots__ = ('valor', 'tipo')
+
+    def __init__(self, valor, tipo, linha=0):
         self.valor = valor
         self.tipo = tipo
+        self.linha = linha
 
 class IdentifierNode(ASTNode):
-    def __init__(self, nome):
+    __slots__ = ('nome', 'endereco')
+
+    def __init__(self, nome, linha=0):
         self.nome = nome
+        self.linha = linha
 
 class BinaryOpNode(ASTNode):
-    def __init__(self, operador, esquerda, direita):
+    __slots__ = ('operador', 'esquerda', 'direita')
+
+    def __init__(self, operador, esquerda, direita, linha=0):
         self.operador = operador
         self.esquerda = esquerda
         self.direita = direita
+        self.linha = linha
 
 class UnaryOpNode(ASTNode):
-    def __init__(self, operador, operando):
+    __slots__ = ('operador', 'operando')
+
+    def __init__(self, operador, operando, linha=0):
         self.operador = operador
         self.operando = operando
+        self.linha = linha
 
 class FunctionCallNode(ASTNode):
-    def __init__(self, nome, argumentos):
+    __slots__ = ('nome', 'argumentos')
+
+    def __init__(self, nome, argumentos, linha=0):
         self.nome = nome
         self.argumentos = argumentos
+        self.linha = linha
 
 class TableAccessNode(ASTNode):
-    def __init__(self, tabela, chave, notacao_ponto=False):
+    __slots__ = ('tabela', 'chave', 'notacao_ponto')
+
+    def __init__(self, tabela, chave, notacao_ponto=False, linha=0):
         self.tabela = tabela
         self.chave = chave
         self.notacao_ponto = notacao_ponto
+        self.linha = linha
 
 class VariableDeclarationNode(ASTNode):
-    def __init__(self, nome, valor, local=False):
+    __slots__ = ('nome', 'valor', 'local', 'endereco', 'reciclado')
+
+    def __init__(self, nome, valor, local=False, linha=0):
         self.nome = nome
         self.valor = valor
         self.local = local
+        self.linha = linha
 
 class AssignmentNode(ASTNode):
-    def __init__(self, variavel, valor):
+    __slots__ = ('variavel', 'valor')
+
+    def __init__(self, variavel, valor, linha=0):
         self.variavel = variavel
         self.valor = valor
+        self.linha = linha
 
 class IfStatementNode(ASTNode):
-    def __init__(self, condicoes, blocos, bloco_else=None):
+    __slots__ = ('condicoes', 'blocos', 'bloco_else')
+
+    def __init__(self, condicoes, blocos, bloco_else=None, linha=0):
         self.condicoes = condicoes
         self.blocos = blocos
         self.bloco_else = bloco_else
+        self.linha = linha
 
 class WhileLoopNode(ASTNode):
-    def __init__(self, condicao, corpo):
+    __slots__ = ('condicao', 'corpo')
+
+    def __init__(self, condicao, corpo, linha=0):
         self.condicao = condicao
         self.corpo = corpo
+        self.linha = linha
 
 class RepeatLoopNode(ASTNode):
-    def __init__(self, corpo, condicao):
+    __slots__ = ('corpo', 'condicao')
+
+    def __init__(self, corpo, condicao, linha=0):
         self.corpo = corpo
         self.condicao = condicao
+        self.linha = linha
 
 class ForLoopNode(ASTNode):
-    def __init__(self, variavel, inicio, fim, passo, corpo):
+    __slots__ = ('variavel', 'inicio', 'fim', 'passo', 'corpo',
+                 'endereco_var', 'endereco_fim', 'endereco_passo')
+
+    def __init__(self, variavel, inicio, fim, passo, corpo, linha=0):
         self.variavel = variavel
         self.inicio = inicio
         self.fim = fim
         self.passo = passo
         self.corpo = corpo
+        self.linha = linha
 
 class ForInLoopNode(ASTNode):
-    def __init__(self, variaveis, iterador, corpo):
+    # Forma numérica 'for v in inicio, fim[, passo]': iterador guarda o fim
+    __slots__ = ('variaveis', 'iterador', 'corpo', 'inicio', 'passo',
+                 'endereco_var', 'endereco_fim', 'endereco_passo')
+
+    def __init__(self, variaveis, iterador, corpo, inicio=None, passo=None, linha=0):
         self.variaveis = variaveis
         self.iterador = iterador
         self.corpo = corpo
+        self.inicio = inicio
+        self.passo = passo
+        self.linha = linha
 
 class BreakNode(ASTNode):
-    pass
+    __slots__ = ()
+
+    def __init__(self, linha=0):
+        self.linha = linha
 
 class GotoNode(ASTNode):
-    def __init__(self, label):
+    __slots__ = ('label',)
+
+    def __init__(self, label, linha=0):
         self.label = label
+        self.linha = linha
 
 class LabelNode(ASTNode):
-    def __init__(self, nome):
+    __slots__ = ('nome',)
+
+    def __init__(self, nome, linha=0):
         self.nome = nome
+        self.linha = linha
 
 class ReturnNode(ASTNode):
-    def __init__(self, valores):
+    __slots__ = ('valores',)
+
+    def __init__(self, valores, linha=0):
         self.valores = valores
+        self.linha = linha
 
 class FunctionDefinitionNode(ASTNode):
-    def __init__(self, nome, parametros, corpo, local=False):
+    __slots__ = ('nome', 'parametros', 'corpo', 'local')
+
+    def __init__(self, nome, parametros, corpo, local=False, linha=0):
         self.nome = nome
         self.parametros = parametros
         self.corpo = corpo
         self.local = local
+        self.linha = linha
 
 class AnonymousFunctionNode(ASTNode):
-    def __init__(self, parametros, corpo):
+    __slots__ = ('parametros', 'corpo')
+
+    def __init__(self, parametros, corpo, linha=0):
         self.parametros = parametros
         self.corpo = corpo
+        self.linha = linha
 
 class BlockNode(ASTNode):
-    def __init__(self, declaracoes):
+    __slots__ = ('declaracoes',)
+
+    def __init__(self, declaracoes, linha=0):
         self.declaracoes = declaracoes
+        self.linha = linha
 
 class ProgramNode(ASTNode):
-    def __init__(self, declaracoes):
+    __slots__ = ('declaracoes',)
+
+    def __init__(self, declaracoes, linha=0):
         self.declaracoes = declaracoes
+        self.linha = linha
+
+
+# --- Expressões ---
+# Precedência dos operadores binários (maior liga mais forte); todos associam
+# à esquerda. Os prefixos unários (not, -, #) ligam mais forte que qualquer
+# binário, inclusive '^'.
+PRECEDENCIA_BINARIA = {
+    'or': 1,
+    'and': 2,
+    '<': 3, '>': 3, '<=': 3, '>=': 3, '==': 3, '~=': 3,
+    '..': 4,
+    '+': 5, '-': 5,
+    '*': 6, '/': 6, '%': 6, '^': 6,
+}
+# Mesma tabela indexada pela espécie do token: uma consulta por operador
+_PRECEDENCIA_POR_ESPECIE = {ESPECIES[operador]: p for operador, p in PRECEDENCIA_BINARIA.items()}
+_PRECEDENCIA_UNARIA = 7
+_ESPECIES_UNARIAS = frozenset((PC_NOT, OP_MENOS, SB_CERQUILHA))
+_LITERAIS_PALAVRA_CHAVE = {
+    PC_TRUE: (True, 'boolean'), PC_FALSE: (False, 'boolean'), PC_NIL: (None, 'nil'),
+}
+
+# Tipos de quadro da pilha de expressões
+_QUADRO_RAIZ, _QUADRO_GRUPO, _QUADRO_CHAMADA, _QUADRO_INDICE = range(4)
+
+
+class _QuadroExpressao:
+    """Expressão em andamento: raiz, parênteses, argumentos de chamada ou índice"""
+    __slots__ = ('tipo', 'base', 'linha', 'operandos', 'operadores', 'argumentos')
+
+    def __init__(self, tipo: int, base=None, linha: int = 0):
+        self.tipo = tipo
+        self.base = base  # nome da função chamada ou tabela indexada
+        self.linha = linha
+        self.operandos: List[ASTNode] = []
+        self.operadores: List[tuple] = []  # (precedência, operador, linha)
+        self.argumentos: List[ASTNode] = []
 
 
 class AnalisadorSintaticoMoonlet:
-    def __init__(self, lexer: AnalisadorLexicoMoonlet):
+    def __init__(self, lexer: Union[AnalisadorLexicoMoonlet, CursorTokens]):
         self.lexer = lexer
         self.token_atual: Optional[Token] = None
         self.relatorio_erros = RelatorioErros()
         self._avancar_token()  # ✅ CORRIGIDO: Inicializar token atual    self._avancar_token()
-        # ---------------- Semântica ----------------
-        # Tabela de símbolos simples: nome -> {endereco: int, tipo: str}
-        self.tabela_simbolos = {}
-        self.proximo_endereco = 0  # endereço sequencial de variáveis
-        # Estrutura para geração de código (MEPA)
-        self.codigo_mepa = []  # lista de strings de instruções MEPA
-        self._contador_rotulos = 0
-        # Flag para suprimir carregamento de identificadores quando em contexto de LHS (atribuição)
-        self._suprimir_carregamento_identificador = False
-        # Gerador de temporários
-        self._temp_id = 0
-
-    # ---------------- Suporte a MEPA ----------------
-    def _novo_rotulo(self, base: str = 'L') -> str:
-        rot = f"{base}{self._contador_rotulos}"
-        self._contador_rotulos += 1
-        return rot
-
-    def _emitir(self, instr: str):
-        self.codigo_mepa.append(instr)
-    
-    def _alocar_temporario(self, hint: str = "t") -> int:
-        nome = f"__tmp{self._temp_id}_{hint}"
-        self._temp_id += 1
-        # Registrar no quadro de símbolos como variável interna
-        self.tabela_simbolos[nome] = { 'endereco': self.proximo_endereco, 'tipo': 'int' }
-        self.proximo_endereco += 1
-        return self.tabela_simbolos[nome]['endereco']
-
-    def _assegurar_variavel(self, nome: str) -> int:
-        """Garante que a variável exista na tabela de símbolos e retorna seu endereço."""
-        if nome not in self.tabela_simbolos:
-            self._declarar_variavel(nome)
-        return self.tabela_simbolos[nome]['endereco']
+        # Declarações, endereços e código MEPA ficam para as passadas seguintes
+        # (src/semantic e src/mepa): o parser só constrói a AST.
+
+    # ---------------- Dobramento de constantes ----------------
+    def _dobrar_binaria(self, operador: str, esquerda: ASTNode, direita: ASTNode) -> Optional['LiteralNode']:
+        if not (isinstance(esquerda, LiteralNode) and isinstance(direita, LiteralNode)):
+            return None
+        constante = dobrar_binaria(operador, (esquerda.valor, esquerda.tipo), (direita.valor, direita.tipo))
+        return LiteralNode(*constante, linha=esquerda.linha) if constante is not None else None
+
+    def _dobrar_unaria(self, operador: str, operando: ASTNode) -> Optional['LiteralNode']:
+        if not isinstance(operando, LiteralNode):
+            return None
+        constante = dobrar_unaria(operador, (operando.valor, operando.tipo))
+        return LiteralNode(*constante, linha=operando.linha) if constante is not None else None
     
     def _avancar_token(self):
         """Avança token ignorando comentários"""
@@ -180,48 +311,29 @@ class AnalisadorSintaticoMoonlet:
         while self.token_atual and self.token_atual.tipo == COMENTARIO:
             self.token_atual = self.lexer.proximo_token()
     
+    def _linha_atual(self) -> int:
+        return self.token_atual.linha if self.token_atual else 0
+
     def _criar_posicao_erro(self) -> PosicaoErro:
         if self.token_atual:
             return PosicaoErro(self.token_atual.linha, 0)
         return PosicaoErro(0, 0)
     
-    def _verificar_token_especifico(self, tipo: int, valor: str = None) -> bool:
-        if not self.token_atual:
-            return False
-        if self.token_atual.tipo != tipo:
-            return False
-        if valor is not None and self.token_atual.lexema != valor:
-            return False
-        return True
+    def _verificar(self, especie: int) -> bool:
+        """Token atual é a palavra-chave, operador ou símbolo da espécie dada"""
+        return self.token_atual is not None and self.token_atual.especie == especie
     
-    def _consumir_token_especifico(self, tipo: int, valor: str, mensagem_erro: str = "") -> Token:
-        if not self._verificar_token_especifico(tipo, valor):
+    def _consumir(self, especie: int) -> Token:
+        if not self._verificar(especie):
             token_encontrado = self.token_atual.lexema if self.token_atual else "EOF"
-            raise criar_erro_token_esperado(valor, token_encontrado, self._criar_posicao_erro())
+            raise criar_erro_token_esperado(LEXEMA_POR_ESPECIE[especie], token_encontrado,
+                                            self._criar_posicao_erro())
         token = self.token_atual
         self._avancar_token()
         return token
     
-    def _verificar_operador(self, operador: str) -> bool:
-        return self._verificar_token_especifico(OPERADOR, operador)
-    
-    def _verificar_palavra_chave(self, palavra: str) -> bool:
-        return self._verificar_token_especifico(PALAVRA_CHAVE, palavra)
-    
-    def _verificar_simbolo(self, simbolo: str) -> bool:
-        return self._verificar_token_especifico(SIMBOLO_ESPECIAL, simbolo)
-    
     def _verificar_token(self, tipo: int) -> bool:
-        return self._verificar_token_especifico(tipo)
-    
-    def _consumir_operador(self, operador: str) -> Token:
-        return self._consumir_token_especifico(OPERADOR, operador)
-    
-    def _consumir_simbolo(self, simbolo: str) -> Token:
-        return self._consumir_token_especifico(SIMBOLO_ESPECIAL, simbolo)
-    
-    def _consumir_palavra_chave(self, palavra: str) -> Token:
-        return self._consumir_token_especifico(PALAVRA_CHAVE, palavra)
+        return self.token_atual is not None and self.token_atual.tipo == tipo
     
     def _consumir_token(self, tipo_esperado: int, mensagem_erro: str = "") -> Token:
         if not self.token_atual:
@@ -236,48 +348,38 @@ class AnalisadorSintaticoMoonlet:
             self._criar_posicao_erro()
         )
 
-    # ---------------- Utilitários semânticos ----------------
-    def _declarar_variavel(self, nome: str):
-        if nome in self.tabela_simbolos:
-            raise ErroSemantico(
-                f"Variável '{nome}' já declarada",
-                self._criar_posicao_erro()
-            )
-        self.tabela_simbolos[nome] = { 'endereco': self.proximo_endereco, 'tipo': 'int' }
-        self.proximo_endereco += 1
-
-    def _obter_variavel(self, nome: str):
-        simbolo = self.tabela_simbolos.get(nome)
-        if simbolo is None:
-            raise ErroSemantico(
-                f"Variável '{nome}' não declarada",
-                self._criar_posicao_erro()
-            )
-        return simbolo
-    
     def analisar(self) -> ProgramNode:
         declaracoes = []
+        linha = self._linha_atual()
         
         while self.token_atual and self.token_atual.tipo != EOS:
+            inicio = self.token_atual.inicio
             try:
                 declaracao = self._analisar_declaracao()
                 if declaracao:
                     declaracoes.append(declaracao)
             except ErroSintatico as e:
-                self.relatorio_erros.adicionar_erro(e)
-                print(f"           ⚠️  ERRO SINTÁTICO: {e}")
+                self.relatorio_erros.registrar_erro_sintatico(e)
+                if self.token_atual and self.token_atual.inicio == inicio:
+                    # Nada foi consumido (p.ex. 'then' solto): sem descartar o
+                    # token, a próxima volta repetiria o mesmo erro para sempre
+                    self._descartar_token()
                 # Tentar recuperar pulando para próximo token válido
                 self._pular_ate_proximo_valido()
                 
-        return ProgramNode(declaracoes)
+        return ProgramNode(declaracoes, linha)
     
     def _pular_ate_proximo_valido(self):
         """Pula tokens até encontrar um válido para continuar análise"""
         while (self.token_atual and 
                self.token_atual.tipo not in [EOS, PALAVRA_CHAVE] and
                not (self.token_atual.tipo == IDENTIFICADOR)):
-            print(f"           🔄 Pulando token: '{self.token_atual.lexema}'")
-            self._avancar_token()
+            self._descartar_token()
+    
+    def _descartar_token(self):
+        self.relatorio_erros.adicionar_aviso(AVISO_TOKEN_PULADO, self.token_atual.lexema,
+                                             self.token_atual.linha)
+        self._avancar_token()
     
     def _tentar_recuperar_erro(self) -> ProgramNode:
         while self.token_atual and self.token_atual.tipo != EOS:
@@ -293,322 +395,219 @@ class AnalisadorSintaticoMoonlet:
             
         # ✅ CORRIGIDO: Tratar tokens de erro
         if self.token_atual.tipo == ERRO:
-            print(f"           ⚠️  ERRO SINTÁTICO: Token inválido '{self.token_atual.lexema}' na linha {self.token_atual.linha}")
+            self.relatorio_erros.adicionar_aviso(AVISO_TOKEN_INVALIDO, self.token_atual.lexema,
+                                                 self.token_atual.linha)
             self._avancar_token()  # Pular token de erro
             return None
             
-        if self._verificar_palavra_chave('local'):
-            return self._analisar_declaracao_variavel()
-        if self._verificar_palavra_chave('function'):
-            return self._analisar_definicao_funcao()
-        if self._verificar_simbolo('::'):
-            return self._analisar_label()
+        analisar = self._DECLARACOES.get(self.token_atual.especie)
+        if analisar is not None:
+            return analisar(self)
         return self._analisar_comando()
     
     def _analisar_declaracao_variavel(self) -> VariableDeclarationNode:
-        self._consumir_palavra_chave('local')
+        self._consumir(PC_LOCAL)
         if not self._verificar_token(IDENTIFICADOR):
             raise criar_erro_token_esperado("identificador", self.token_atual.lexema if self.token_atual else "EOF", self._criar_posicao_erro())
         nome = self.token_atual.lexema
+        linha = self.token_atual.linha
         self._avancar_token()
-        # Semântica: declarar variável na tabela (checa duplicidade)
-        self._declarar_variavel(nome)
         valor = None
-        if self._verificar_operador('='):
+        if self._verificar(OP_ATRIBUICAO):
             self._avancar_token()
             valor = self._analisar_expressao()
-        # MEPA: reserva endereço para variável (ALME apenas exemplificativo)
-        # Em muitas arquiteturas didáticas, a alocação é tratada na entrada do programa;
-        # aqui apenas registramos simbolicamente.
-        self._emitir(f"; decl local {nome} @ {self.tabela_simbolos[nome]['endereco']}")
-        return VariableDeclarationNode(nome, valor, local=True)
+        return VariableDeclarationNode(nome, valor, local=True, linha=linha)
     
     def _analisar_definicao_funcao(self) -> 'FunctionDefinitionNode':
+        linha = self._linha_atual()
         local = False
-        if self._verificar_palavra_chave('local'):
+        if self._verificar(PC_LOCAL):
             self._avancar_token()
             local = True
-        self._consumir_palavra_chave('function')
+        self._consumir(PC_FUNCTION)
         if not self._verificar_token(IDENTIFICADOR):
             raise criar_erro_token_esperado("identificador", self.token_atual.lexema if self.token_atual else "EOF", self._criar_posicao_erro())
         nome = self.token_atual.lexema
         self._avancar_token()
         parametros = self._analisar_lista_parametros()
         corpo = self._analisar_bloco()
-        self._consumir_palavra_chave('end')
-        return FunctionDefinitionNode(nome, parametros, corpo, local)
+        self._consumir(PC_END)
+        return FunctionDefinitionNode(nome, parametros, corpo, local, linha)
     
     def _analisar_lista_parametros(self) -> List[str]:
-        self._consumir_simbolo('(')
+        self._consumir(SB_ABRE_PARENTESE)
         parametros = []
-        if not self._verificar_simbolo(')'):
+        if not self._verificar(SB_FECHA_PARENTESE):
             while True:
                 if not self._verificar_token(IDENTIFICADOR):
                     raise criar_erro_token_esperado("identificador", self.token_atual.lexema if self.token_atual else "EOF", self._criar_posicao_erro())
                 parametros.append(self.token_atual.lexema)
                 self._avancar_token()
-                if self._verificar_simbolo(','):
+                if self._verificar(SB_VIRGULA):
                     self._avancar_token()
                 else:
                     break
-        self._consumir_simbolo(')')
+        self._consumir(SB_FECHA_PARENTESE)
         return parametros
     
     def _analisar_label(self) -> LabelNode:
-        self._consumir_simbolo('::')
+        linha = self._linha_atual()
+        self._consumir(SB_ROTULO)
         if not self._verificar_token(IDENTIFICADOR):
             raise criar_erro_token_esperado("identificador", self.token_atual.lexema if self.token_atual else "EOF", self._criar_posicao_erro())
         nome = self.token_atual.lexema
         self._avancar_token()
-        self._consumir_simbolo('::')
-        return LabelNode(nome)
+        self._consumir(SB_ROTULO)
+        return LabelNode(nome, linha)
     
     def _analisar_comando(self) -> Optional[ASTNode]:
         if not self.token_atual:
             return None
-        if self._verificar_palavra_chave('if'):
-            return self._analisar_comando_if()
-        if self._verificar_palavra_chave('while'):
-            return self._analisar_comando_while()
-        if self._verificar_palavra_chave('repeat'):
-            return self._analisar_comando_repeat()
-        if self._verificar_palavra_chave('for'):
-            return self._analisar_comando_for()
-        if self._verificar_palavra_chave('break'):
-            self._avancar_token()
-            return BreakNode()
-        if self._verificar_palavra_chave('goto'):
-            return self._analisar_comando_goto()
-        if self._verificar_palavra_chave('return'):
-            return self._analisar_comando_return()
-        if self._verificar_token(IDENTIFICADOR):
+        analisar = self._COMANDOS.get(self.token_atual.especie)
+        if analisar is not None:
+            return analisar(self)
+        if self.token_atual.tipo == IDENTIFICADOR:
             return self._analisar_atribuicao_ou_chamada()
+        raise criar_erro_token_esperado("comando", self.token_atual.lexema, self._criar_posicao_erro())
+    
+    def _analisar_comando_break(self) -> BreakNode:
+        return BreakNode(self._consumir(PC_BREAK).linha)
+    
+    def _analisar_comando_vazio(self) -> None:
+        self._consumir(SB_PONTO_E_VIRGULA)  # ';' isolado separa comandos, como em Lua
         return None
     
     def _analisar_comando_if(self) -> IfStatementNode:
-        self._consumir_palavra_chave('if')
+        linha = self._consumir(PC_IF).linha
         condicoes = []
         blocos = []
-        rotulo_fim = self._novo_rotulo('I')
 
         # IF principal
         condicao = self._analisar_expressao()
         condicoes.append(condicao)
-        rotulo_proximo = self._novo_rotulo('I')
-        # Se condição for falsa, pula para o próximo ramo
-        self._emitir("DSVF " + rotulo_proximo)
         
         # ✅ Tentar consumir 'then' mas continuar se falhar
-        if self._verificar_palavra_chave('then'):
+        if self._verificar(PC_THEN):
             self._avancar_token()
         else:
             erro = criar_erro_token_esperado('then', self.token_atual.lexema if self.token_atual else "EOF", self._criar_posicao_erro())
-            self.relatorio_erros.adicionar_erro(erro)
-            print(f"           ⚠️  ERRO SINTÁTICO: {erro}")
+            self.relatorio_erros.registrar_erro_sintatico(erro)
         
         bloco = self._analisar_bloco()
         blocos.append(bloco)
-        # Após executar o bloco do IF, salta para o fim do IF
-        self._emitir("DSVS " + rotulo_fim)
-        # Rótulo do próximo ramo (ELSEIF/ELSE)
-        self._emitir(f"{rotulo_proximo}:")
         
         # ELSEIFs
-        while self._verificar_palavra_chave('elseif'):
+        while self._verificar(PC_ELSEIF):
             self._avancar_token()
             condicao = self._analisar_expressao()
             condicoes.append(condicao)
-            rotulo_proximo = self._novo_rotulo('I')
-            self._emitir("DSVF " + rotulo_proximo)
-            if self._verificar_palavra_chave('then'):
+            if self._verificar(PC_THEN):
                 self._avancar_token()
             else:
                 erro = criar_erro_token_esperado('then', self.token_atual.lexema if self.token_atual else "EOF", self._criar_posicao_erro())
-                self.relatorio_erros.adicionar_erro(erro)
-                print(f"           ⚠️  ERRO SINTÁTICO: {erro}")
+                self.relatorio_erros.registrar_erro_sintatico(erro)
             bloco = self._analisar_bloco()
             blocos.append(bloco)
-            self._emitir("DSVS " + rotulo_fim)
-            self._emitir(f"{rotulo_proximo}:")
             
         # ELSE opcional
         bloco_else = None
-        if self._verificar_palavra_chave('else'):
+        if self._verificar(PC_ELSE):
             self._avancar_token()
             bloco_else = self._analisar_bloco()
             # (queda direta para o fim)
             
         # ✅ Consumir 'end' (reportar se faltar)
-        if self._verificar_palavra_chave('end'):
+        if self._verificar(PC_END):
             self._avancar_token()
         else:
             erro = criar_erro_token_esperado('end', self.token_atual.lexema if self.token_atual else "EOF", self._criar_posicao_erro())
-            self.relatorio_erros.adicionar_erro(erro)
-            print(f"           ⚠️  ERRO SINTÁTICO: {erro}")
+            self.relatorio_erros.registrar_erro_sintatico(erro)
         
-        # Rótulo de fim do IF
-        self._emitir(f"{rotulo_fim}:")
-        
-        return IfStatementNode(condicoes, blocos, bloco_else)
+        return IfStatementNode(condicoes, blocos, bloco_else, linha)
     
     def _analisar_comando_while(self) -> WhileLoopNode:
-        self._consumir_palavra_chave('while')
-        rot_inicio = self._novo_rotulo('W')
-        rot_fim = self._novo_rotulo('W')
-        self._emitir(f"{rot_inicio}:")
+        linha = self._consumir(PC_WHILE).linha
         condicao = self._analisar_expressao()
-        # MEPA: expressão no topo da pilha; salto se falso para fim
-        self._emitir("DSVF " + rot_fim)
-        self._consumir_palavra_chave('do')
+        self._consumir(PC_DO)
         corpo = self._analisar_bloco()
-        # MEPA: volta para o início e coloca rótulo fim
-        self._emitir("DSVS " + rot_inicio)
-        self._emitir(f"{rot_fim}:")
-        self._consumir_palavra_chave('end')
-        return WhileLoopNode(condicao, corpo)
+        self._consumir(PC_END)
+        return WhileLoopNode(condicao, corpo, linha)
     
     def _analisar_comando_repeat(self) -> RepeatLoopNode:
-        self._consumir_palavra_chave('repeat')
-        rot_inicio = self._novo_rotulo('R')
-        self._emitir(f"{rot_inicio}:")
+        linha = self._consumir(PC_REPEAT).linha
         corpo = self._analisar_bloco()
-        self._consumir_palavra_chave('until')
+        self._consumir(PC_UNTIL)
         condicao = self._analisar_expressao()
-        # Repete enquanto condição for falsa
-        self._emitir("DSVF " + rot_inicio)
-        return RepeatLoopNode(corpo, condicao)
+        return RepeatLoopNode(corpo, condicao, linha)
     
     def _analisar_comando_for(self) -> Union[ForLoopNode, ForInLoopNode]:
-        self._consumir_palavra_chave('for')
+        self._consumir(PC_FOR)
         if not self._verificar_token(IDENTIFICADOR):
             raise criar_erro_token_esperado("identificador", self.token_atual.lexema if self.token_atual else "EOF", self._criar_posicao_erro())
         variavel = self.token_atual.lexema
+        linha = self.token_atual.linha
         self._avancar_token()
-        if self._verificar_operador('='):
+        if self._verificar(OP_ATRIBUICAO):
             self._avancar_token()
-            # início
             inicio = self._analisar_expressao()
-            # armazenar valor inicial na variável do laço
-            end_var = self._assegurar_variavel(variavel)
-            self._emitir(f"ARMZ {end_var}")
-            self._consumir_simbolo(',')
-            # fim
+            self._consumir(SB_VIRGULA)
             fim = self._analisar_expressao()
-            end_tmp_fim = self._alocar_temporario('fim')
-            self._emitir(f"ARMZ {end_tmp_fim}")
             passo = None
-            if self._verificar_simbolo(','):
+            if self._verificar(SB_VIRGULA):
                 self._avancar_token()
                 passo = self._analisar_expressao()
-                end_tmp_passo = self._alocar_temporario('passo')
-                self._emitir(f"ARMZ {end_tmp_passo}")
-            else:
-                # passo padrão = 1
-                end_tmp_passo = self._alocar_temporario('passo')
-                self._emitir("CRCT 1")
-                self._emitir(f"ARMZ {end_tmp_passo}")
-            self._consumir_palavra_chave('do')
-            # MEPA do laço
-            rot_inicio = self._novo_rotulo('F')
-            rot_fim = self._novo_rotulo('F')
-            self._emitir(f"{rot_inicio}:")
-            # condição: var <= fim (assumimos passo positivo)
-            self._emitir(f"CRVL {end_var}")
-            self._emitir(f"CRVL {end_tmp_fim}")
-            self._emitir("CMEG")
-            self._emitir(f"DSVF {rot_fim}")
-            # corpo
+            self._consumir(PC_DO)
             corpo = self._analisar_bloco()
-            # incremento: var = var + passo
-            self._emitir(f"CRVL {end_var}")
-            self._emitir(f"CRVL {end_tmp_passo}")
-            self._emitir("SOMA")
-            self._emitir(f"ARMZ {end_var}")
-            self._emitir(f"DSVS {rot_inicio}")
-            self._emitir(f"{rot_fim}:")
-            self._consumir_palavra_chave('end')
-            return ForLoopNode(variavel, inicio, fim, passo, corpo)
-        elif self._verificar_palavra_chave('in'):
+            self._consumir(PC_END)
+            return ForLoopNode(variavel, inicio, fim, passo, corpo, linha)
+        elif self._verificar(PC_IN):
             self._avancar_token()
-            # Suporte a for-in numérico: for v in inicio, fim[, passo] do ... end
-            # Parse 'inicio'
+            # for-in numérico: for v in inicio, fim[, passo] do ... end
+            # (a exigência de 'fim' é verificada na análise semântica)
             inicio_expr = self._analisar_expressao()
-            # Guardar em variável do laço
-            end_var = self._assegurar_variavel(variavel)
-            self._emitir(f"ARMZ {end_var}")
-            # Esperar pelo menos uma vírgula e 'fim'
-            if not self._verificar_simbolo(','):
-                raise ErroSemantico("for-in numérico requer pelo menos duas expressões (início, fim)", self._criar_posicao_erro())
-            self._avancar_token()
-            fim_expr = self._analisar_expressao()
-            end_tmp_fim = self._alocar_temporario('fim')
-            self._emitir(f"ARMZ {end_tmp_fim}")
-            # Passo opcional
-            if self._verificar_simbolo(','):
+            fim_expr = None
+            passo_expr = None
+            if self._verificar(SB_VIRGULA):
                 self._avancar_token()
-                passo_expr = self._analisar_expressao()
-                end_tmp_passo = self._alocar_temporario('passo')
-                self._emitir(f"ARMZ {end_tmp_passo}")
-            else:
-                end_tmp_passo = self._alocar_temporario('passo')
-                self._emitir("CRCT 1")
-                self._emitir(f"ARMZ {end_tmp_passo}")
-            self._consumir_palavra_chave('do')
-            # MEPA do laço (mesma lógica do for numérico)
-            rot_inicio = self._novo_rotulo('G')
-            rot_fim = self._novo_rotulo('G')
-            self._emitir(f"{rot_inicio}:")
-            self._emitir(f"CRVL {end_var}")
-            self._emitir(f"CRVL {end_tmp_fim}")
-            self._emitir("CMEG")
-            self._emitir(f"DSVF {rot_fim}")
+                fim_expr = self._analisar_expressao()
+                if self._verificar(SB_VIRGULA):
+                    self._avancar_token()
+                    passo_expr = self._analisar_expressao()
+            self._consumir(PC_DO)
             corpo = self._analisar_bloco()
-            self._emitir(f"CRVL {end_var}")
-            self._emitir(f"CRVL {end_tmp_passo}")
-            self._emitir("SOMA")
-            self._emitir(f"ARMZ {end_var}")
-            self._emitir(f"DSVS {rot_inicio}")
-            self._emitir(f"{rot_fim}:")
-            self._consumir_palavra_chave('end')
-            return ForInLoopNode([variavel], fim_expr, corpo)
+            self._consumir(PC_END)
+            return ForInLoopNode([variavel], fim_expr, corpo, inicio_expr, passo_expr, linha)
         else:
             raise criar_erro_token_esperado("'=' ou 'in'", self.token_atual.lexema if self.token_atual else "EOF", self._criar_posicao_erro())
     
     def _analisar_comando_goto(self) -> GotoNode:
-        self._consumir_palavra_chave('goto')
+        linha = self._consumir(PC_GOTO).linha
         if not self._verificar_token(IDENTIFICADOR):
             raise criar_erro_token_esperado("identificador", self.token_atual.lexema if self.token_atual else "EOF", self._criar_posicao_erro())
         label = self.token_atual.lexema
         self._avancar_token()
-        return GotoNode(label)
+        return GotoNode(label, linha)
     
     def _analisar_comando_return(self) -> ReturnNode:
-        self._consumir_palavra_chave('return')
+        linha = self._consumir(PC_RETURN).linha
         valores = []
-        if not self._verificar_palavra_chave('end') and not self._verificar_simbolo(';'):
+        if not self._verificar(PC_END) and not self._verificar(SB_PONTO_E_VIRGULA):
             while True:
                 valor = self._analisar_expressao()
                 valores.append(valor)
-                if self._verificar_simbolo(','):
+                if self._verificar(SB_VIRGULA):
                     self._avancar_token()
                 else:
                     break
-        return ReturnNode(valores)
+        return ReturnNode(valores, linha)
     
     def _analisar_atribuicao_ou_chamada(self) -> Union[AssignmentNode, FunctionCallNode]:
-        # Para lado esquerdo (LHS) de atribuição, suprimir CRVL de identificadores
-        flag_antigo = self._suprimir_carregamento_identificador
-        self._suprimir_carregamento_identificador = True
+        linha = self._linha_atual()
         expressao = self._analisar_expressao()
-        self._suprimir_carregamento_identificador = flag_antigo
-        if self._verificar_operador('='):
+        if self._verificar(OP_ATRIBUICAO):
             self._avancar_token()
             valor = self._analisar_expressao()
-            # MEPA para atribuição simples: variável à esquerda deve ser identificador
-            if isinstance(expressao, IdentifierNode):
-                simbolo = self._obter_variavel(expressao.nome)
-                self._emitir(f"ARMZ {simbolo['endereco']}")
-            return AssignmentNode(expressao, valor)
+            return AssignmentNode(expressao, valor, linha)
         if isinstance(expressao, FunctionCallNode):
             return expressao
         return expressao
@@ -616,180 +615,177 @@ class AnalisadorSintaticoMoonlet:
     def _analisar_bloco(self) -> List[ASTNode]:
         comandos = []
         while (self.token_atual and self.token_atual.tipo != EOS and
-               not self._verificar_palavra_chave('end') and
-               not self._verificar_palavra_chave('else') and
-               not self._verificar_palavra_chave('elseif') and
-               not self._verificar_palavra_chave('until')):
+               not self._verificar(PC_END) and
+               not self._verificar(PC_ELSE) and
+               not self._verificar(PC_ELSEIF) and
+               not self._verificar(PC_UNTIL)):
             comando = self._analisar_declaracao()
             if comando:
                 comandos.append(comando)
         return comandos
     
     def _analisar_expressao(self) -> ASTNode:
-        return self._analisar_expressao_or()
-    
-    def _analisar_expressao_or(self) -> ASTNode:
-        esquerda = self._analisar_expressao_and()
-        while self._verificar_palavra_chave('or'):
-            operador = self.token_atual.lexema
-            self._avancar_token()
-            direita = self._analisar_expressao_and()
-            esquerda = BinaryOpNode(operador, esquerda, direita)
-        return esquerda
-    
-    def _analisar_expressao_and(self) -> ASTNode:
-        esquerda = self._analisar_expressao_relacional()
-        while self._verificar_palavra_chave('and'):
-            operador = self.token_atual.lexema
-            self._avancar_token()
-            direita = self._analisar_expressao_relacional()
-            esquerda = BinaryOpNode(operador, esquerda, direita)
-        return esquerda
-    
-    def _analisar_expressao_relacional(self) -> ASTNode:
-        esquerda = self._analisar_expressao_concat()
-        for op in ['<', '>', '<=', '>=', '==', '~=']:
-            if self._verificar_operador(op):
-                operador = self.token_atual.lexema
-                self._avancar_token()
-                direita = self._analisar_expressao_concat()
-                esquerda = BinaryOpNode(operador, esquerda, direita)
-                # MEPA: após avaliar, comparar no topo da pilha
-                mapa = {
-                    '<': 'CMME', '>': 'CMMA', '<=': 'CMEG', '>=': 'CMAG', '==': 'CMIG', '~=': 'CMDG'
-                }
-                self._emitir(mapa[operador])
-        return esquerda
-    
-    def _analisar_expressao_concat(self) -> ASTNode:
-        esquerda = self._analisar_expressao_aditiva()
-        while self._verificar_operador('..'):
-            operador = self.token_atual.lexema
-            self._avancar_token()
-            direita = self._analisar_expressao_aditiva()
-            esquerda = BinaryOpNode(operador, esquerda, direita)
-        return esquerda
-    
-    def _analisar_expressao_aditiva(self) -> ASTNode:
-        esquerda = self._analisar_expressao_multiplicativa()
-        while self._verificar_operador('+') or self._verificar_operador('-'):
-            operador = self.token_atual.lexema
-            self._avancar_token()
-            direita = self._analisar_expressao_multiplicativa()
-            esquerda = BinaryOpNode(operador, esquerda, direita)
-            self._emitir('SOMA' if operador == '+' else 'SUBT')
-        return esquerda
-    
-    def _analisar_expressao_multiplicativa(self) -> ASTNode:
-        esquerda = self._analisar_expressao_unaria()
-        for op in ['*', '/', '%', '^']:
-            if self._verificar_operador(op):
-                operador = self.token_atual.lexema
-                self._avancar_token()
-                direita = self._analisar_expressao_unaria()
-                esquerda = BinaryOpNode(operador, esquerda, direita)
-                if operador == '*':
-                    self._emitir('MULT')
-                elif operador == '/':
-                    self._emitir('DIVI')
-                elif operador == '%':
-                    self._emitir('MODI')
-                elif operador == '^':
-                    self._emitir('POTI')
-        return esquerda
-    
-    def _analisar_expressao_unaria(self) -> ASTNode:
-        if self._verificar_palavra_chave('not'):
-            operador = self.token_atual.lexema
-            self._avancar_token()
-            operando = self._analisar_expressao_unaria()
-            return UnaryOpNode(operador, operando)
-        for operador in ['-', '#']:
-            if self._verificar_operador(operador):
+        """Precedence climbing com pilha explícita
+
+        Cada parêntese, lista de argumentos ou índice de tabela abre um quadro
+        em 'quadros' em vez de uma chamada recursiva, de modo que a profundidade
+        de aninhamento é limitada apenas pela memória. Dentro de um quadro,
+        operandos e operadores pendentes ficam em pilhas e um operador é
+        reduzido quando chega outro de precedência menor ou igual (todos os
+        binários associam à esquerda).
+        """
+        quadros = [_QuadroExpressao(_QUADRO_RAIZ)]
+        while True:
+            quadro = quadros[-1]
+            operando = self._analisar_operando(quadro, quadros)
+            if operando is None:
+                continue  # abriu um quadro: o operando está dentro dele
+            while True:
+                quadro.operandos.append(self._aplicar_unarios(quadro, operando))
+                if self._empilhar_operador_binario(quadro):
+                    break  # o próximo operando pertence ao mesmo quadro
+                operando = self._concluir_quadro(quadro)
+                if operando is None:
+                    break  # ',' entre argumentos: próxima expressão no mesmo quadro
+                if len(quadros) == 1:
+                    return operando
+                quadros.pop()
+                quadro = quadros[-1]
+
+    def _analisar_operando(self, quadro: '_QuadroExpressao', quadros: list) -> Optional[ASTNode]:
+        """Consome prefixos unários e um operando primário
+
+        Retorna None quando o operando começa um novo quadro ('(', argumentos
+        de chamada ou índice entre colchetes).
+        """
+        while True:
+            if not self.token_atual:
+                raise criar_erro_fim_arquivo_inesperado(self._criar_posicao_erro())
+            if self.token_atual.especie in _ESPECIES_UNARIAS:
+                quadro.operadores.append((_PRECEDENCIA_UNARIA, self.token_atual.lexema, self.token_atual.linha))
                 self._avancar_token()
-                operando = self._analisar_expressao_unaria()
-                if operador == '-':
-                    self._emitir('INVR')
-                return UnaryOpNode(operador, operando)
-        return self._analisar_expressao_primaria()
-    
-    def _analisar_expressao_primaria(self) -> ASTNode:
-        if not self.token_atual:
-            raise criar_erro_fim_arquivo_inesperado(self._criar_posicao_erro())
+                continue
+            break
+
+        linha = self.token_atual.linha
         if self.token_atual.tipo == NUMERO:
             valor = self.token_atual.valor
             self._avancar_token()
-            # MEPA: empilha literal numérico
-            self._emitir(f"CRCT {valor}")
-            return LiteralNode(valor, 'number')
+            return LiteralNode(valor, 'number', linha)
         if self.token_atual.tipo == STRING:
             valor = self.token_atual.valor
             self._avancar_token()
-            return LiteralNode(valor, 'string')
-        for palavra, (valor, tipo) in {'true': (True, 'boolean'), 'false': (False, 'boolean'), 'nil': (None, 'nil')}.items():
-            if self._verificar_palavra_chave(palavra):
-                self._avancar_token()
-                return LiteralNode(valor, tipo)
+            return LiteralNode(valor, 'string', linha)
+        literal = _LITERAIS_PALAVRA_CHAVE.get(self.token_atual.especie)
+        if literal is not None:
+            self._avancar_token()
+            return LiteralNode(*literal, linha)
         if self.token_atual.tipo == IDENTIFICADOR:
             nome = self.token_atual.lexema
             self._avancar_token()
-            if self._verificar_simbolo('('):
-                return self._analisar_chamada_funcao(nome)
-            if self._verificar_simbolo('[') or self._verificar_simbolo('.'):
-                return self._analisar_acesso_tabela(IdentifierNode(nome))
-            # Semântica: uso de variável – deve ter sido declarada
-            self._obter_variavel(nome)
-            # MEPA: carrega variável (se não estivermos suprimindo em contexto de LHS)
-            if not self._suprimir_carregamento_identificador:
-                simbolo = self.tabela_simbolos[nome]
-                self._emitir(f"CRVL {simbolo['endereco']}")
-            return IdentifierNode(nome)
-        if self._verificar_simbolo('('):
+            if self._verificar(SB_ABRE_PARENTESE):
+                self._avancar_token()
+                if self._verificar(SB_FECHA_PARENTESE):
+                    self._avancar_token()
+                    return FunctionCallNode(nome, [], linha)
+                quadros.append(_QuadroExpressao(_QUADRO_CHAMADA, nome, linha))
+                return None
+            if self._verificar(SB_ABRE_COLCHETE):
+                self._avancar_token()
+                quadros.append(_QuadroExpressao(_QUADRO_INDICE, IdentifierNode(nome, linha), linha))
+                return None
+            if self._verificar(SB_PONTO):
+                self._avancar_token()
+                if not self._verificar_token(IDENTIFICADOR):
+                    raise criar_erro_token_esperado("identificador", self.token_atual.lexema if self.token_atual else "EOF", self._criar_posicao_erro())
+                chave = IdentifierNode(self.token_atual.lexema, self.token_atual.linha)
+                self._avancar_token()
+                return TableAccessNode(IdentifierNode(nome, linha), chave, True, linha)
+            return IdentifierNode(nome, linha)
+        if self._verificar(SB_ABRE_PARENTESE):
             self._avancar_token()
-            expressao = self._analisar_expressao()
-            self._consumir_simbolo(')')
-            return expressao
-        if self._verificar_palavra_chave('function'):
+            quadros.append(_QuadroExpressao(_QUADRO_GRUPO))
+            return None
+        if self._verificar(PC_FUNCTION):
             return self._analisar_funcao_anonima()
-        if self._verificar_simbolo('{'):
-            self._consumir_simbolo('{')
+        if self._verificar(SB_ABRE_CHAVE):
+            self._consumir(SB_ABRE_CHAVE)
             # Tabela vazia por simplicidade
-            self._consumir_simbolo('}')
-            return LiteralNode({}, 'table')
+            self._consumir(SB_FECHA_CHAVE)
+            return LiteralNode({}, 'table', linha)
         raise criar_erro_token_esperado("expressão", self.token_atual.lexema if self.token_atual else "EOF", self._criar_posicao_erro())
-    
-    def _analisar_chamada_funcao(self, nome: str) -> FunctionCallNode:
-        self._consumir_simbolo('(')
-        argumentos = []
-        if not self._verificar_simbolo(')'):
-            while True:
-                argumento = self._analisar_expressao()
-                argumentos.append(argumento)
-                if self._verificar_simbolo(','):
-                    self._avancar_token()
-                else:
-                    break
-        self._consumir_simbolo(')')
-        return FunctionCallNode(nome, argumentos)
-    
-    def _analisar_acesso_tabela(self, tabela) -> TableAccessNode:
-        if self._verificar_simbolo('['):
-            self._avancar_token()
-            chave = self._analisar_expressao()
-            self._consumir_simbolo(']')
-            return TableAccessNode(tabela, chave, False)
-        elif self._verificar_simbolo('.'):
-            self._avancar_token()
-            if not self._verificar_token(IDENTIFICADOR):
-                raise criar_erro_token_esperado("identificador", self.token_atual.lexema if self.token_atual else "EOF", self._criar_posicao_erro())
-            chave = IdentifierNode(self.token_atual.lexema)
-            self._avancar_token()
-            return TableAccessNode(tabela, chave, True)
-        return tabela
-    
+
+    def _aplicar_unarios(self, quadro: '_QuadroExpressao', operando: ASTNode) -> ASTNode:
+        """Aplica ao operando os prefixos unários pendentes, do mais interno ao mais externo"""
+        operadores = quadro.operadores
+        while operadores and operadores[-1][0] == _PRECEDENCIA_UNARIA:
+            _, operador, linha = operadores.pop()
+            operando = self._dobrar_unaria(operador, operando) or UnaryOpNode(operador, operando, linha)
+        return operando
+
+    def _empilhar_operador_binario(self, quadro: '_QuadroExpressao') -> bool:
+        """Empilha o operador binário atual, reduzindo antes os de precedência maior ou igual"""
+        token = self.token_atual
+        precedencia = _PRECEDENCIA_POR_ESPECIE.get(token.especie) if token else None
+        if precedencia is None:
+            return False
+        self._reduzir(quadro, precedencia)
+        quadro.operadores.append((precedencia, token.lexema, token.linha))
+        self._avancar_token()
+        return True
+
+    def _reduzir(self, quadro: '_QuadroExpressao', precedencia_minima: int):
+        operandos, operadores = quadro.operandos, quadro.operadores
+        while operadores and operadores[-1][0] >= precedencia_minima:
+            _, operador, linha = operadores.pop()
+            direita = operandos.pop()
+            esquerda = operandos.pop()
+            operandos.append(self._dobrar_binaria(operador, esquerda, direita)
+                             or BinaryOpNode(operador, esquerda, direita, linha))
+
+    def _concluir_quadro(self, quadro: '_QuadroExpressao') -> Optional[ASTNode]:
+        """Fecha a expressão do quadro e consome o delimitador que o encerra
+
+        Retorna o nó que o quadro produz para o quadro externo, ou None quando
+        uma ',' separa argumentos e o quadro continua aberto.
+        """
+        self._reduzir(quadro, 0)
+        valor = quadro.operandos.pop()
+        if quadro.tipo == _QUADRO_GRUPO:
+            self._consumir(SB_FECHA_PARENTESE)
+            return valor
+        if quadro.tipo == _QUADRO_INDICE:
+            self._consumir(SB_FECHA_COLCHETE)
+            return TableAccessNode(quadro.base, valor, False, quadro.linha)
+        if quadro.tipo == _QUADRO_CHAMADA:
+            quadro.argumentos.append(valor)
+            if self._verificar(SB_VIRGULA):
+                self._avancar_token()
+                return None
+            self._consumir(SB_FECHA_PARENTESE)
+            return FunctionCallNode(quadro.base, quadro.argumentos, quadro.linha)
+        return valor
+
     def _analisar_funcao_anonima(self):
-        self._consumir_palavra_chave('function')
+        linha = self._consumir(PC_FUNCTION).linha
         parametros = self._analisar_lista_parametros()
         corpo = self._analisar_bloco()
-        self._consumir_palavra_chave('end')
-        return AnonymousFunctionNode(parametros, corpo)
+        self._consumir(PC_END)
+        return AnonymousFunctionNode(parametros, corpo, linha)
+
+    # Despacho de comandos pela espécie do primeiro token (uma consulta por comando)
+    _DECLARACOES = {
+        PC_LOCAL: _analisar_declaracao_variavel,
+        PC_FUNCTION: _analisar_definicao_funcao,
+        SB_ROTULO: _analisar_label,
+    }
+    _COMANDOS = {
+        PC_IF: _analisar_comando_if,
+        PC_WHILE: _analisar_comando_while,
+        PC_REPEAT: _analisar_comando_repeat,
+        PC_FOR: _analisar_comando_for,
+        PC_BREAK: _analisar_comando_break,
+        PC_GOTO: _analisar_comando_goto,
+        PC_RETURN: _analisar_comando_return,
+        SB_PONTO_E_VIRGULA: _analisar_comando_vazio,
+    }
@@ -0,0 +1 @@
+from .semantico_moonlet import AnalisadorSemantico
@@ -0,0 +1,240 @@
+"""
+Análise semântica do Moonlet: passada sobre a AST que monta a tabela de
+símbolos, verifica declarações e anota nos nós os endereços de memória
+usados pela geração de código
+"""
+
+import heapq
+from typing import Dict, List
+
+from ..errors.erros_moonlet import ErroSemantico, PosicaoErro
+from ..parser.sintatico_moonlet import (
+    ASTNode, ProgramNode, IdentifierNode, BinaryOpNode, UnaryOpNode,
+    FunctionCallNode, TableAccessNode
+)
+
+
+class AnalisadorSemantico:
+    """Visitante que percorre a AST na ordem do código-fonte
+
+    Anotações produzidas:
+        VariableDeclarationNode.endereco, .reciclado, IdentifierNode.endereco e
+        ForLoopNode/ForInLoopNode.endereco_var, .endereco_fim, .endereco_passo
+
+    Escopos: o programa é o escopo global; cada ramo de if, corpo de laço e
+    corpo de função abre um escopo aninhado. A variável de controle de um for
+    e seus temporários pertencem ao escopo do laço, e os parâmetros ao escopo
+    da função. Redeclarar um nome no mesmo escopo é erro; num escopo interno,
+    a declaração sombreia a externa até o escopo fechar.
+
+    Ao fechar um escopo, as posições dos seus símbolos voltam para a lista de
+    livres e são reaproveitadas (a menor primeiro). proximo_endereco é,
+    portanto, o pico de posições em uso, que é o tamanho do quadro de dados a
+    reservar.
+    """
+
+    def __init__(self):
+        # Pilha de escopos: nome -> {endereco: int, tipo: str}; o primeiro é o global
+        self._escopos: List[Dict[str, dict]] = [{}]
+        # nome -> símbolos visíveis com esse nome, do mais externo ao mais interno
+        self._visiveis: Dict[str, List[dict]] = {}
+        self.proximo_endereco = 0  # primeira posição nunca usada (= pico do quadro)
+        self._temp_id = 0
+        self.simbolos_declarados = 0  # todas as declarações, temporários incluídos
+        self._posicoes_livres: List[int] = []  # heap de posições liberadas
+
+    @property
+    def tabela_simbolos(self) -> Dict[str, dict]:
+        """Símbolos do escopo global"""
+        return self._escopos[0]
+
+    @property
+    def temporarios_alocados(self) -> int:
+        return self._temp_id
+
+    def analisar(self, programa: ProgramNode) -> Dict[str, dict]:
+        programa.accept(self)
+        return self.tabela_simbolos
+
+    # ---------------- Quadro de dados ----------------
+    def _nova_posicao(self) -> int:
+        if self._posicoes_livres:
+            return heapq.heappop(self._posicoes_livres)
+        endereco = self.proximo_endereco
+        self.proximo_endereco += 1
+        return endereco
+
+    # ---------------- Escopos ----------------
+    def _abrir_escopo(self):
+        self._escopos.append({})
+
+    def _fechar_escopo(self):
+        for nome, simbolo in self._escopos.pop().items():
+            pilha = self._visiveis[nome]
+            pilha.pop()
+            if not pilha:
+                del self._visiveis[nome]
+            heapq.heappush(self._posicoes_livres, simbolo['endereco'])
+
+    # ---------------- Tabela de símbolos ----------------
+    def _declarar_variavel(self, nome: str, linha: int = 0) -> int:
+        escopo = self._escopos[-1]
+        if nome in escopo:
+            raise ErroSemantico(f"Variável '{nome}' já declarada", PosicaoErro(linha, 0))
+        simbolo = {'endereco': self._nova_posicao(), 'tipo': 'int'}
+        escopo[nome] = simbolo
+        self.simbolos_declarados += 1
+        self._visiveis.setdefault(nome, []).append(simbolo)
+        return simbolo['endereco']
+
+    def _obter_variavel(self, nome: str, linha: int = 0) -> dict:
+        pilha = self._visiveis.get(nome)
+        if pilha is None:
+            raise ErroSemantico(f"Variável '{nome}' não declarada", PosicaoErro(linha, 0))
+        return pilha[-1]
+
+    def _assegurar_variavel(self, nome: str) -> int:
+        """Retorna o endereço da variável visível, declarando-a no escopo atual se preciso."""
+        pilha = self._visiveis.get(nome)
+        if pilha is None:
+            return self._declarar_variavel(nome)
+        return pilha[-1]['endereco']
+
+    def _alocar_temporario(self, hint: str = "t") -> int:
+        nome = f"__tmp{self._temp_id}_{hint}"
+        self._temp_id += 1
+        # Registrar no escopo atual como variável interna: é liberado junto com ele
+        return self._declarar_variavel(nome)
+
+    # ---------------- Visitação ----------------
+    def _visitar_bloco(self, comandos: List[ASTNode]):
+        for comando in comandos:
+            comando.accept(self)
+
+    def _visitar_escopo(self, comandos: List[ASTNode]):
+        self._abrir_escopo()
+        self._visitar_bloco(comandos)
+        self._fechar_escopo()
+
+    def generic_visit(self, node):
+        pass
+
+    def visit_program(self, node):
+        self._visitar_bloco(node.declaracoes)
+
+    def visit_block(self, node):
+        self._visitar_escopo(node.declaracoes)
+
+    def visit_variable_declaration(self, node):
+        # A expressão inicial enxerga a variável externa de mesmo nome, se houver:
+        # em 'local x = x + 1' o x da direita não é o que está sendo declarado
+        if node.valor is not None:
+            node.valor.accept(self)
+        # Posição reaproveitada guarda o valor de um símbolo morto: precisa ser zerada
+        node.reciclado = bool(self._posicoes_livres)
+        node.endereco = self._declarar_variavel(node.nome, node.linha)
+
+    def visit_assignment(self, node):
+        node.variavel.accept(self)
+        node.valor.accept(self)
+
+    def visit_if_statement(self, node):
+        for condicao, bloco in zip(node.condicoes, node.blocos):
+            condicao.accept(self)
+            self._visitar_escopo(bloco)
+        if node.bloco_else:
+            self._visitar_escopo(node.bloco_else)
+
+    def visit_while_loop(self, node):
+        node.condicao.accept(self)
+        self._visitar_escopo(node.corpo)
+
+    def visit_repeat_loop(self, node):
+        # A condição do until enxerga as variáveis locais do corpo
+        self._abrir_escopo()
+        self._visitar_bloco(node.corpo)
+        node.condicao.accept(self)
+        self._fechar_escopo()
+
+    def _visitar_laco_numerico(self, node, variavel: str, fim, passo):
+        # Chamado depois de visitar a expressão inicial, que fica fora do escopo do laço
+        self._abrir_escopo()
+        node.endereco_var = self._assegurar_variavel(variavel)
+        fim.accept(self)
+        node.endereco_fim = self._alocar_temporario('fim')
+        if passo is not None:
+            passo.accept(self)
+        node.endereco_passo = self._alocar_temporario('passo')
+        self._visitar_bloco(node.corpo)
+        self._fechar_escopo()
+
+    def visit_for_loop(self, node):
+        node.inicio.accept(self)
+        self._visitar_laco_numerico(node, node.variavel, node.fim, node.passo)
+
+    def visit_for_in_loop(self, node):
+        node.inicio.accept(self)
+        if node.iterador is None:
+            raise ErroSemantico("for-in numérico requer pelo menos duas expressões (início, fim)",
+                                PosicaoErro(node.linha, 0))
+        self._visitar_laco_numerico(node, node.variaveis[0], node.iterador, node.passo)
+
+    def _visitar_funcao(self, node):
+        self._abrir_escopo()
+        for parametro in node.parametros:
+            self._declarar_variavel(parametro, node.linha)
+        self._visitar_bloco(node.corpo)
+        self._fechar_escopo()
+
+    def visit_function_definition(self, node):
+        self._visitar_funcao(node)
+
+    def visit_anonymous_function(self, node):
+        self._visitar_funcao(node)
+
+    def visit_return(self, node):
+        for valor in node.valores:
+            valor.accept(self)
+
+    def _visitar_expressao(self, raiz: ASTNode):
+        """Percorre operadores, chamadas e acessos com uma pilha explícita
+
+        Cadeias longas (x + x + ..., - - x, f(f(...))) não consomem a pilha de
+        chamadas do Python. A ordem é a mesma da visita recursiva: da esquerda
+        para a direita, em pré-ordem, e os demais nós seguem por accept.
+        """
+        pendentes = [raiz]
+        while pendentes:
+            node = pendentes.pop()
+            classe = node.__class__
+            if classe is BinaryOpNode:
+                pendentes.append(node.direita)
+                pendentes.append(node.esquerda)
+            elif classe is UnaryOpNode:
+                pendentes.append(node.operando)
+            elif classe is FunctionCallNode:
+                pendentes.extend(reversed(node.argumentos))
+            elif classe is TableAccessNode:
+                # A tabela e a chave em notação de ponto são nomes, não variáveis a verificar
+                if not node.notacao_ponto:
+                    pendentes.append(node.chave)
+            elif classe is IdentifierNode:
+                # Uso de variável – deve ter sido declarada
+                node.endereco = self._obter_variavel(node.nome, node.linha)['endereco']
+            else:
+                node.accept(self)
+
+    def visit_function_call(self, node):
+        self._visitar_expressao(node)
+
+    def visit_table_access(self, node):
+        self._visitar_expressao(node)
+
+    def visit_binary_op(self, node):
+        self._visitar_expressao(node)
+
+    def visit_unary_op(self, node):
+        self._visitar_expressao(node)
+
+    def visit_identifier(self, node):
+        self._visitar_expressao(node)